@@ -1,95 +1,264 @@
 import os
 from neo4j import GraphDatabase
+import csv
 import json
+import re
+import zlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from dotenv import load_dotenv
-import os
 
 
-def import_tube_data(uri, username, password, data_file, undirected=False):
-    driver = GraphDatabase.driver(uri, auth=(username, password))
-    
-    # Load JSON data
-    with open(data_file, 'r') as f:
-        data = json.load(f)
-    
-    with driver.session() as session:
-        # Create constraints separately
-        session.run("""
-        CREATE CONSTRAINT underground_station_name IF NOT EXISTS FOR (s:UndergroundStation) REQUIRE s.name IS UNIQUE
-        """)
-        
-        session.run("""
-        CREATE CONSTRAINT underground_station_id IF NOT EXISTS FOR (s:UndergroundStation) REQUIRE s.id IS UNIQUE
-        """)
-        
-        session.run("""
-        UNWIND $stations AS station
-        MERGE (s:UndergroundStation {id: station.id})
-        SET s.name = station.name,
-            s.display_name = CASE station.display_name 
-                         WHEN 'NULL' THEN station.name 
-                         ELSE station.display_name 
-                         END,
-            s.latitude = toFloat(station.latitude),
-            s.longitude = toFloat(station.longitude),
-            s.zone = CASE 
-                  WHEN station.zone CONTAINS '.' THEN toFloat(station.zone)
-                  ELSE toInteger(station.zone)
-                  END,
-            s.total_lines = toInteger(station.total_lines),
-            s.rail = toInteger(station.rail)
-        """, {'stations': data['stations']})
-        
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PARALLELISM = 4
+
+
+def iter_json_array(path, key, chunk_size=1 << 16):
+    """Stream the items of the top-level array `key` of a JSON file without loading the whole file."""
+    decoder = json.JSONDecoder()
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    separators = re.compile(r'[\s,]*')
+    with open(path, 'r') as f:
+        # Skip to the start of the array, keeping enough of each chunk to match across chunks
+        buffer = ''
+        while (match := array_start.search(buffer)) is None:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f'No array "{key}" in {path}')
+            buffer = buffer[-1024:] + chunk
+        # Items are decoded at an offset into the buffer, which is only compacted when
+        # the next chunk is read, so that the rest of the buffer is not copied per item
+        offset = match.end()
+
+        eof = False
+        while True:
+            offset = separators.match(buffer, offset).end()
+            if buffer.startswith(']', offset):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, offset)
+                # A number is only complete once it is followed by a delimiter, it may
+                # continue in the next chunk (e.g. "2." and "5")
+                complete = eof or (end < len(buffer) and (
+                    not isinstance(item, (int, float)) or buffer[end] in ',] \t\r\n'))
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if complete:
+                yield item
+                offset = end
+                continue
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[offset:] + chunk
+            offset = 0
+
+
+def iter_records(path, key=None):
+    """Stream records from a CSV file (one dict per row) or from the array `key` of a JSON file."""
+    if path.endswith('.csv'):
+        with open(path, 'r', newline='') as f:
+            yield from csv.DictReader(f)
+    else:
+        yield from iter_json_array(path, key)
+
+
+def batched(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def unique(rows, key):
+    """Drop rows whose key was seen before, like MERGE would."""
+    seen = set()
+    for row in rows:
+        row_key = key(row)
+        if row_key not in seen:
+            seen.add(row_key)
+            yield row
+
+
+def load_batches(driver, query, rows, batch_size=DEFAULT_BATCH_SIZE, database=None):
+    """Run `query` with `$rows` for each batch of rows, committing every batch in its own transaction."""
+    count = 0
+    with driver.session(database=database) as session:
+        for batch in batched(rows, batch_size):
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+            count += len(batch)
+    return count
+
+
+def partition_rounds(partitions):
+    """
+    Pairs of node partitions grouped in rounds in which no partition appears twice
+    (a round-robin schedule), covering every unordered pair once.
+    """
+    rounds = [[(p, p) for p in range(partitions)]]
+    players = list(range(partitions)) + ([None] if partitions % 2 else [])
+    n = len(players)
+    for _ in range(n - 1):
+        pairs = zip(players[:n // 2], reversed(players[n // 2:]))
+        rounds.append([(min(a, b), max(a, b)) for a, b in pairs if a is not None and b is not None])
+        players = [players[0], players[-1]] + players[1:-1]
+    return [pairs for pairs in rounds if pairs]
+
+
+def load_relationships(driver, query, rows, source_key, target_key, batch_size=DEFAULT_BATCH_SIZE,
+                       parallelism=DEFAULT_PARALLELISM, database=None):
+    """
+    Load relationships in batches on `parallelism` parallel sessions.
+
+    Creating a relationship locks both of its nodes. Nodes are hashed into partitions and
+    relationships grouped by the partitions of their endpoints; the groups loaded at the same
+    time never share a partition, so parallel transactions do not wait for each other's locks.
+    Rows are read in chunks, so the input is streamed.
+    """
+    partitions = max(1, 2 * parallelism)
+    rounds = partition_rounds(partitions)
+
+    def partition(value):
+        return zlib.crc32(str(value).encode()) % partitions
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        for chunk in batched(rows, batch_size * partitions * 4):
+            groups = {}
+            for row in chunk:
+                a, b = partition(row[source_key]), partition(row[target_key])
+                groups.setdefault((min(a, b), max(a, b)), []).append(row)
+            for pairs in rounds:
+                jobs = [
+                    executor.submit(load_batches, driver, query, groups[pair], batch_size, database)
+                    for pair in pairs
+                    if pair in groups
+                ]
+                count += sum(job.result() for job in jobs)
+    return count
+
+
+def is_empty(driver, label, database=None):
+    """
+    Whether no node has `label`. The import uses CREATE instead of MERGE only then.
+
+    Links are loaded after the stations and only between existing stations, so an
+    import that stopped early leaves stations without links (the next import MERGEs),
+    but never links without stations.
+    """
+    with driver.session(database=database) as session:
+        return session.run(f"MATCH (n:`{label}`) RETURN count(n) = 0 AS empty").single()['empty']
+
+
+def tube_links(connections, undirected):
+    """Directed LINK rows of the connections, both directions if undirected."""
+    for conn in connections:
+        yield {'source': conn['station1'], 'target': conn['station2'], 'line': conn['line'], 'time': conn['time']}
         if undirected:
-            # Create bidirectional relationships for undirected graph
+            yield {'source': conn['station2'], 'target': conn['station1'], 'line': conn['line'], 'time': conn['time']}
+
+
+STATION_PROPERTIES = """
+SET s.name = station.name,
+    s.display_name = CASE station.display_name
+                 WHEN 'NULL' THEN station.name
+                 ELSE station.display_name
+                 END,
+    s.latitude = toFloat(station.latitude),
+    s.longitude = toFloat(station.longitude),
+    s.zone = CASE
+          WHEN station.zone CONTAINS '.' THEN toFloat(station.zone)
+          ELSE toInteger(station.zone)
+          END,
+    s.total_lines = toInteger(station.total_lines),
+    s.rail = toInteger(station.rail)
+"""
+
+
+def import_tube_data(uri, username, password, data_file=None, undirected=False,
+                     batch_size=DEFAULT_BATCH_SIZE, parallelism=DEFAULT_PARALLELISM,
+                     stations_file=None, connections_file=None, database=None):
+    """
+    Import the London Underground dataset, from a JSON file with "stations" and "connections"
+    arrays, or from stations and connections CSV files with the same columns.
+
+    When no stations exist yet, stations and links are CREATEd, with duplicate links dropped
+    on the client. Otherwise they are MERGEd, so the import can be repeated.
+    """
+    stations_file = stations_file or data_file
+    connections_file = connections_file or data_file
+    driver = GraphDatabase.driver(uri, auth=(username, password))
+
+    try:
+        with driver.session(database=database) as session:
+            # Create constraints separately
             session.run("""
-            UNWIND $connections AS conn
-            MATCH (s1:UndergroundStation {id: conn.station1})
-            MATCH (s2:UndergroundStation {id: conn.station2})
-            MERGE (s1)-[r1:LINK {
-                line: conn.line,
-                time: toInteger(conn.time),
-                distance: toInteger(conn.time)
-            }]->(s2)
-            MERGE (s2)-[r2:LINK {
-                line: conn.line,
-                time: toInteger(conn.time),
-                distance: toInteger(conn.time)
-            }]->(s1)
-            """, {'connections': data['connections']})
-        else:
-            # Create directed relationships (default behavior)
+            CREATE CONSTRAINT underground_station_name IF NOT EXISTS FOR (s:UndergroundStation) REQUIRE s.name IS UNIQUE
+            """)
+
             session.run("""
-            UNWIND $connections AS conn
-            MATCH (s1:UndergroundStation {id: conn.station1})
-            MATCH (s2:UndergroundStation {id: conn.station2})
-            MERGE (s1)-[r:LINK {
-                line: conn.line,
-                time: toInteger(conn.time),
-                distance: toInteger(conn.time)
-            }]->(s2)
-            """, {'connections': data['connections']})
-    
-    driver.close()
+            CREATE CONSTRAINT underground_station_id IF NOT EXISTS FOR (s:UndergroundStation) REQUIRE s.id IS UNIQUE
+            """)
+
+        empty = is_empty(driver, 'UndergroundStation', database)
+        write = 'CREATE' if empty else 'MERGE'
+
+        stations = iter_records(stations_file, 'stations')
+        if empty:
+            stations = unique(stations, lambda station: station['id'])
+        station_count = load_batches(driver, f"""
+        UNWIND $rows AS station
+        {write} (s:UndergroundStation {{id: station.id}})
+        {STATION_PROPERTIES}
+        """, stations, batch_size, database)
+
+        links = tube_links(iter_records(connections_file, 'connections'), undirected)
+        if empty:
+            links = unique(links, lambda link: (link['source'], link['target'], link['line'], link['time']))
+        link_count = load_relationships(driver, f"""
+        UNWIND $rows AS link
+        MATCH (s1:UndergroundStation {{id: link.source}})
+        MATCH (s2:UndergroundStation {{id: link.target}})
+        {write} (s1)-[r:LINK {{
+            line: link.line,
+            time: toInteger(link.time),
+            distance: toInteger(link.time)
+        }}]->(s2)
+        """, links, 'source', 'target', batch_size, parallelism, database)
+    finally:
+        driver.close()
+
+    return station_count, link_count
 
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Import London Underground data into Neo4j')
-    parser.add_argument('--undirected', action='store_true', 
+    parser.add_argument('--undirected', action='store_true',
                        help='Load the graph as undirected (creates bidirectional relationships)')
+    parser.add_argument('--data-file', default='dataset/london.json',
+                       help='JSON file with "stations" and "connections" arrays (default: dataset/london.json)')
+    parser.add_argument('--stations-csv', help='CSV file of stations, instead of the JSON file')
+    parser.add_argument('--connections-csv', help='CSV file of connections, instead of the JSON file')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Rows committed per transaction (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--parallelism', type=int, default=DEFAULT_PARALLELISM,
+                       help=f'Parallel sessions loading relationships (default: {DEFAULT_PARALLELISM})')
     args = parser.parse_args()
-    
+
     load_dotenv('.env')
-    
+
     uri = os.environ["NEO4J_URI"]
     username = os.environ["NEO4J_USERNAME"]
     password = os.environ["NEO4J_PASSWORD"]
-    data_file = "dataset/london.json"
-    
+
     print(f"Loading graph as {'undirected' if args.undirected else 'directed'}...")
-    import_tube_data(uri, username, password, data_file, undirected=args.undirected)
-    print("Import completed successfully!")
+    station_count, link_count = import_tube_data(
+        uri, username, password, args.data_file, undirected=args.undirected,
+        batch_size=args.batch_size, parallelism=args.parallelism,
+        stations_file=args.stations_csv, connections_file=args.connections_csv,
+    )
+    print(f"Import completed successfully! Loaded {station_count} stations and {link_count} links.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
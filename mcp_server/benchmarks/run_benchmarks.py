@@ -0,0 +1,393 @@
+"""
+End-to-end benchmarks for every tool in the algorithm registry.
+
+Each tool runs through `execute_tool` exactly as the server would, against one or more
+datasets. The time of every call is broken down into the phases the server reports in
+get_server_metrics and with --include-timings (result_cache, schema_discovery,
+projection, memory_estimation, algorithm, id_translation, serialization and handler,
+see `metrics.PHASES`).
+
+Datasets:
+
+    london              dataset/london.json on the in-process GDS stand-in
+    synthetic:EDGES     power-law graph with about EDGES relationships, e.g. synthetic:1e5
+    bolt://host:7687    a real database (credentials from NEO4J_USERNAME/NEO4J_PASSWORD),
+                        assumed to contain the London dataset
+
+Usage:
+
+    python benchmarks/run_benchmarks.py --datasets london,synthetic:1e4 --output results.json
+    python benchmarks/run_benchmarks.py --tools pagerank,louvain --baseline results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from mcp_server_neo4j_gds.gds import configure_projection_cache
+from mcp_server_neo4j_gds.metrics import configure_timings
+from mcp_server_neo4j_gds.registry import AlgorithmRegistry
+from mcp_server_neo4j_gds.server import execute_tool
+from mcp_server_neo4j_gds_testing.in_memory_gds import (
+    InMemoryGraphDataScience,
+    create_in_memory_gds,
+    synthetic_database,
+)
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+
+def reset_peak_rss():
+    """Reset the peak RSS of this process (Linux 4.0+), so it can be measured per tool."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak over the whole process lifetime; kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dataset_profile(name_prefix, weight, community, vector, prize):
+    """Property and node names the tool arguments of a dataset are built from."""
+    return {
+        "identifier": "name",
+        "source": f"{name_prefix[0]}",
+        "target": f"{name_prefix[1]}",
+        "targets": list(name_prefix[1:]),
+        "weight": weight,
+        "community": community,
+        "vector": vector,
+        "prize": prize,
+    }
+
+
+LONDON_PROFILE = dataset_profile(
+    ["Bayswater", "Westbourne Park", "Notting Hill Gate"],
+    weight="time",
+    community="total_lines",
+    vector=None,
+    prize="zone",
+)
+
+SYNTHETIC_PROFILE = dataset_profile(
+    ["node_100", "node_0", "node_1"],
+    weight="weight",
+    community="community_hint",
+    vector="embedding",
+    prize="score",
+)
+
+
+def tool_arguments(profile):
+    """Arguments for every registered tool on a dataset, None if it cannot run there."""
+    name = profile["identifier"]
+    weight = profile["weight"]
+    source, target = profile["source"], profile["target"]
+    named = {"nodeIdentifierProperty": name}
+    vector = profile["vector"]
+    return {
+        "article_rank": named,
+        "articulation_points": named,
+        "betweenness_centrality": named,
+        "bridges": named,
+        "CELF": {**named, "seedSetSize": 3, "monteCarloSimulations": 10},
+        "closeness_centrality": named,
+        "degree_centrality": named,
+        "eigenvector_centrality": named,
+        "pagerank": named,
+        "harmonic_centrality": named,
+        "HITS": named,
+        "conductance": {"communityProperty": profile["community"]},
+        "hdbscan": {**named, "nodeProperty": vector} if vector else None,
+        "k_core_decomposition": named,
+        "k_1_coloring": named,
+        "k_means_clustering": {**named, "nodeProperty": vector, "k": 5}
+        if vector
+        else None,
+        "label_propagation": named,
+        "leiden": named,
+        "local_clustering_coefficient": named,
+        "louvain": named,
+        "modularity_metric": {"communityProperty": profile["community"]},
+        "modularity_optimization": named,
+        "strongly_connected_components": named,
+        "triangle_count": named,
+        "weakly_connected_components": named,
+        "approximate_maximum_k_cut": named,
+        "speaker_listener_label_propagation": {**named, "maxIterations": 10},
+        "node_similarity": {**named, "topK": 3},
+        "k_nearest_neighbors": {**named, "nodeProperties": vector or "rail", "topK": 3},
+        "find_shortest_path": {
+            **named,
+            "start_node": source,
+            "end_node": target,
+            "relationship_property": weight,
+        },
+        "delta_stepping_shortest_path": {
+            **named,
+            "sourceNode": source,
+            "relationshipWeightProperty": weight,
+        },
+        "dijkstra_single_source_shortest_path": {
+            **named,
+            "sourceNode": source,
+            "relationshipWeightProperty": weight,
+        },
+        "a_star_shortest_path": {
+            **named,
+            "sourceNode": source,
+            "targetNode": target,
+            "latitudeProperty": "latitude",
+            "longitudeProperty": "longitude",
+            "relationshipWeightProperty": weight,
+        },
+        "yens_shortest_paths": {
+            **named,
+            "sourceNode": source,
+            "targetNode": target,
+            "k": 3,
+            "relationshipWeightProperty": weight,
+        },
+        "minimum_weight_spanning_tree": {
+            **named,
+            "sourceNode": source,
+            "relationshipWeightProperty": weight,
+        },
+        "minimum_directed_steiner_tree": {
+            **named,
+            "sourceNode": source,
+            "targetNodes": profile["targets"],
+            "relationshipWeightProperty": weight,
+        },
+        "prize_collecting_steiner_tree": {
+            "prizeProperty": profile["prize"],
+            "relationshipWeightProperty": weight,
+        },
+        "all_pairs_shortest_paths": {"relationshipWeightProperty": weight},
+        "random_walk": {**named, "walkLength": 10, "walksPerNode": 1},
+        "breadth_first_search": {**named, "sourceNode": source},
+        "depth_first_search": {**named, "sourceNode": source},
+        "bellman_ford_single_source_shortest_path": {
+            **named,
+            "sourceNode": source,
+            "relationshipWeightProperty": weight,
+        },
+        "longest_path": {**named, "relationshipWeightProperty": weight},
+        "run_pipeline": {
+            **named,
+            "steps": [
+                {"algorithm": "louvain", "mutateProperty": "community"},
+                {
+                    "algorithm": "conductance",
+                    "parameters": {"communityProperty": "community"},
+                },
+            ],
+        },
+    }
+
+
+def load_dataset(spec, degree):
+    """Return (gds, profile, description) for a dataset spec."""
+    if spec == "london":
+        return create_in_memory_gds("memory://london"), LONDON_PROFILE, {}
+    if spec.startswith("synthetic:"):
+        edges = int(float(spec.split(":", 1)[1]))
+        nodes = max(edges // degree, degree + 1)
+        contents = synthetic_database(nodes=nodes, degree=degree, seed=42)
+        return InMemoryGraphDataScience(contents), SYNTHETIC_PROFILE, {"edges": edges}
+    if "://" in spec:
+        from graphdatascience import GraphDataScience
+
+        gds = GraphDataScience(
+            spec,
+            auth=(
+                os.environ.get("NEO4J_USERNAME", "neo4j"),
+                os.environ.get("NEO4J_PASSWORD"),
+            ),
+            aura_ds=False,
+        )
+        return gds, LONDON_PROFILE, {}
+    raise ValueError(f"Unknown dataset '{spec}'")
+
+
+def run_tool(gds, tool, arguments):
+    reset_peak_rss()
+    rss_before = current_rss_mb()
+    error = None
+    timings = None
+    result_bytes = 0
+    start = time.perf_counter()
+    try:
+        output = execute_tool(gds, tool, dict(arguments))
+        # The last item of the output holds the phase timings of the call
+        timings = json.loads(output.pop())["timings"]
+        result_bytes = sum(len(item.encode()) for item in output)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    return {
+        "wallSeconds": wall,
+        "phasesMs": timings["phasesMs"] if timings else None,
+        "rssBeforeMb": rss_before,
+        "peakRssMb": peak_rss_mb(),
+        "resultBytes": result_bytes,
+        "error": error,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args):
+    tools = list(AlgorithmRegistry._handlers)
+    if args.tools:
+        tools = [tool for tool in tools if tool in args.tools]
+    tools = [tool for tool in tools if tool not in (args.exclude or [])]
+
+    results = []
+    for spec in args.datasets:
+        start = time.perf_counter()
+        gds, profile, description = load_dataset(spec, args.degree)
+        load_seconds = time.perf_counter() - start
+        arguments = tool_arguments(profile)
+        for tool in tools:
+            base = {"dataset": spec, **description, "tool": tool}
+            if arguments.get(tool) is None:
+                results.append({**base, "skipped": "no suitable arguments"})
+                continue
+            for run in range(args.repeat):
+                measurement = run_tool(gds, tool, arguments[tool])
+                results.append({**base, "run": run, **measurement})
+                status = measurement["error"] or "ok"
+                print(
+                    f"{spec:>18} {tool:<42} run {run} "
+                    f"{measurement['wallSeconds'] * 1000:10.1f} ms  {status}",
+                    file=sys.stderr,
+                )
+        results.append({"dataset": spec, "tool": None, "loadSeconds": load_seconds})
+        gds.close()
+
+    return {
+        "metadata": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "arguments": vars(args),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """Print wall time ratios of the first run of each tool against a baseline report."""
+
+    def first_runs(results):
+        return {
+            (r["dataset"], r["tool"]): r["wallSeconds"]
+            for r in results
+            if r.get("run") == 0 and not r.get("error")
+        }
+
+    current, previous = first_runs(report["results"]), first_runs(baseline["results"])
+    print(f"{'dataset':>18} {'tool':<42} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key in sorted(current.keys() & previous.keys()):
+        ratio = current[key] / previous[key] if previous[key] else float("inf")
+        print(
+            f"{key[0]:>18} {key[1]:<42} {previous[key] * 1000:8.1f}ms "
+            f"{current[key] * 1000:8.1f}ms {ratio:7.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--datasets",
+        type=lambda value: value.split(","),
+        default=["london", "synthetic:1e4"],
+        help="Comma separated datasets: london, synthetic:EDGES or a database URL",
+    )
+    parser.add_argument(
+        "--tools",
+        type=lambda value: value.split(","),
+        help="Comma separated tools to run. Default is every registered tool",
+    )
+    parser.add_argument(
+        "--exclude",
+        type=lambda value: value.split(","),
+        help="Comma separated tools to skip, e.g. all_pairs_shortest_paths on large graphs",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of runs per tool and dataset"
+    )
+    parser.add_argument(
+        "--degree",
+        type=int,
+        default=3,
+        help="Relationships added per node in synthetic graphs",
+    )
+    parser.add_argument(
+        "--projection-cache-size",
+        type=int,
+        default=0,
+        help="Projection cache size; 0 projects anew for every call",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare wall times against")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    configure_timings(include_in_response=True)
+    configure_projection_cache(max_entries=args.projection_cache_size, idle_ttl=600.0)
+
+    report = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    else:
+        json.dump(report, sys.stdout, indent=2, default=str)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import platform
 from dotenv import load_dotenv
 
 from . import server
+from .memory_estimation import MEMORY_BUDGET_ACTIONS
 import asyncio
 import argparse
 
@@ -39,12 +40,29 @@ def get_log_file_path():
         return "mcp-server-neo4j-gds.log"
 
 
+def parse_tool_timeouts(value):
+    """Parse per-tool timeouts given as 'tool=seconds,tool=seconds'."""
+    timeouts = {}
+    if not value:
+        return timeouts
+    for item in value.split(","):
+        tool, _, seconds = item.partition("=")
+        if not tool.strip() or not seconds.strip():
+            raise argparse.ArgumentTypeError(
+                f"Invalid tool timeout '{item}', expected 'tool=seconds'."
+            )
+        timeouts[tool.strip()] = float(seconds)
+    return timeouts
+
+
 def main():
     """Main entry point for the package."""
     load_dotenv("../../../.env")
     parser = argparse.ArgumentParser(description="Neo4j GDS MCP Server")
     parser.add_argument(
-        "--db-url", default=os.environ.get("NEO4J_URI"), help="URL to Neo4j database"
+        "--db-url",
+        default=os.environ.get("NEO4J_URI"),
+        help="URL to Neo4j database, or memory://london or memory://synthetic?nodes=N for an in-process stand-in without Neo4j (source checkouts only)",
     )
     parser.add_argument(
         "--username",
@@ -62,6 +80,146 @@ def main():
         help="Database name to connect to (optional). By default, the server will connect to the 'neo4j' database.",
     )
 
+    parser.add_argument(
+        "--max-connection-pool-size",
+        type=int,
+        default=os.environ.get("NEO4J_MAX_CONNECTION_POOL_SIZE"),
+        help="Maximum number of connections to Neo4j shared by all tool calls (optional). Defaults to the Neo4j driver default of 100.",
+    )
+    parser.add_argument(
+        "--connection-acquisition-timeout",
+        type=float,
+        default=os.environ.get("NEO4J_CONNECTION_ACQUISITION_TIMEOUT"),
+        help="Seconds a query waits for a free connection from the pool before failing (optional). Defaults to the Neo4j driver default of 60.",
+    )
+    parser.add_argument(
+        "--max-connection-lifetime",
+        type=float,
+        default=os.environ.get("NEO4J_MAX_CONNECTION_LIFETIME"),
+        help="Seconds after which a pooled connection is closed and replaced (optional). Defaults to the Neo4j driver default of 3600.",
+    )
+
+    parser.add_argument(
+        "--projection-cache-size",
+        type=int,
+        default=int(os.environ.get("GDS_PROJECTION_CACHE_SIZE", 4)),
+        help="Maximum number of projected graphs kept alive between tool calls. Set to 0 to project a fresh graph for every call.",
+    )
+    parser.add_argument(
+        "--projection-cache-ttl",
+        type=float,
+        default=float(os.environ.get("GDS_PROJECTION_CACHE_TTL", 600)),
+        help="Seconds an unused cached projection is kept before it is dropped.",
+    )
+    parser.add_argument(
+        "--projection-cache-memory-mb",
+        type=int,
+        default=os.environ.get("GDS_PROJECTION_CACHE_MEMORY_MB"),
+        help="Total memory budget in MiB for cached projections (optional). Least recently used projections are dropped first.",
+    )
+    parser.add_argument(
+        "--translation-batch-size",
+        type=int,
+        default=int(os.environ.get("GDS_TRANSLATION_BATCH_SIZE", 10000)),
+        help="Number of node ids resolved per query when adding node names to results.",
+    )
+    parser.add_argument(
+        "--translation-parallelism",
+        type=int,
+        default=int(os.environ.get("GDS_TRANSLATION_PARALLELISM", 4)),
+        help="Number of batches of node ids resolved in parallel when adding node names to results.",
+    )
+    parser.add_argument(
+        "--name-index-max-age",
+        type=float,
+        default=float(os.environ.get("GDS_NAME_INDEX_MAX_AGE", 300)),
+        help="Node names are resolved with an in-process index per identifier property, rebuilt after this many seconds to pick up changed names. Set to 0 to resolve names with database queries instead.",
+    )
+    parser.add_argument(
+        "--max-concurrent-tools",
+        type=int,
+        default=int(os.environ.get("GDS_MAX_CONCURRENT_TOOLS", 4)),
+        help="Maximum number of tool calls executed in parallel.",
+    )
+    parser.add_argument(
+        "--tool-timeout",
+        type=float,
+        default=os.environ.get("GDS_TOOL_TIMEOUT"),
+        help="Default timeout in seconds for a tool call (optional). By default, tool calls do not time out.",
+    )
+    parser.add_argument(
+        "--tool-timeouts",
+        type=parse_tool_timeouts,
+        default=os.environ.get("GDS_TOOL_TIMEOUTS", ""),
+        help="Per-tool timeouts overriding --tool-timeout, e.g. 'louvain=300,all_pairs_shortest_paths=60'.",
+    )
+    parser.add_argument(
+        "--max-result-rows",
+        type=int,
+        default=int(os.environ.get("GDS_MAX_RESULT_ROWS", 10000)),
+        help="Tabular results with more rows than this are returned in pages.",
+    )
+    parser.add_argument(
+        "--projection-mode",
+        choices=["auto", "cypher"],
+        default=os.environ.get("GDS_PROJECTION_MODE", "auto"),
+        help="'auto' projects graphs natively whenever no property values need converting and falls back to a Cypher projection otherwise. 'cypher' always uses a Cypher projection.",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        default=os.environ.get("GDS_MEMORY_BUDGET_MB"),
+        help="Memory budget in MiB for a single projection or algorithm run (optional). When set, the GDS memory estimate of each projection and algorithm is checked against it before it runs, and reported with the tool result.",
+    )
+    parser.add_argument(
+        "--memory-budget-action",
+        choices=MEMORY_BUDGET_ACTIONS,
+        default=os.environ.get("GDS_MEMORY_BUDGET_ACTION", "refuse"),
+        help="What to do with an algorithm run estimated to exceed --memory-budget-mb. 'refuse' returns an error with the estimate, 'downgrade' retries with a smaller topK or sample where the algorithm has one. 'queue' refuses like 'refuse', and makes the other runs wait until concurrent runs leave enough of the budget free.",
+    )
+
+    parser.add_argument(
+        "--result-spool-dir",
+        default=os.environ.get("GDS_RESULT_SPOOL_DIR"),
+        help="Directory that results requested with resultFormat 'arrow' or 'parquet' are written to (optional). Default is a temporary directory removed when the server shuts down.",
+    )
+    parser.add_argument(
+        "--result-spool-max-mb",
+        type=int,
+        default=int(os.environ.get("GDS_RESULT_SPOOL_MAX_MB", 1024)),
+        help="Maximum total size in MiB of the spooled result files. The oldest files are deleted beyond it (default: 1024)",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=float(os.environ.get("GDS_PROGRESS_INTERVAL", 2.0)),
+        help="Seconds between progress notifications of a running tool call, sent when the client asks for progress (default: 2)",
+    )
+    parser.add_argument(
+        "--result-cache-mb",
+        type=int,
+        default=int(os.environ.get("GDS_RESULT_CACHE_MB", 256)),
+        help="Memory in MiB for results of earlier algorithm tool calls, returned again for the same tool and arguments while the database is unchanged. 0 disables the result cache (default: 256)",
+    )
+    parser.add_argument(
+        "--result-cache-dir",
+        default=os.environ.get("GDS_RESULT_CACHE_DIR"),
+        help="Directory for an on-disk tier of the result cache (optional). Results evicted from memory are kept there, also across restarts.",
+    )
+    parser.add_argument(
+        "--result-cache-disk-mb",
+        type=int,
+        default=os.environ.get("GDS_RESULT_CACHE_DISK_MB"),
+        help="Maximum size in MiB of the on-disk tier of the result cache (optional). By default it is not bounded.",
+    )
+    parser.add_argument(
+        "--include-timings",
+        action="store_true",
+        default=os.environ.get("GDS_INCLUDE_TIMINGS", "").lower()
+        in ("1", "true", "yes"),
+        help="Append the time spent in each phase of a tool call (schema discovery, projection, algorithm, id translation, serialization, ...) to its response. The get_server_metrics tool reports the percentiles of these timings either way.",
+    )
+
     args = parser.parse_args()
 
     log_file = get_log_file_path()
@@ -83,6 +241,31 @@ def main():
             username=args.username,
             password=args.password,
             database=args.database,
+            projection_cache_size=args.projection_cache_size,
+            projection_cache_ttl=args.projection_cache_ttl,
+            projection_cache_memory_mb=args.projection_cache_memory_mb,
+            translation_batch_size=args.translation_batch_size,
+            name_index_max_age=args.name_index_max_age,
+            max_concurrent_tools=args.max_concurrent_tools,
+            tool_timeout=args.tool_timeout,
+            tool_timeouts=args.tool_timeouts,
+            max_result_rows=args.max_result_rows,
+            projection_mode=args.projection_mode,
+            driver_config={
+                "max_connection_pool_size": args.max_connection_pool_size,
+                "connection_acquisition_timeout": args.connection_acquisition_timeout,
+                "max_connection_lifetime": args.max_connection_lifetime,
+            },
+            translation_parallelism=args.translation_parallelism,
+            memory_budget_mb=args.memory_budget_mb,
+            memory_budget_action=args.memory_budget_action,
+            result_spool_dir=args.result_spool_dir,
+            result_spool_max_mb=args.result_spool_max_mb,
+            progress_interval=args.progress_interval,
+            result_cache_mb=args.result_cache_mb,
+            result_cache_dir=args.result_cache_dir,
+            result_cache_disk_mb=args.result_cache_disk_mb,
+            include_timings=args.include_timings,
         )
     )
 
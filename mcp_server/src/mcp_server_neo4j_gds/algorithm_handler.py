@@ -1,11 +1,37 @@
+import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from graphdatascience import GraphDataScience
 
+from .algorithm_modes import summary_row
+from .gds import ProjectionFilter
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
 
 class AlgorithmHandler(ABC):
-    def __init__(self, gds: GraphDataScience):
+    def __init__(
+        self,
+        gds: GraphDataScience,
+        projection_filter: ProjectionFilter = None,
+        mode: str = "stream",
+        mode_config: Dict[str, Any] = None,
+    ):
         self.gds = gds
+        self.projection_filter = projection_filter
+        self.mode = mode
+        self.mode_config = mode_config or {}
+
+    def run_in_mode(self, procedure, G, *args, **config):
+        """
+        Run `procedure` (e.g. `self.gds.pageRank`) in the stats or write mode of the
+        tool call, with the mode configuration such as the writeProperty, and return
+        its summary row.
+        """
+        config = {key: value for key, value in config.items() if value is not None}
+        logger.info(f"Running in {self.mode} mode with {config} and {self.mode_config}")
+        result = getattr(procedure, self.mode)(G, *args, **config, **self.mode_config)
+        return summary_row(result)
 
     @abstractmethod
     def execute(self, arguments: Dict[str, Any]) -> Any:
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Mutating a projection is left to run_pipeline, whose later steps can read the result
+ALGORITHM_MODES = ["stream", "stats", "write"]
+
+# Tool arguments that select the execution mode, passed to the GDS procedure as is
+MODE_CONFIGURATION = {
+    "write": ["writeProperty", "writeRelationshipType", "writeConcurrency"],
+}
+MODE_ARGUMENTS = ["mode"] + [
+    argument for arguments in MODE_CONFIGURATION.values() for argument in arguments
+]
+# Tool arguments that select rows of the streamed result, which the other modes lack
+STREAM_ARGUMENTS = ["topK", "bottomK"]
+
+
+def pop_mode(arguments):
+    """
+    Remove the mode arguments from the tool arguments.
+
+    Returns the mode and the configuration the GDS procedure of that mode needs,
+    e.g. the writeProperty.
+    """
+    mode = arguments.pop("mode", None) or "stream"
+    if mode == "mutate":
+        raise ValueError(
+            "mutate mode is only available in run_pipeline, use the mutateProperty of its steps."
+        )
+    if mode not in ALGORITHM_MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Expected one of {ALGORITHM_MODES}.")
+    config = {}
+    for argument in MODE_ARGUMENTS[1:]:
+        value = arguments.pop(argument, None)
+        if value is None:
+            continue
+        if argument not in MODE_CONFIGURATION.get(mode, []):
+            raise ValueError(f"'{argument}' is not used in {mode} mode.")
+        config[argument] = value
+    if mode != "stream":
+        for argument in STREAM_ARGUMENTS:
+            if arguments.get(argument) is not None:
+                raise ValueError(f"{argument} cannot be used in {mode} mode.")
+        if arguments.get("outputFormat") not in (None, "nodes"):
+            raise ValueError(f"outputFormat cannot be used in {mode} mode.")
+    return mode, config
+
+
+def summary_row(result):
+    """The summary row of a stats, mutate or write procedure as a JSON serializable dict."""
+    summary = result.to_dict() if hasattr(result, "to_dict") else dict(result)
+    return {key: _plain(value) for key, value in summary.items()}
+
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
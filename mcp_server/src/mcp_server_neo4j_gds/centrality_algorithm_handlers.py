@@ -2,26 +2,65 @@ import logging
 from typing import Any, Dict
 
 from .algorithm_handler import AlgorithmHandler
-from .gds import projected_graph
+from .gds import projected_graph, stream_top_k
 from .node_translator import (
     filter_identifiers,
+    node_ids_of_identifiers,
     translate_ids_to_identifiers,
     translate_identifiers_to_ids,
 )
+from .shared_specs import ranking_properties
 
 logger = logging.getLogger("mcp_server_neo4j_gds")
 
+# Tool arguments of the score-based handlers that are not algorithm configuration
+_NON_ALGORITHM_ARGUMENTS = ["nodes", "nodeIdentifierProperty", *ranking_properties]
+
+
+def stream_scores(gds, G, endpoint, params, kwargs, score="score", score_key=None):
+    """
+    Stream the scores of `gds.<endpoint>` for every node.
+
+    With topK or bottomK only that many of the highest or lowest scoring nodes (among
+    `nodes`, if given) are returned, ranked in the database.
+    """
+    top_k, bottom_k = kwargs.get("topK"), kwargs.get("bottomK")
+    if top_k is None and bottom_k is None:
+        procedure = gds
+        for name in endpoint.split("."):
+            procedure = getattr(procedure, name)
+        return procedure.stream(G, **params)
+    if top_k is not None and bottom_k is not None:
+        raise ValueError("Only one of 'topK' and 'bottomK' can be specified.")
+
+    node_names = kwargs.get("nodes")
+    node_ids = (
+        node_ids_of_identifiers(gds, kwargs.get("nodeIdentifierProperty"), node_names)
+        if node_names is not None
+        else None
+    )
+    return stream_top_k(
+        gds,
+        G,
+        endpoint,
+        params,
+        top_k if top_k is not None else bottom_k,
+        ascending=top_k is None,
+        node_ids=node_ids,
+        score=score,
+        score_key=score_key,
+    )
+
 
 class ArticleRankHandler(AlgorithmHandler):
     def article_rank(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             args = locals()
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None
-                and k not in ["nodes", "nodeIdentifierProperty", "sourceNodes"]
+                if v is not None and k not in [*_NON_ALGORITHM_ARGUMENTS, "sourceNodes"]
             }
             node_names = kwargs.get("nodes", None)
             node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -33,7 +72,10 @@ class ArticleRankHandler(AlgorithmHandler):
             )
 
             logger.info(f"ArticleRank parameters: {params}")
-            article_ranks = self.gds.articleRank.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.articleRank, G, **params)
+
+            article_ranks = stream_scores(self.gds, G, "articleRank", params, kwargs)
 
         translate_ids_to_identifiers(self.gds, node_identifier_property, article_ranks)
 
@@ -48,6 +90,8 @@ class ArticleRankHandler(AlgorithmHandler):
         return self.article_rank(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             sourceNodes=arguments.get("sourceNodes"),
             scaler=arguments.get("scaler"),
             dampingFactor=arguments.get("dampingFactor"),
@@ -58,7 +102,12 @@ class ArticleRankHandler(AlgorithmHandler):
 
 class ArticulationPointsHandler(AlgorithmHandler):
     def articulation_points(self, **kwargs):
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.articulationPoints, G)
+
             articulation_points = self.gds.articulationPoints.stream(G)
 
         # Add node names to the results if nodeIdentifierProperty is provided
@@ -76,14 +125,17 @@ class ArticulationPointsHandler(AlgorithmHandler):
 
 class BetweennessCentralityHandler(AlgorithmHandler):
     def betweenness_centrality(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None and k not in ["nodes", "nodeIdentifierProperty"]
+                if v is not None and k not in _NON_ALGORITHM_ARGUMENTS
             }
             logger.info(f"Betweenness centrality parameters: {params}")
-            centrality = self.gds.betweenness.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.betweenness, G, **params)
+
+            centrality = stream_scores(self.gds, G, "betweenness", params, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -101,6 +153,8 @@ class BetweennessCentralityHandler(AlgorithmHandler):
         return self.betweenness_centrality(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             samplingSize=arguments.get("samplingSize"),
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
         )
@@ -108,7 +162,12 @@ class BetweennessCentralityHandler(AlgorithmHandler):
 
 class BridgesHandler(AlgorithmHandler):
     def bridges(self, **kwargs):
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.bridges, G)
+
             bridges_result = self.gds.bridges.stream(G)
 
         # Add node names to the results if nodeIdentifierProperty is provided
@@ -130,13 +189,18 @@ class BridgesHandler(AlgorithmHandler):
 
 class CELFHandler(AlgorithmHandler):
     def celf(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
                 if v is not None and k not in ["nodeIdentifierProperty"]
             }
             logger.info(f"CELF parameters: {params}")
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.influenceMaximization.celf, G, **params
+                )
+
             result = self.gds.influenceMaximization.celf.stream(G, **params)
 
         # Add node names to the results if nodeIdentifierProperty is provided
@@ -150,20 +214,24 @@ class CELFHandler(AlgorithmHandler):
             seedSetSize=arguments.get("seedSetSize"),
             monteCarloSimulations=arguments.get("monteCarloSimulations"),
             propagationProbability=arguments.get("propagationProbability"),
+            randomSeed=arguments.get("randomSeed"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
         )
 
 
 class ClosenessCentralityHandler(AlgorithmHandler):
     def closeness_centrality(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None and k not in ["nodes", "nodeIdentifierProperty"]
+                if v is not None and k not in _NON_ALGORITHM_ARGUMENTS
             }
             logger.info(f"Closeness centrality parameters: {params}")
-            centrality = self.gds.closeness.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.closeness, G, **params)
+
+            centrality = stream_scores(self.gds, G, "closeness", params, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -181,20 +249,25 @@ class ClosenessCentralityHandler(AlgorithmHandler):
         return self.closeness_centrality(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             useWassermanFaust=arguments.get("useWassermanFaust"),
         )
 
 
 class DegreeCentralityHandler(AlgorithmHandler):
     def degree_centrality(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None and k not in ["nodes", "nodeIdentifierProperty"]
+                if v is not None and k not in _NON_ALGORITHM_ARGUMENTS
             }
             logger.info(f"Degree centrality parameters: {params}")
-            centrality = self.gds.degree.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.degree, G, **params)
+
+            centrality = stream_scores(self.gds, G, "degree", params, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -212,18 +285,19 @@ class DegreeCentralityHandler(AlgorithmHandler):
         return self.degree_centrality(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             orientation=arguments.get("orientation"),
         )
 
 
 class EigenvectorCentralityHandler(AlgorithmHandler):
     def eigenvector_centrality(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None
-                and k not in ["nodes", "nodeIdentifierProperty", "sourceNodes"]
+                if v is not None and k not in [*_NON_ALGORITHM_ARGUMENTS, "sourceNodes"]
             }
             node_identifier_property = kwargs.get("nodeIdentifierProperty")
             source_nodes = kwargs.get("sourceNodes", None)
@@ -234,7 +308,10 @@ class EigenvectorCentralityHandler(AlgorithmHandler):
             )
 
             logger.info(f"Eigenvector centrality parameters: {params}")
-            centrality = self.gds.eigenvector.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.eigenvector, G, **params)
+
+            centrality = stream_scores(self.gds, G, "eigenvector", params, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -252,6 +329,8 @@ class EigenvectorCentralityHandler(AlgorithmHandler):
         return self.eigenvector_centrality(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             maxIterations=arguments.get("maxIterations"),
             tolerance=arguments.get("tolerance"),
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
@@ -262,12 +341,11 @@ class EigenvectorCentralityHandler(AlgorithmHandler):
 
 class PageRankHandler(AlgorithmHandler):
     def pagerank(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None
-                and k not in ["nodes", "nodeIdentifierProperty", "sourceNodes"]
+                if v is not None and k not in [*_NON_ALGORITHM_ARGUMENTS, "sourceNodes"]
             }
             node_identifier_property = kwargs.get("nodeIdentifierProperty")
             source_nodes = kwargs.get("sourceNodes", None)
@@ -277,7 +355,10 @@ class PageRankHandler(AlgorithmHandler):
                 self.gds, source_nodes, "sourceNodes", node_identifier_property, params
             )
             logger.info(f"Pagerank parameters: {params}")
-            pageranks = self.gds.pageRank.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.pageRank, G, **params)
+
+            pageranks = stream_scores(self.gds, G, "pageRank", params, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -295,6 +376,8 @@ class PageRankHandler(AlgorithmHandler):
         return self.pagerank(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             sourceNodes=arguments.get("sourceNodes"),
             dampingFactor=arguments.get("dampingFactor"),
             maxIterations=arguments.get("maxIterations"),
@@ -304,8 +387,11 @@ class PageRankHandler(AlgorithmHandler):
 
 class HarmonicCentralityHandler(AlgorithmHandler):
     def harmonic_centrality(self, **kwargs):
-        with projected_graph(self.gds) as G:
-            centrality = self.gds.closeness.harmonic.stream(G)
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.closeness.harmonic, G)
+
+            centrality = stream_scores(self.gds, G, "closeness.harmonic", {}, kwargs)
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -322,19 +408,32 @@ class HarmonicCentralityHandler(AlgorithmHandler):
         return self.harmonic_centrality(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
         )
 
 
 class HITSHandler(AlgorithmHandler):
     def hits(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
-                if v is not None and k not in ["nodes", "nodeIdentifierProperty"]
+                if v is not None and k not in _NON_ALGORITHM_ARGUMENTS
             }
             logger.info(f"HITS parameters: {params}")
-            result = self.gds.hits.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.hits, G, **params)
+
+            result = stream_scores(
+                self.gds,
+                G,
+                "hits",
+                params,
+                kwargs,
+                score="values",
+                score_key=params.get("authProperty", "auth"),
+            )
 
         # Add node names to the results if nodeIdentifierProperty is provided
         node_identifier_property = kwargs.get("nodeIdentifierProperty")
@@ -351,6 +450,8 @@ class HITSHandler(AlgorithmHandler):
         return self.hits(
             nodes=arguments.get("nodes"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+            topK=arguments.get("topK"),
+            bottomK=arguments.get("bottomK"),
             hitsIterations=arguments.get("hitsIterations"),
             authProperty=arguments.get("authProperty"),
             hubProperty=arguments.get("hubProperty"),
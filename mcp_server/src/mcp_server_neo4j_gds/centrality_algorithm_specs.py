@@ -1,5 +1,20 @@
 from mcp import types
 
+from .shared_specs import ranking_properties
+
+# HITS ranks nodes by their authority score
+hits_ranking_properties = {
+    **ranking_properties,
+    "topK": {
+        "type": "integer",
+        "description": "Only return the K nodes with the highest authority scores. The ranking is done in the database, so only K rows are returned.",
+    },
+    "bottomK": {
+        "type": "integer",
+        "description": "Only return the K nodes with the lowest authority scores. Cannot be combined with topK.",
+    },
+}
+
 centrality_tool_definitions = [
     types.Tool(
         name="article_rank",
@@ -60,6 +75,7 @@ centrality_tool_definitions = [
                     "Supported values are None, MinMax, Max, Mean, Log, and StdScore. "
                     "To apply scaler-specific configuration, use the Map syntax: {scaler: 'name', ...}.",
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -101,6 +117,7 @@ centrality_tool_definitions = [
                     "type": "string",
                     "description": "Property of the relationship to use for weighting. If not specified, all relationships are treated equally.",
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -138,6 +155,10 @@ centrality_tool_definitions = [
                     "type": "number",
                     "description": "The probability of propagating influence from a node to its neighbors.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). Use get_node_properties_keys to find available properties.",
@@ -167,6 +188,7 @@ centrality_tool_definitions = [
                     "type": "boolean",
                     "description": "If true, uses the Wasserman-Faust formula for closeness centrality. ",
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -190,6 +212,7 @@ centrality_tool_definitions = [
                     "type": "string",
                     "description": "The orientation used to compute node degrees. Supported orientations are NATURAL (for out-degree), REVERSE (for in-degree) and UNDIRECTED (for both in-degree and out-degree) ",
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -256,6 +279,7 @@ centrality_tool_definitions = [
                     "Supported values are None, MinMax, Max, Mean, Log, and StdScore. "
                     "To apply scaler-specific configuration, use the Map syntax: {scaler: 'name', ...}.",
                 },
+                **ranking_properties,
             },
         },
     ),
@@ -307,6 +331,7 @@ centrality_tool_definitions = [
                         },
                     ],
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -327,6 +352,7 @@ centrality_tool_definitions = [
                     "type": "string",
                     "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). Use get_node_properties_keys to find available properties.",
                 },
+                **ranking_properties,
             },
             "required": [],
         },
@@ -365,6 +391,7 @@ centrality_tool_definitions = [
                     "enum": ["AUTO", "RANGE", "DEGREE"],
                     "description": "The partitioning scheme used to divide the work between threads. Available options are AUTO, RANGE, DEGREE.",
                 },
+                **hits_ranking_properties,
             },
             "required": [],
         },
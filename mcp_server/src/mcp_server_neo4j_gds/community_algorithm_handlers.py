@@ -1,4 +1,5 @@
 import logging
+from abc import abstractmethod
 from typing import Dict, Any
 from .node_translator import (
     filter_identifiers,
@@ -7,15 +8,86 @@ from .node_translator import (
 
 
 from .algorithm_handler import AlgorithmHandler
+from .community_summary import (
+    SUMMARY_ARGUMENTS,
+    stream_with_modularity,
+    summarize_communities,
+    wants_summary,
+)
 from .gds import projected_graph
 
 logger = logging.getLogger("mcp_server_neo4j_gds")
 
 
+class CommunityHandler(AlgorithmHandler):
+    """
+    Base of the community detection handlers that can return a summary of the
+    communities (outputFormat 'summary') instead of the community of every node.
+
+    `execute` takes the summary arguments out of the tool arguments and passes the
+    others to `execute_communities`.
+    """
+
+    # Column of the stream result that holds the community of a node
+    community_column = "communityId"
+    # Whether the summary includes the modularity of the communities
+    summarize_modularity = False
+
+    def execute(self, arguments: Dict[str, Any]) -> Any:
+        arguments = dict(arguments)
+        self.summary_options = {
+            argument: arguments.pop(argument, None) for argument in SUMMARY_ARGUMENTS
+        }
+        self.summary = wants_summary(self.summary_options)
+        self.modularity = None
+        return self.execute_communities(arguments)
+
+    @abstractmethod
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
+        pass
+
+    def community_graph(self, undirected=False):
+        # The modularity is computed from a temporary node property mutated into the
+        # projection, so a summary with modularity does not share the cached projection
+        return projected_graph(
+            self.gds,
+            undirected=undirected,
+            cached=not (self.summary and self.summarize_modularity),
+            projection_filter=self.projection_filter,
+        )
+
+    def stream_communities(self, G, endpoint, params):
+        if self.summary and self.summarize_modularity:
+            result, self.modularity = stream_with_modularity(
+                self.gds, G, endpoint, params, self.community_column
+            )
+            return result
+        return endpoint.stream(G, **params)
+
+    def communities_result(self, result, node_identifier_property):
+        if self.summary:
+            return summarize_communities(
+                self.gds,
+                result,
+                self.community_column,
+                node_identifier_property,
+                modularity=self.modularity,
+                top_n=self.summary_options["summaryTopN"],
+                sample_size=self.summary_options["summarySampleSize"],
+            )
+
+        # Add node names to the results if nodeIdentifierProperty is provided
+        translate_ids_to_identifiers(self.gds, node_identifier_property, result)
+        return result
+
+
 class ConductanceHandler(AlgorithmHandler):
     def conductance(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             logger.info(f"Conductance parameters: {kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.conductance, G, **kwargs)
+
             conductance = self.gds.conductance.stream(G, **kwargs)
 
         return conductance
@@ -27,24 +99,27 @@ class ConductanceHandler(AlgorithmHandler):
         )
 
 
-class HDBSCANHandler(AlgorithmHandler):
+class HDBSCANHandler(CommunityHandler):
+    community_column = "label"
+
     def hdbscan(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
                 if v is not None and k not in ["nodeIdentifierProperty"]
             }
             logger.info(f"HDBSCAN parameters: {params}")
-            hdbscan_result = self.gds.hdbscan.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.hdbscan, G, **params)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(self.gds, node_identifier_property, hdbscan_result)
+            hdbscan_result = self.stream_communities(G, self.gds.hdbscan, params)
 
-        return hdbscan_result
+        return self.communities_result(
+            hdbscan_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.hdbscan(
             nodeProperty=arguments.get("nodeProperty"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
@@ -56,8 +131,13 @@ class HDBSCANHandler(AlgorithmHandler):
 
 class KCoreDecompositionHandler(AlgorithmHandler):
     def k_core_decomposition(self, **kwargs):
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
             logger.info("Running K-Core Decomposition")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.kcore, G)
+
             k_core_decomposition_result = self.gds.kcore.stream(G)
 
         # Add node names to the results if nodeIdentifierProperty is provided
@@ -73,26 +153,27 @@ class KCoreDecompositionHandler(AlgorithmHandler):
         )
 
 
-class K1ColoringHandler(AlgorithmHandler):
+class K1ColoringHandler(CommunityHandler):
+    community_column = "color"
+
     def k_1_coloring(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
                 if v is not None and k not in ["nodeIdentifierProperty"]
             }
             logger.info(f"K-1 Coloring parameters: {params}")
-            k1_coloring_result = self.gds.k1coloring.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.k1coloring, G, **params)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, k1_coloring_result
-        )
+            k1_coloring_result = self.stream_communities(G, self.gds.k1coloring, params)
 
-        return k1_coloring_result
+        return self.communities_result(
+            k1_coloring_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.k_1_coloring(
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
             maxIterations=arguments.get("maxIterations"),
@@ -100,26 +181,27 @@ class K1ColoringHandler(AlgorithmHandler):
         )
 
 
-class KMeansClusteringHandler(AlgorithmHandler):
+class KMeansClusteringHandler(CommunityHandler):
     def k_means_clustering(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
                 if v is not None and k not in ["nodeIdentifierProperty"]
             }
             logger.info(f"K-Means Clustering parameters: {params}")
-            kmeans_clustering_result = self.gds.kmeans.stream(G, **params)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.kmeans, G, **params)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, kmeans_clustering_result
-        )
+            kmeans_clustering_result = self.stream_communities(
+                G, self.gds.kmeans, params
+            )
 
-        return kmeans_clustering_result
+        return self.communities_result(
+            kmeans_clustering_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.k_means_clustering(
             nodeProperty=arguments.get("nodeProperty"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
@@ -130,29 +212,35 @@ class KMeansClusteringHandler(AlgorithmHandler):
             initialSampler=arguments.get("initialSampler"),
             seedCentroids=arguments.get("seedCentroids"),
             computeSilhouette=arguments.get("computeSilhouette"),
+            randomSeed=arguments.get("randomSeed"),
+            # GDS only accepts a random seed for single-threaded runs
+            concurrency=1 if arguments.get("randomSeed") is not None else None,
         )
 
 
-class LabelPropagationHandler(AlgorithmHandler):
+class LabelPropagationHandler(CommunityHandler):
+    summarize_modularity = True
+
     def label_propagation(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Label Propagation parameters: {gds_kwargs}")
-            label_propagation_result = self.gds.labelPropagation.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.labelPropagation, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, label_propagation_result
-        )
+            label_propagation_result = self.stream_communities(
+                G, self.gds.labelPropagation, gds_kwargs
+            )
 
-        return label_propagation_result
+        return self.communities_result(
+            label_propagation_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.label_propagation(
             maxIterations=arguments.get("maxIterations"),
             nodeWeightProperty=arguments.get("nodeWeightProperty"),
@@ -164,24 +252,27 @@ class LabelPropagationHandler(AlgorithmHandler):
         )
 
 
-class LeidenHandler(AlgorithmHandler):
+class LeidenHandler(CommunityHandler):
+    summarize_modularity = True
+
     def leiden(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds, undirected=True) as G:
+        with self.community_graph(undirected=True) as G:
             logger.info(f"Leiden parameters: {gds_kwargs}")
-            leiden_result = self.gds.leiden.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.leiden, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(self.gds, node_identifier_property, leiden_result)
+            leiden_result = self.stream_communities(G, self.gds.leiden, gds_kwargs)
 
-        return leiden_result
+        return self.communities_result(
+            leiden_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.leiden(
             maxLevels=arguments.get("maxLevels"),
             gamma=arguments.get("gamma"),
@@ -191,6 +282,7 @@ class LeidenHandler(AlgorithmHandler):
                 "includeIntermediateCommunities"
             ),
             seedProperty=arguments.get("seedProperty"),
+            randomSeed=arguments.get("randomSeed"),
             minCommunitySize=arguments.get("minCommunitySize"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
         )
@@ -205,8 +297,15 @@ class LocalClusteringCoefficientHandler(AlgorithmHandler):
             if k not in ["nodeIdentifierProperty", "nodes"]
         }
 
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
             logger.info(f"Local Clustering Coefficient parameters: {gds_kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.localClusteringCoefficient, G, **gds_kwargs
+                )
+
             local_clustering_coefficient_result = (
                 self.gds.localClusteringCoefficient.stream(G, **gds_kwargs)
             )
@@ -238,24 +337,27 @@ class LocalClusteringCoefficientHandler(AlgorithmHandler):
         )
 
 
-class LouvainHandler(AlgorithmHandler):
+class LouvainHandler(CommunityHandler):
+    summarize_modularity = True
+
     def louvain(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Louvain parameters: {gds_kwargs}")
-            louvain_result = self.gds.louvain.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.louvain, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(self.gds, node_identifier_property, louvain_result)
+            louvain_result = self.stream_communities(G, self.gds.louvain, gds_kwargs)
 
-        return louvain_result
+        return self.communities_result(
+            louvain_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.louvain(
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
             seedProperty=arguments.get("seedProperty"),
@@ -273,8 +375,11 @@ class LouvainHandler(AlgorithmHandler):
 
 class ModularityMetricHandler(AlgorithmHandler):
     def modularity_metric(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             logger.info(f"Modularity Metric parameters: {kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.modularity, G, **kwargs)
+
             modularity_metric_result = self.gds.modularity.stream(G, **kwargs)
 
         return modularity_metric_result
@@ -286,28 +391,31 @@ class ModularityMetricHandler(AlgorithmHandler):
         )
 
 
-class ModularityOptimizationHandler(AlgorithmHandler):
+class ModularityOptimizationHandler(CommunityHandler):
+    summarize_modularity = True
+
     def modularity_optimization(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Modularity Optimization parameters: {gds_kwargs}")
-            modularity_optimization_result = self.gds.modularityOptimization.stream(
-                G, **gds_kwargs
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.modularityOptimization, G, **gds_kwargs
+                )
+
+            modularity_optimization_result = self.stream_communities(
+                G, self.gds.modularityOptimization, gds_kwargs
             )
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, modularity_optimization_result
+        return self.communities_result(
+            modularity_optimization_result, kwargs.get("nodeIdentifierProperty")
         )
 
-        return modularity_optimization_result
-
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.modularity_optimization(
             maxIterations=arguments.get("maxIterations"),
             tolerance=arguments.get("tolerance"),
@@ -319,26 +427,29 @@ class ModularityOptimizationHandler(AlgorithmHandler):
         )
 
 
-class StronglyConnectedComponentsHandler(AlgorithmHandler):
+class StronglyConnectedComponentsHandler(CommunityHandler):
+    community_column = "componentId"
+
     def strongly_connected_components(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Strongly Connected Components parameters: {gds_kwargs}")
-            strongly_connected_components_result = self.gds.scc.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.scc, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, strongly_connected_components_result
-        )
+            strongly_connected_components_result = self.stream_communities(
+                G, self.gds.scc, gds_kwargs
+            )
 
-        return strongly_connected_components_result
+        return self.communities_result(
+            strongly_connected_components_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.strongly_connected_components(
             consecutiveIds=arguments.get("consecutiveIds"),
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
@@ -354,8 +465,13 @@ class TriangleCountHandler(AlgorithmHandler):
             if k not in ["nodeIdentifierProperty", "nodes"]
         }
 
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
             logger.info(f"Triangle Count parameters: {gds_kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.triangleCount, G, **gds_kwargs)
+
             triangle_count_result = self.gds.triangleCount.stream(G, **gds_kwargs)
 
         # Get filtering parameters
@@ -382,26 +498,30 @@ class TriangleCountHandler(AlgorithmHandler):
         )
 
 
-class WeaklyConnectedComponentsHandler(AlgorithmHandler):
+class WeaklyConnectedComponentsHandler(CommunityHandler):
+    community_column = "componentId"
+    summarize_modularity = True
+
     def weakly_connected_components(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Weakly Connected Components parameters: {gds_kwargs}")
-            weakly_connected_components_result = self.gds.wcc.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.wcc, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, weakly_connected_components_result
-        )
+            weakly_connected_components_result = self.stream_communities(
+                G, self.gds.wcc, gds_kwargs
+            )
 
-        return weakly_connected_components_result
+        return self.communities_result(
+            weakly_connected_components_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.weakly_connected_components(
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
             seedProperty=arguments.get("seedProperty"),
@@ -412,32 +532,36 @@ class WeaklyConnectedComponentsHandler(AlgorithmHandler):
         )
 
 
-class ApproximateMaximumKCutHandler(AlgorithmHandler):
+class ApproximateMaximumKCutHandler(CommunityHandler):
     def approximate_maximum_k_cut(self, **kwargs):
         # Filter out nodeIdentifierProperty as it's not a GDS algorithm parameter
         gds_kwargs = {
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with self.community_graph() as G:
             logger.info(f"Approximate Maximum K Cut parameters: {gds_kwargs}")
-            approximate_maximum_k_cut_result = self.gds.maxkcut.stream(G, **gds_kwargs)
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.maxkcut, G, **gds_kwargs)
 
-        # Add node names to the results if nodeIdentifierProperty is provided
-        node_identifier_property = kwargs.get("nodeIdentifierProperty")
-        translate_ids_to_identifiers(
-            self.gds, node_identifier_property, approximate_maximum_k_cut_result
-        )
+            approximate_maximum_k_cut_result = self.stream_communities(
+                G, self.gds.maxkcut, gds_kwargs
+            )
 
-        return approximate_maximum_k_cut_result
+        return self.communities_result(
+            approximate_maximum_k_cut_result, kwargs.get("nodeIdentifierProperty")
+        )
 
-    def execute(self, arguments: Dict[str, Any]) -> Any:
+    def execute_communities(self, arguments: Dict[str, Any]) -> Any:
         return self.approximate_maximum_k_cut(
             k=arguments.get("k"),
             iterations=arguments.get("iterations"),
             vnsMaxNeighborhoodOrder=arguments.get("vnsMaxNeighborhoodOrder"),
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
             minCommunitySize=arguments.get("minCommunitySize"),
+            randomSeed=arguments.get("randomSeed"),
+            # GDS only accepts a random seed for single-threaded runs
+            concurrency=1 if arguments.get("randomSeed") is not None else None,
             nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
         )
 
@@ -449,8 +573,11 @@ class SpeakerListenerLabelPropagationHandler(AlgorithmHandler):
             k: v for k, v in kwargs.items() if k not in ["nodeIdentifierProperty"]
         }
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             logger.info(f"Speaker Listener Label Propagation parameters: {gds_kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.sllpa, G, **gds_kwargs)
+
             speaker_listener_label_propagation_result = self.gds.sllpa.stream(
                 G, **gds_kwargs
             )
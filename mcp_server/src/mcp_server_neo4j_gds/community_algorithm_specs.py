@@ -1,5 +1,7 @@
 from mcp import types
 
+from .shared_specs import community_summary_properties
+
 community_tool_definitions = [
     types.Tool(
         name="conductance",
@@ -54,6 +56,7 @@ community_tool_definitions = [
                     "type": "integer",
                     "description": "The number of leaf nodes of the supporting tree data structure.",
                 },
+                **community_summary_properties,
             },
             "required": ["nodeProperty"],
         },
@@ -105,6 +108,7 @@ community_tool_definitions = [
                     "type": "integer",
                     "description": "Only nodes inside communities larger or equal the given value are returned.",
                 },
+                **community_summary_properties,
             },
             "required": [],
         },
@@ -128,6 +132,10 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "A node property corresponding to an array of floats used by K-Means to cluster nodes into communities.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible; the algorithm then runs single-threaded. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). Use get_node_properties_keys to find available properties.",
@@ -162,6 +170,7 @@ community_tool_definitions = [
                     "type": "boolean",
                     "description": "If set to true, the silhouette scores are computed once the clustering has been determined. Silhouette is a metric on how well the nodes have been clustered.",
                 },
+                **community_summary_properties,
             },
             "required": ["nodeProperty"],
         },
@@ -202,6 +211,7 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -244,10 +254,15 @@ community_tool_definitions = [
                     "type": "integer",
                     "description": "Only nodes inside communities larger or equal the given value are returned.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -325,6 +340,7 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -385,6 +401,7 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -404,6 +421,7 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -470,6 +488,7 @@ community_tool_definitions = [
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -506,10 +525,15 @@ community_tool_definitions = [
                     "type": "integer",
                     "description": "Only nodes inside communities larger or equal the given value are returned.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible; the algorithm then runs single-threaded. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "The name of a node property to use as node identifier in the result. If provided, the result will include a 'nodeName' column with values from this property.",
                 },
+                **community_summary_properties,
             },
         },
     ),
@@ -0,0 +1,149 @@
+import logging
+import math
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from .node_translator import translate_ids_to_identifiers
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Tool arguments that configure the summary rather than the algorithm
+SUMMARY_ARGUMENTS = ["outputFormat", "summaryTopN", "summarySampleSize"]
+
+
+def wants_summary(kwargs):
+    output_format = kwargs.get("outputFormat") or "nodes"
+    if output_format not in ("nodes", "summary"):
+        raise ValueError(
+            f"Unknown outputFormat '{output_format}'. Expected 'nodes' or 'summary'."
+        )
+    return output_format == "summary"
+
+
+def stream_with_modularity(gds, G, endpoint, params, community_column="communityId"):
+    """
+    Run a community detection algorithm in mutate mode and compute the modularity of
+    its communities on the projection.
+
+    Returns the community of every node (nodeId and `community_column`) and the
+    modularity of every community (communityId, modularity). The temporary node property is removed
+    from the projection again.
+    """
+    community_property = f"community_{uuid.uuid4().hex}"
+    params = {
+        k: v
+        for k, v in params.items()
+        if v is not None and k != "includeIntermediateCommunities"
+    }
+    endpoint.mutate(G, mutateProperty=community_property, **params)
+    try:
+        communities = gds.graph.nodeProperty.stream(G, community_property).rename(
+            columns={"propertyValue": community_column}
+        )
+        modularity_params = {}
+        if params.get("relationshipWeightProperty") is not None:
+            modularity_params["relationshipWeightProperty"] = params[
+                "relationshipWeightProperty"
+            ]
+        modularity = gds.modularity.stream(
+            G, communityProperty=community_property, **modularity_params
+        )
+    finally:
+        gds.graph.nodeProperties.drop(G, [community_property])
+    return communities[["nodeId", community_column]], modularity
+
+
+def summarize_communities(
+    gds,
+    result,
+    community_column,
+    node_identifier_property=None,
+    modularity=None,
+    top_n=None,
+    sample_size=None,
+):
+    """
+    Aggregate the community of every node into a summary whose size does not depend
+    on the size of the graph.
+
+    The summary has the number of nodes and communities, percentiles and a
+    power-of-two histogram of the community sizes, and the `top_n` largest communities
+    with up to `sample_size` member nodes each. Only the sample members are translated
+    to names. If the per-community `modularity` is given, the total and per-community
+    modularity are included as well.
+    """
+    top_n = 10 if top_n is None else top_n
+    sample_size = 5 if sample_size is None else sample_size
+
+    communities = result[community_column].to_numpy()
+    community_ids, sizes = np.unique(communities, return_counts=True)
+    summary = {
+        "nodeCount": int(len(communities)),
+        "communityCount": int(len(community_ids)),
+    }
+    if len(community_ids) == 0:
+        return summary
+
+    summary["communitySizes"] = {
+        "min": int(sizes.min()),
+        "mean": float(sizes.mean()),
+        "p50": float(np.percentile(sizes, 50)),
+        "p90": float(np.percentile(sizes, 90)),
+        "p99": float(np.percentile(sizes, 99)),
+        "max": int(sizes.max()),
+    }
+    buckets = np.bincount(np.floor(np.log2(sizes)).astype(np.int64))
+    summary["sizeHistogram"] = {
+        _bucket_label(bucket): int(count)
+        for bucket, count in enumerate(buckets)
+        if count
+    }
+
+    if modularity is not None:
+        summary["modularity"] = float(modularity["modularity"].sum())
+        community_modularity = dict(
+            zip(modularity["communityId"], modularity["modularity"])
+        )
+    if "silhouette" in result.columns:
+        # The silhouette is only computed with computeSilhouette, and NaN is not valid JSON
+        silhouette = pd.to_numeric(result["silhouette"], errors="coerce").mean()
+        if math.isfinite(silhouette):
+            summary["averageSilhouette"] = float(silhouette)
+
+    # Largest first, ties by community id
+    largest = np.lexsort((community_ids, -sizes))[:top_n]
+    members = result.loc[
+        result[community_column].isin(community_ids[largest]),
+        ["nodeId", community_column],
+    ]
+    samples = (
+        members.sort_values([community_column, "nodeId"], kind="stable")
+        .groupby(community_column, sort=False)
+        .head(sample_size)
+        .reset_index(drop=True)
+    )
+    translate_ids_to_identifiers(gds, node_identifier_property, samples)
+
+    largest_communities = []
+    for community_id, size in zip(community_ids[largest], sizes[largest]):
+        community = {"communityId": community_id.item(), "size": int(size)}
+        if modularity is not None:
+            community["modularity"] = float(community_modularity.get(community_id, 0.0))
+        sample = samples[samples[community_column] == community_id]
+        community["sampleNodeIds"] = [int(node_id) for node_id in sample["nodeId"]]
+        if "nodeName" in sample.columns:
+            community["sampleNodeNames"] = list(sample["nodeName"])
+        largest_communities.append(community)
+    summary["largestCommunities"] = largest_communities
+
+    logger.info(
+        f"Summarized {summary['nodeCount']} nodes in {summary['communityCount']} communities"
+    )
+    return summary
+
+
+def _bucket_label(bucket):
+    low, high = 2**bucket, 2 ** (bucket + 1) - 1
+    return str(low) if low == high else f"{low}-{high}"
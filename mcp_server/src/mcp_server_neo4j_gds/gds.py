@@ -1,10 +1,19 @@
 from graphdatascience import GraphDataScience
 import uuid
+from collections import namedtuple
 from contextlib import contextmanager
+from itertools import chain
 import logging
 import os
 import platform
 
+import numpy as np
+import pandas as pd
+
+from .memory_estimation import admission, cypher_projection_admission
+from .metrics import span, timed
+from .projection_cache import ProjectionCache
+
 
 def get_log_file_path():
     """Get the appropriate log file path based on the environment."""
@@ -45,115 +54,653 @@ logging.basicConfig(
 logger = logging.getLogger("mcp_server_neo4j_gds")
 
 
+_projection_cache = None
+_projection_mode = "auto"
+
+PROJECTION_MODES = ["auto", "cypher"]
+
+GraphFingerprint = namedtuple(
+    "GraphFingerprint",
+    [
+        "labels",
+        "relationship_types",
+        "property_keys",
+        "node_count",
+        "relationship_count",
+        "last_committed_txn",
+    ],
+)
+
+# Restricts a projection to a subgraph. None means no restriction.
+ProjectionFilter = namedtuple(
+    "ProjectionFilter",
+    [
+        "node_labels",
+        "relationship_types",
+        "node_properties",
+        "relationship_properties",
+    ],
+    defaults=(None, None, None, None),
+)
+
+PROJECTION_FILTER_ARGUMENTS = {
+    "nodeLabels": "node_labels",
+    "relationshipTypes": "relationship_types",
+    "nodeProperties": "node_properties",
+    "relationshipProperties": "relationship_properties",
+}
+
+# Tool arguments naming properties the algorithm reads, which must be projected
+_NODE_PROPERTY_ARGUMENTS = [
+    "nodeProperty",
+    "nodeProperties",
+    "seedProperty",
+    "nodeWeightProperty",
+    "communityProperty",
+    "latitudeProperty",
+    "longitudeProperty",
+    "prizeProperty",
+]
+_RELATIONSHIP_PROPERTY_ARGUMENTS = ["relationshipWeightProperty"]
+
+
+def projection_filter_from_arguments(arguments):
+    """
+    Read the projection filter from tool arguments.
+
+    `nodeLabels` and `relationshipTypes` restrict the projected subgraph,
+    `nodeProperties` and `relationshipProperties` the projected properties. Properties
+    the algorithm is configured to read (e.g. relationshipWeightProperty) are always
+    projected. Returns None if no filter is given.
+    """
+
+    def names(value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return (value,)
+        # knn takes nodeProperties as a map of property to similarity metric
+        return tuple(sorted(dict.fromkeys(value)))
+
+    projection_filter = ProjectionFilter(
+        **{
+            field: names(arguments.get(argument))
+            for argument, field in PROJECTION_FILTER_ARGUMENTS.items()
+        }
+    )
+    if projection_filter == ProjectionFilter():
+        return None
+
+    def with_required(allowed, required_arguments):
+        if allowed is None:
+            return None
+        required = set()
+        for argument in required_arguments:
+            required.update(names(arguments.get(argument)) or ())
+        return tuple(sorted(set(allowed) | required))
+
+    return projection_filter._replace(
+        node_properties=with_required(
+            projection_filter.node_properties, _NODE_PROPERTY_ARGUMENTS
+        ),
+        relationship_properties=with_required(
+            projection_filter.relationship_properties,
+            _RELATIONSHIP_PROPERTY_ARGUMENTS,
+        ),
+    )
+
+
+def configure_projection_cache(max_entries, idle_ttl, memory_budget_bytes=None):
+    """
+    Configure reuse of projected graphs across tool calls.
+
+    Args:
+        max_entries: Maximum number of projections kept alive. 0 disables caching.
+        idle_ttl: Seconds after which an unused projection is dropped.
+        memory_budget_bytes: Upper bound on the total size of cached projections.
+    """
+    global _projection_cache
+    if _projection_cache is not None:
+        _projection_cache.clear()
+    if max_entries > 0:
+        _projection_cache = ProjectionCache(
+            max_entries=max_entries,
+            idle_ttl=idle_ttl,
+            memory_budget_bytes=memory_budget_bytes,
+        )
+    else:
+        _projection_cache = None
+
+
+def configure_projection_mode(mode):
+    """
+    Choose how graphs are projected.
+
+    Args:
+        mode: "auto" uses a native projection (gds.graph.project over the discovered labels
+            and relationship types) whenever the graph allows it and a Cypher projection otherwise,
+            "cypher" always uses a Cypher aggregation projection over MATCH (n)-[r]->(m).
+    """
+    global _projection_mode
+    if mode not in PROJECTION_MODES:
+        raise ValueError(
+            f"Unknown projection mode '{mode}'. Expected one of {PROJECTION_MODES}."
+        )
+    _projection_mode = mode
+
+
+def clear_projection_cache():
+    """Drop all cached projections from the GDS graph catalog."""
+    if _projection_cache is not None:
+        _projection_cache.clear()
+
+
+@timed("schema_discovery")
+def get_graph_fingerprint(gds: GraphDataScience):
+    """
+    Cheap summary of the database contents, used to detect when cached projections are stale.
+    Counts are served from the count store, so this does not scan the graph. Writes that
+    only change property values leave the counts as they are, so the id of the last
+    committed transaction is part of the fingerprint too.
+    """
+    df = gds.run_cypher(
+        """
+        CALL db.labels() YIELD label
+        WITH collect(label) AS labels
+        CALL db.relationshipTypes() YIELD relationshipType
+        WITH labels, collect(relationshipType) AS relationshipTypes
+        CALL db.propertyKeys() YIELD propertyKey
+        WITH labels, relationshipTypes, collect(propertyKey) AS propertyKeys
+        RETURN labels,
+               relationshipTypes,
+               propertyKeys,
+               COUNT { MATCH (n) } AS nodeCount,
+               COUNT { MATCH ()-[r]->() } AS relationshipCount
+        """
+    )
+    row = df.iloc[0]
+    return GraphFingerprint(
+        labels=tuple(sorted(row["labels"])),
+        relationship_types=tuple(sorted(row["relationshipTypes"])),
+        property_keys=tuple(sorted(row["propertyKeys"])),
+        node_count=int(row["nodeCount"]),
+        relationship_count=int(row["relationshipCount"]),
+        last_committed_txn=last_committed_transaction(gds),
+    )
+
+
+def last_committed_transaction(gds):
+    """
+    Id of the last transaction committed to the database of `gds`, or None where the
+    server does not report it.
+    """
+    try:
+        df = gds.run_cypher(
+            """
+            SHOW DATABASES YIELD name, lastCommittedTxn
+            WHERE name = $database
+            RETURN lastCommittedTxn
+            """,
+            params={"database": gds.database()},
+            database="system",
+        )
+    except Exception as e:
+        logger.debug(f"Could not read the last committed transaction: {e}")
+        return None
+    if df.empty:
+        return None
+    return int(df["lastCommittedTxn"].iloc[0])
+
+
 @contextmanager
-def projected_graph(gds, undirected=False):
+def projected_graph(gds, undirected=False, cached=True, projection_filter=None):
     """
     Project a graph from the database.
 
+    If a projection cache is configured, an identical projection made by an earlier
+    call is reused and left in the graph catalog afterwards.
+
     Args:
         gds: GraphDataScience instance
         undirected: If True, project as undirected graph. Default is False (directed).
+        cached: If False, always make a new projection and drop it afterwards.
+            Use this when the graph is modified, e.g. by mutating algorithms.
+        projection_filter: Optional ProjectionFilter. Only nodes with one of its labels,
+            relationships of its types and its properties are projected.
     """
-    graph_name = f"temp_graph_{uuid.uuid4().hex[:8]}"
-    try:
-        # Get relationship properties (non-string)
-        rel_properties = get_relationship_properties_keys(gds)
-        valid_rel_properties = {}
-        for i in range(len(rel_properties)):
-            pi = gds.run_cypher(
-                f"MATCH (n)-[r]->(m) RETURN distinct r.{rel_properties[i]} IS :: STRING AS ISSTRING"
-            )
-            if pi.shape[0] == 1 and bool(pi["ISSTRING"][0]) is False:
-                valid_rel_properties[rel_properties[i]] = f"r.{rel_properties[i]}"
-        rel_prop_map = ", ".join(f"{prop}: r.{prop}" for prop in valid_rel_properties)
-
-        # Get node properties and validate to see which are compatible with GDS
-        node_properties = get_node_properties_keys(gds)
-        valid_node_projection_properties = validate_properties(gds, node_properties)
-        node_prop_map_source = create_projection_properties(
-            valid_node_projection_properties, "n"
+    fingerprint = get_graph_fingerprint(gds)
+    projectable_properties = discover_projectable_properties(gds, fingerprint)
+    labels, relationship_types = fingerprint.labels, fingerprint.relationship_types
+    if projection_filter is not None:
+        projectable_properties, labels, relationship_types = _apply_projection_filter(
+            projectable_properties, fingerprint, projection_filter
         )
-        node_prop_map_target = create_projection_properties(
-            valid_node_projection_properties, "m"
+    native = _use_native_projection(projectable_properties, labels, relationship_types)
+
+    if native:
+
+        def project():
+            with span("projection"):
+                return _native_projection(
+                    gds, projectable_properties, labels, relationship_types, undirected
+                )
+
+    else:
+        projection_query = _cypher_projection_query(
+            projectable_properties,
+            undirected,
+            labels if projection_filter and projection_filter.node_labels else None,
+            relationship_types
+            if projection_filter and projection_filter.relationship_types
+            else None,
         )
 
-        logger.info(f"Node property map source: '{node_prop_map_source}'")
-        logger.info(f"Node property map target: '{node_prop_map_target}'")
-
-        # Configure graph projection based on undirected parameter
-        # Create data configuration (node/relationship structure)
-        data_config_parts = [
-            "sourceNodeLabels: labels(n)",
-            "targetNodeLabels: labels(m)",
-            "relationshipType: type(r)",
-        ]
-
-        if node_prop_map_source or node_prop_map_target:
-            data_config_parts.extend(
-                [
-                    f"sourceNodeProperties: {{{node_prop_map_source}}}",
-                    f"targetNodeProperties: {{{node_prop_map_target}}}",
-                ]
+        def project():
+            graph_name = f"temp_graph_{uuid.uuid4().hex[:8]}"
+            logger.info(f"Projection query: '{projection_query}'")
+            # The counts of the whole database bound the projected graph
+            with (
+                cypher_projection_admission(
+                    gds.graph.cypher.project,
+                    fingerprint.node_count,
+                    fingerprint.relationship_count * (2 if undirected else 1),
+                    projectable_properties["node"],
+                    projectable_properties["relationship"],
+                ) as cypher_project,
+                span("projection"),
+            ):
+                G, _ = cypher_project(
+                    projection_query,
+                    graph_name=graph_name,
+                )
+            return G
+
+    if _projection_cache is None or not cached:
+        G = project()
+        try:
+            yield G
+        finally:
+            with span("projection"):
+                gds.graph.drop(G)
+        return
+
+    cache_key = (
+        gds.database(),
+        undirected,
+        native,
+        tuple(sorted(projectable_properties["node"].items())),
+        tuple(sorted(projectable_properties["relationship"].items())),
+        labels,
+        relationship_types,
+        fingerprint,
+    )
+    with _projection_cache.graph(gds, cache_key, project) as G:
+        yield G
+
+
+def _apply_projection_filter(projectable_properties, fingerprint, projection_filter):
+    """
+    Restrict the projectable properties, labels and relationship types to a filter.
+
+    Raises a ValueError naming the alternatives if the filter asks for a label,
+    relationship type or property that does not exist or cannot be projected.
+    """
+
+    def select(requested, available, kind):
+        if requested is None:
+            return tuple(available)
+        unknown = [name for name in requested if name not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown {kind} {unknown}. Available {kind}: {sorted(available)}."
             )
+        return tuple(name for name in available if name in requested)
 
-        if rel_prop_map:
-            data_config_parts.append(f"relationshipProperties: {{{rel_prop_map}}}")
+    labels = select(projection_filter.node_labels, fingerprint.labels, "node labels")
+    relationship_types = select(
+        projection_filter.relationship_types,
+        fingerprint.relationship_types,
+        "relationship types",
+    )
+    node_properties = select(
+        projection_filter.node_properties,
+        projectable_properties["node"],
+        "projectable node properties",
+    )
+    relationship_properties = select(
+        projection_filter.relationship_properties,
+        projectable_properties["relationship"],
+        "projectable relationship properties",
+    )
 
-        data_config = ", ".join(data_config_parts)
+    converted = [
+        prop
+        for prop in projectable_properties["converted_node_properties"]
+        if prop in node_properties
+    ]
+    filtered = {
+        "node": {
+            prop: projectable_properties["node"][prop] for prop in node_properties
+        },
+        "relationship": {
+            prop: projectable_properties["relationship"][prop]
+            for prop in relationship_properties
+        },
+        "requires_conversion": bool(converted),
+        "converted_node_properties": converted,
+        # Unlabeled nodes are not projected when filtering on labels
+        "has_unlabeled_nodes": projectable_properties["has_unlabeled_nodes"]
+        and projection_filter.node_labels is None,
+    }
+    logger.info(
+        f"Projection filtered to labels {labels}, relationship types "
+        f"{relationship_types} and properties {filtered}"
+    )
+    return filtered, labels, relationship_types
+
+
+def _use_native_projection(projectable_properties, labels, relationship_types):
+    if _projection_mode == "cypher":
+        return False
+    # A native projection loads properties as stored and only covers labelled nodes,
+    # so it is equivalent to the Cypher projection only if no value needs converting
+    # (e.g. integers stored in a FLOAT property) and every node has a label.
+    native_compatible = (
+        not projectable_properties["requires_conversion"]
+        and not projectable_properties["has_unlabeled_nodes"]
+        and len(labels) > 0
+        and len(relationship_types) > 0
+    )
+    if not native_compatible:
+        logger.info(
+            "Graph cannot be projected natively, falling back to a Cypher projection"
+        )
+    return native_compatible
 
-        # Create additional configuration
-        additional_config_parts = []
-        if undirected:
-            additional_config_parts.append("undirectedRelationshipTypes: ['*']")
 
-        additional_config = (
-            ", ".join(additional_config_parts) if additional_config_parts else ""
+def _native_projection(
+    gds, projectable_properties, labels, relationship_types, undirected
+):
+    graph_name = f"temp_graph_{uuid.uuid4().hex[:8]}"
+    orientation = "UNDIRECTED" if undirected else "NATURAL"
+    node_properties = list(projectable_properties["node"])
+    relationship_properties = list(projectable_properties["relationship"])
+    node_spec = {label: {"properties": node_properties} for label in labels}
+    relationship_spec = {
+        relationship_type: {
+            "orientation": orientation,
+            "properties": relationship_properties,
+        }
+        for relationship_type in relationship_types
+    }
+    logger.info(
+        f"Native projection of nodes {node_spec} and relationships {relationship_spec}"
+    )
+    G, _ = gds.graph.project(graph_name, node_spec, relationship_spec)
+    return G
+
+
+def _cypher_projection_query(
+    projectable_properties, undirected, labels=None, relationship_types=None
+):
+    # Label and type predicates in the pattern let Neo4j scan only the matching subgraph
+    node_pattern = ":" + "|".join(map(_quote, labels)) if labels else ""
+    relationship_pattern = (
+        ":" + "|".join(map(_quote, relationship_types)) if relationship_types else ""
+    )
+    match = f"MATCH (n{node_pattern})-[r{relationship_pattern}]->(m{node_pattern})"
+
+    valid_rel_properties = projectable_properties["relationship"]
+    rel_prop_map = ", ".join(f"{prop}: r.{prop}" for prop in valid_rel_properties)
+
+    valid_node_projection_properties = projectable_properties["node"]
+    node_prop_map_source = create_projection_properties(
+        valid_node_projection_properties, "n"
+    )
+    node_prop_map_target = create_projection_properties(
+        valid_node_projection_properties, "m"
+    )
+
+    logger.info(f"Node property map source: '{node_prop_map_source}'")
+    logger.info(f"Node property map target: '{node_prop_map_target}'")
+
+    # Configure graph projection based on undirected parameter
+    # Create data configuration (node/relationship structure)
+    data_config_parts = [
+        "sourceNodeLabels: labels(n)",
+        "targetNodeLabels: labels(m)",
+        "relationshipType: type(r)",
+    ]
+
+    if node_prop_map_source or node_prop_map_target:
+        data_config_parts.extend(
+            [
+                f"sourceNodeProperties: {{{node_prop_map_source}}}",
+                f"targetNodeProperties: {{{node_prop_map_target}}}",
+            ]
         )
 
-        # Use separate data and additional configuration parameters
-        if additional_config:
-            project_query = f"""
-                       MATCH (n)-[r]->(m)
-                       WITH n, r, m
-                       RETURN gds.graph.project(
-                           $graph_name,
-                           n,
-                           m,
-                           {{{data_config}}},
-                           {{{additional_config}}}
-                       )
-                       """
-            logger.info(f"Project query: '{project_query}'")
-            G, _ = gds.graph.cypher.project(
-                project_query,
-                graph_name=graph_name,
-            )
-        else:
-            projection_query = f"""
-                       MATCH (n)-[r]->(m)
-                       WITH n, r, m
-                       RETURN gds.graph.project(
-                           $graph_name,
-                           n,
-                           m,
-                           {{{data_config}}}
-                       )
-                       """
-            logger.info(f"Projection query: '{projection_query}'")
-            G, _ = gds.graph.cypher.project(
-                projection_query,
-                graph_name=graph_name,
-            )
-        yield G
-    finally:
-        gds.graph.drop(graph_name)
+    if rel_prop_map:
+        data_config_parts.append(f"relationshipProperties: {{{rel_prop_map}}}")
+
+    data_config = ", ".join(data_config_parts)
 
+    # Create additional configuration
+    additional_config_parts = []
+    if undirected:
+        additional_config_parts.append("undirectedRelationshipTypes: ['*']")
 
+    additional_config = (
+        ", ".join(additional_config_parts) if additional_config_parts else ""
+    )
+
+    # Use separate data and additional configuration parameters
+    if additional_config:
+        return f"""
+                   {match}
+                   WITH n, r, m
+                   RETURN gds.graph.project(
+                       $graph_name,
+                       n,
+                       m,
+                       {{{data_config}}},
+                       {{{additional_config}}}
+                   )
+                   """
+    return f"""
+                   {match}
+                   WITH n, r, m
+                   RETURN gds.graph.project(
+                       $graph_name,
+                       n,
+                       m,
+                       {{{data_config}}}
+                   )
+                   """
+
+
+@timed("schema_discovery")
 def count_nodes(gds: GraphDataScience):
-    with projected_graph(gds) as G:
-        return G.node_count()
+    return get_graph_fingerprint(gds).node_count
+
+
+@timed("schema_discovery")
+def count_graph_elements(gds: GraphDataScience):
+    """
+    Count nodes and relationships in total, per label and per relationship type.
+    All counts are read from the count store, so the graph is not scanned.
+    """
+    fingerprint = get_graph_fingerprint(gds)
+    label_counts = ", ".join(
+        f"{_quote(label)}: COUNT {{ MATCH (:{_quote(label)}) }}"
+        for label in fingerprint.labels
+    )
+    type_counts = ", ".join(
+        f"{_quote(rel_type)}: COUNT {{ MATCH ()-[:{_quote(rel_type)}]->() }}"
+        for rel_type in fingerprint.relationship_types
+    )
+    df = gds.run_cypher(
+        f"""
+        RETURN {{{label_counts}}} AS nodeCountsByLabel,
+               {{{type_counts}}} AS relationshipCountsByType
+        """
+    )
+    return {
+        "nodeCount": fingerprint.node_count,
+        "relationshipCount": fingerprint.relationship_count,
+        "nodeCountsByLabel": dict(df["nodeCountsByLabel"].iloc[0]),
+        "relationshipCountsByType": dict(df["relationshipCountsByType"].iloc[0]),
+    }
+
+
+def stream_top_k(
+    gds: GraphDataScience,
+    G,
+    endpoint,
+    config,
+    k,
+    ascending=False,
+    node_ids=None,
+    score="score",
+    score_key=None,
+):
+    """
+    Stream `gds.<endpoint>` on G and return only the k nodes with the highest scores
+    (or lowest, if ascending).
+
+    The procedure is called from Cypher, which sorts and limits the rows in the database,
+    so only k rows are transferred. Ties are broken by node id.
+
+    Args:
+        config: Algorithm configuration
+        node_ids: Only rank these nodes (optional)
+        score: Column yielded by the procedure that holds the score
+        score_key: Key of the score if the column is a map, e.g. 'auth' for HITS
+    """
+    order_by = score if score_key is None else f"{score}[$score_key]"
+    node_filter = "WHERE nodeId IN $node_ids" if node_ids is not None else ""
+    query = f"""
+        CALL gds.{endpoint}.stream($graph_name, $config)
+        YIELD nodeId, {score}
+        {node_filter}
+        RETURN nodeId, {score}
+        ORDER BY {order_by} {"ASC" if ascending else "DESC"}, nodeId
+        LIMIT $k
+        """
+    procedure = gds
+    for name in endpoint.split("."):
+        procedure = getattr(procedure, name)
+    with admission(procedure.stream, G, **config) as config, span("algorithm"):
+        return gds.run_cypher(
+            query,
+            params={
+                "graph_name": G.name(),
+                "config": config,
+                "k": int(k),
+                "node_ids": node_ids,
+                "score_key": score_key,
+            },
+        )
+
+
+def stream_all_pairs_distances(
+    gds: GraphDataScience,
+    G,
+    config,
+    source_ids=None,
+    target_ids=None,
+    max_distance=None,
+):
+    """
+    Stream `gds.allShortestPaths` on G and return the sourceNodeId, targetNodeId and
+    distance of the pairs that pass the filters, ordered by source and target node id.
+
+    The procedure is called from Cypher, which filters the pairs in the database and
+    groups them into a row per source node, so only the requested pairs are transferred,
+    as lists of targets and distances.
+
+    Args:
+        config: Algorithm configuration
+        source_ids: Only return distances from these nodes (optional)
+        target_ids: Only return distances to these nodes (optional)
+        max_distance: Only return pairs at most this far apart (optional)
+    """
+    conditions = []
+    if source_ids is not None:
+        conditions.append("sourceNodeId IN $source_ids")
+    if target_ids is not None:
+        conditions.append("targetNodeId IN $target_ids")
+    if max_distance is not None:
+        conditions.append("distance <= $max_distance")
+    pair_filter = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        CALL gds.allShortestPaths.stream($graph_name, $config)
+        YIELD sourceNodeId, targetNodeId, distance
+        {pair_filter}
+        WITH sourceNodeId, targetNodeId, distance
+        ORDER BY sourceNodeId, targetNodeId
+        RETURN sourceNodeId, collect(targetNodeId) AS targetNodeIds, collect(distance) AS distances
+        ORDER BY sourceNodeId
+        """
+    with (
+        admission(gds.allShortestPaths.stream, G, **config) as config,
+        span("algorithm"),
+    ):
+        rows = gds.run_cypher(
+            query,
+            params={
+                "graph_name": G.name(),
+                "config": config,
+                "source_ids": source_ids,
+                "target_ids": target_ids,
+                "max_distance": max_distance,
+            },
+        )
+    if rows.empty:
+        return pd.DataFrame(
+            {
+                "sourceNodeId": pd.Series(dtype=np.int64),
+                "targetNodeId": pd.Series(dtype=np.int64),
+                "distance": pd.Series(dtype=np.float64),
+            }
+        )
+    counts = rows["targetNodeIds"].map(len).to_numpy()
+    return pd.DataFrame(
+        {
+            "sourceNodeId": np.repeat(
+                rows["sourceNodeId"].to_numpy(dtype=np.int64), counts
+            ),
+            "targetNodeId": np.fromiter(
+                chain.from_iterable(rows["targetNodeIds"]), np.int64, counts.sum()
+            ),
+            "distance": np.fromiter(
+                chain.from_iterable(rows["distances"]), np.float64, counts.sum()
+            ),
+        }
+    )
+
+
+def stream_node_ids(gds: GraphDataScience, G):
+    """Ids of all nodes of G, in ascending order."""
+    with span("algorithm"):
+        node_ids = gds.run_cypher(
+            """
+            CALL gds.degree.stream($graph_name, $config)
+            YIELD nodeId
+            RETURN nodeId
+            ORDER BY nodeId
+            """,
+            params={"graph_name": G.name(), "config": {}},
+        )
+    return node_ids["nodeId"].to_numpy(dtype=np.int64)
+
+
+def _quote(name):
+    escaped = name.replace("`", "``")
+    return f"`{escaped}`"
 
 
+@timed("schema_discovery")
 def get_node_properties_keys(gds: GraphDataScience):
     query = """
         MATCH (n)
@@ -165,6 +712,7 @@ def get_node_properties_keys(gds: GraphDataScience):
     return df["properties_keys"].iloc[0]
 
 
+@timed("schema_discovery")
 def get_relationship_properties_keys(gds: GraphDataScience):
     query = """
         MATCH (n)-[r]->(m)
@@ -176,54 +724,135 @@ def get_relationship_properties_keys(gds: GraphDataScience):
     return df["properties_keys"].iloc[0]
 
 
-def validate_properties(gds: GraphDataScience, node_properties):
-    projectable_properties = {}
-    for i in range(len(node_properties)):
-        # Check property types and whether all values are whole numbers
-        type_check = gds.run_cypher(
-            f"""
-            MATCH (n) 
-            WHERE n.{node_properties[i]} IS NOT NULL
-            WITH n.{node_properties[i]} AS prop
-            RETURN 
-                prop IS :: LIST<FLOAT NOT NULL> AS IS_LIST_FLOAT,
-                prop IS :: LIST<INTEGER NOT NULL> AS IS_LIST_INTEGER,
-                prop IS :: INTEGER AS IS_INTEGER,
-                prop IS :: FLOAT AS IS_FLOAT,
-                CASE 
-                    WHEN prop IS :: FLOAT THEN null
-                    WHEN prop IS :: INTEGER THEN null
-                    WHEN prop IS :: LIST<FLOAT NOT NULL> THEN null
-                    WHEN prop IS :: LIST<INTEGER NOT NULL> THEN null
-                    ELSE 1
-                END AS INVALID_PROP_TYPE
-            LIMIT 10 
-            """
+# Storage types reported by db.schema.*TypeProperties() mapped to GDS projection types
+_SCALAR_TYPES = {
+    "Long": "INTEGER",
+    "Integer": "INTEGER",
+    "Int": "INTEGER",
+    "Short": "INTEGER",
+    "Byte": "INTEGER",
+    "Double": "FLOAT",
+    "Float": "FLOAT",
+}
+_LIST_TYPES = {
+    "LongArray": "INTEGER_LIST",
+    "IntegerArray": "INTEGER_LIST",
+    "IntArray": "INTEGER_LIST",
+    "ShortArray": "INTEGER_LIST",
+    "ByteArray": "INTEGER_LIST",
+    "DoubleArray": "FLOAT_LIST",
+    "FloatArray": "FLOAT_LIST",
+}
+
+_schema_cache = {}
+
+
+def clear_schema_cache():
+    """Forget the discovered property types, so the next discovery queries the database."""
+    _schema_cache.clear()
+
+
+@timed("schema_discovery")
+def discover_projectable_properties(gds: GraphDataScience, fingerprint=None):
+    """
+    Find the GDS projection type of every node and relationship property in one query.
+
+    Properties whose values are all numbers are projected as FLOAT (if any value is a float)
+    or INTEGER, properties whose values are all numeric lists as FLOAT_LIST or INTEGER_LIST.
+    Anything else (strings, mixed scalars and lists, ...) cannot be projected and is left out.
+    Relationship properties must be numeric scalars.
+
+    The result is cached until the graph fingerprint changes.
+
+    Returns:
+        {
+            "node": {property: type},
+            "relationship": {property: type},
+            "requires_conversion": whether a node property mixes storage types,
+            "converted_node_properties": the node properties that mix storage types,
+            "has_unlabeled_nodes": whether some nodes have no label,
+        }
+    """
+    if fingerprint is None:
+        fingerprint = get_graph_fingerprint(gds)
+    cache_key = (gds.database(), fingerprint)
+    cached = _schema_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    df = gds.run_cypher(
+        """
+        CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName, propertyTypes
+        RETURN 'node' AS entity, nodeLabels, propertyName, propertyTypes
+        UNION ALL
+        CALL db.schema.relTypeProperties() YIELD propertyName, propertyTypes
+        RETURN 'relationship' AS entity, [] AS nodeLabels, propertyName, propertyTypes
+        """
+    )
+
+    storage_types = {"node": {}, "relationship": {}}
+    has_unlabeled_nodes = False
+    for entity, node_labels, property_name, property_types in zip(
+        df["entity"], df["nodeLabels"], df["propertyName"], df["propertyTypes"]
+    ):
+        if entity == "node" and len(node_labels) == 0:
+            has_unlabeled_nodes = True
+        if property_name is None:
+            continue
+        storage_types[entity].setdefault(property_name, set()).update(
+            property_types or []
         )
-        if not type_check.empty:
-            has_invalids = len(type_check["INVALID_PROP_TYPE"].dropna()) > 0
-
-            if not has_invalids:  # all properties are ok
-                has_ints = any(type_check["IS_INTEGER"])
-                has_floats = any(type_check["IS_FLOAT"])
-                has_lists_float = any(type_check["IS_LIST_FLOAT"])
-                has_lists_int = any(type_check["IS_LIST_INTEGER"])
-                has_lists = has_lists_float or has_lists_int
-                has_nums = has_ints or has_floats
-                if has_nums and not has_lists:
-                    if has_floats:
-                        projectable_properties[node_properties[i]] = "FLOAT"
-                    else:
-                        projectable_properties[node_properties[i]] = "INTEGER"
-                if has_lists and not has_nums:
-                    if has_lists_float:
-                        projectable_properties[node_properties[i]] = "FLOAT_LIST"
-                    else:
-                        projectable_properties[node_properties[i]] = "INTEGER_LIST"
 
+    projectable_properties = {
+        "node": {},
+        "relationship": {},
+        "requires_conversion": False,
+        "converted_node_properties": [],
+        "has_unlabeled_nodes": has_unlabeled_nodes,
+    }
+    for entity, properties in storage_types.items():
+        for property_name, types in properties.items():
+            projection_type = _projection_type(types)
+            if projection_type is None:
+                continue
+            if entity == "relationship" and projection_type not in ("INTEGER", "FLOAT"):
+                continue
+            projectable_properties[entity][property_name] = projection_type
+            if entity == "node" and len(types) > 1:
+                # Mixed storage types are converted with toFloat()/toFloatList()
+                projectable_properties["requires_conversion"] = True
+                projectable_properties["converted_node_properties"].append(
+                    property_name
+                )
+
+    logger.info(f"Projectable properties: {projectable_properties}")
+    _schema_cache.clear()
+    _schema_cache[cache_key] = projectable_properties
     return projectable_properties
 
 
+def _projection_type(storage_types):
+    if not storage_types:
+        return None
+    if all(t in _SCALAR_TYPES for t in storage_types):
+        types = {_SCALAR_TYPES[t] for t in storage_types}
+        return "FLOAT" if "FLOAT" in types else "INTEGER"
+    if all(t in _LIST_TYPES for t in storage_types):
+        types = {_LIST_TYPES[t] for t in storage_types}
+        return "FLOAT_LIST" if "FLOAT_LIST" in types else "INTEGER_LIST"
+    return None
+
+
+@timed("schema_discovery")
+def validate_properties(gds: GraphDataScience, node_properties):
+    projectable_properties = discover_projectable_properties(gds)["node"]
+    return {
+        prop: projectable_properties[prop]
+        for prop in node_properties
+        if prop in projectable_properties
+    }
+
+
 def create_projection_properties(projectable_properties, variable):
     valid_node_properties = {}
     for prop in projectable_properties:
@@ -0,0 +1,318 @@
+import inspect
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+MEMORY_BUDGET_ACTIONS = ["refuse", "downgrade", "queue"]
+
+# Algorithm modes that are estimated before they run
+_ESTIMATED_MODES = ["stream", "mutate", "stats", "write"]
+
+# GDS endpoint -> (parameter, default value, smallest value) that bound the memory of the
+# algorithm. The downgrade action halves them, in order, until the estimate fits.
+_DOWNGRADES = {
+    "nodeSimilarity": [("topK", 10, 1)],
+    "nodeSimilarity.filtered": [("topK", 10, 1)],
+    "knn": [("topK", 10, 1), ("sampleRate", 0.5, 0.01)],
+    "knn.filtered": [("topK", 10, 1), ("sampleRate", 0.5, 0.01)],
+    "betweenness": [("samplingSize", None, 1)],
+    "randomWalk": [("walksPerNode", 10, 1), ("walkLength", 80, 2)],
+}
+_MAX_DOWNGRADE_STEPS = 16
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a tool call is estimated to need more memory than the budget allows."""
+
+
+class MemoryGuard:
+    """
+    Admission control for tool calls based on GDS memory estimates.
+
+    Before a graph is projected or an algorithm runs, its `.estimate` procedure is called.
+    If the estimated maximum memory exceeds `budget_bytes`, the call is refused, or with
+    the "downgrade" action retried with smaller result sizes or samples where the
+    algorithm has such parameters. With the "queue" action, a call whose estimate fits the
+    budget waits until enough of it is not reserved by other running algorithms.
+    """
+
+    def __init__(self, budget_bytes, action="refuse", queue_timeout=None):
+        if action not in MEMORY_BUDGET_ACTIONS:
+            raise ValueError(
+                f"Unknown memory budget action '{action}'. Expected one of {MEMORY_BUDGET_ACTIONS}."
+            )
+        self.budget_bytes = budget_bytes
+        self.action = action
+        self.queue_timeout = queue_timeout
+        self._reserved_bytes = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size_in_bytes):
+        """Hold `size_in_bytes` of the budget while the block runs."""
+        with self._condition:
+            if self.action == "queue":
+                admitted = self._condition.wait_for(
+                    lambda: self._reserved_bytes + size_in_bytes <= self.budget_bytes,
+                    timeout=self.queue_timeout,
+                )
+                if not admitted:
+                    raise MemoryBudgetExceeded(
+                        f"Timed out waiting for {_format_bytes(size_in_bytes)} of the memory budget, "
+                        f"{_format_bytes(self._reserved_bytes)} is in use by other tool calls."
+                    )
+            self._reserved_bytes += size_in_bytes
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reserved_bytes -= size_in_bytes
+                self._condition.notify_all()
+
+    def admit(self, gds, estimates):
+        """Return a client for one tool call that estimates before it projects or runs."""
+        return EstimatingGDS(gds, self, estimates)
+
+
+class EstimatingGDS:
+    """
+    Wraps a GDS client for the duration of one tool call.
+
+    Algorithm calls (e.g. `gds.pageRank.stream(G, ...)`) and native projections
+    (`gds.graph.project(...)`) are estimated and admitted by the guard before they run,
+    and every estimate is appended to `estimates` to be reported with the tool result.
+    Cypher aggregation projections (`gds.graph.cypher.project(...)`) have no estimate of
+    their own, see `cypher_projection_admission`; without it they are recorded as not
+    estimated. Everything else is passed through to the wrapped client.
+    """
+
+    def __init__(self, gds, guard, estimates, path="", root=None):
+        self._gds = gds
+        self._guard = guard
+        self._estimates = estimates
+        self._path = path
+        self._root = gds if root is None else root
+
+    def __getattr__(self, name):
+        target = getattr(self._gds, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if path == "graph.cypher.project":
+            return _EstimatedCall(
+                target,
+                path,
+                self._guard,
+                self._estimates,
+                estimator=self._root.graph.project.estimate,
+            )
+        if path == "graph.project" or (
+            name in _ESTIMATED_MODES and not path.startswith("graph.")
+        ):
+            return _EstimatedCall(target, path, self._guard, self._estimates)
+        if inspect.isroutine(target):
+            return target
+        return EstimatingGDS(target, self._guard, self._estimates, path, self._root)
+
+    def __call__(self, *args, **kwargs):
+        return self._gds(*args, **kwargs)
+
+
+class _EstimatedCall:
+    def __init__(self, target, path, guard, estimates, estimator=None):
+        self._target = target
+        self._path = path
+        self._guard = guard
+        self._estimates = estimates
+        self._estimator = estimator
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __call__(self, *args, **kwargs):
+        if self._path == "graph.project":
+            return self._project(*args, **kwargs)
+        if self._path == "graph.cypher.project":
+            self._record(None)
+            return self._target(*args, **kwargs)
+
+        G, *rest = args
+        with self.admitted(G, *rest, **kwargs) as kwargs:
+            return self._target(G, *rest, **kwargs)
+
+    @contextmanager
+    def admitted(self, G, *args, **kwargs):
+        """
+        Estimate and admit a run of the procedure, holding its share of the budget
+        while the block runs. Yields the keyword arguments to run it with.
+        """
+        endpoint = self._path.rsplit(".", 1)[0]
+        estimate = self._estimate(G, *args, **kwargs)
+        if estimate is None:
+            self._record(None)
+            yield kwargs
+            return
+
+        if estimate["bytesMax"] > self._guard.budget_bytes:
+            if self._guard.action != "downgrade":
+                raise self._exceeded(estimate)
+            kwargs, estimate = self._downgrade(endpoint, G, args, kwargs, estimate)
+        self._record(estimate)
+
+        with self._guard.reserve(estimate["bytesMax"]):
+            yield kwargs
+
+    def _project(self, graph_name, node_spec, relationship_spec, **config):
+        estimate = self._estimate(node_spec, relationship_spec, **config)
+        if estimate is not None and estimate["bytesMax"] > self._guard.budget_bytes:
+            raise self._exceeded(estimate)
+        self._record(estimate)
+        return self._target(graph_name, node_spec, relationship_spec, **config)
+
+    @contextmanager
+    def admitted_projection(self, node_count, relationship_count, **properties):
+        """
+        Estimate and admit a Cypher aggregation projection as a native projection of
+        a graph with the given size and properties. Yields the projection procedure.
+        """
+        estimate = self._estimate(
+            "*",
+            "*",
+            nodeCount=node_count,
+            relationshipCount=relationship_count,
+            **properties,
+        )
+        if estimate is not None and estimate["bytesMax"] > self._guard.budget_bytes:
+            raise self._exceeded(estimate)
+        self._record(estimate)
+        yield self._target
+
+    def _estimate(self, *args, **kwargs):
+        estimator = (
+            self._estimator if self._estimator is not None else self._target.estimate
+        )
+        try:
+            result = estimator(*args, **kwargs)
+        except Exception as e:
+            # Not every procedure has an estimate mode
+            logger.info(f"No memory estimate for gds.{self._path}: {e}")
+            return None
+        estimate = {
+            "procedure": f"gds.{self._path}",
+            "requiredMemory": str(result["requiredMemory"]),
+            "bytesMin": int(result["bytesMin"]),
+            "bytesMax": int(result["bytesMax"]),
+            "nodeCount": int(result["nodeCount"]),
+            "relationshipCount": int(result["relationshipCount"]),
+            "budgetBytes": self._guard.budget_bytes,
+        }
+        logger.info(f"Memory estimate: {estimate}")
+        return estimate
+
+    def _record(self, estimate):
+        """Keep the estimate the call was admitted with, to report it with the result."""
+        self._estimates.append(
+            estimate
+            if estimate is not None
+            else {"procedure": f"gds.{self._path}", "requiredMemory": None}
+        )
+
+    def _downgrade(self, endpoint, G, rest, kwargs, estimate):
+        """Shrink the memory bounding parameters of the algorithm until the estimate fits."""
+        rules = _DOWNGRADES.get(endpoint, [])
+        downgraded = dict(kwargs)
+        for parameter, default, minimum in rules * _MAX_DOWNGRADE_STEPS:
+            current = downgraded.get(parameter)
+            if current is None:
+                current = default if default is not None else estimate["nodeCount"]
+            smaller = max(type(minimum)(current / 2), minimum)
+            if smaller == current:
+                continue
+            downgraded[parameter] = smaller
+            estimate = self._estimate(G, *rest, **downgraded)
+            if estimate is None:
+                break
+            if estimate["bytesMax"] <= self._guard.budget_bytes:
+                estimate["downgradedParameters"] = {
+                    key: value
+                    for key, value in downgraded.items()
+                    if kwargs.get(key) != value
+                }
+                logger.info(
+                    f"Downgraded gds.{self._path} to {estimate['downgradedParameters']}"
+                )
+                return downgraded, estimate
+        raise self._exceeded(estimate)
+
+    def _exceeded(self, estimate):
+        if estimate is None:
+            return MemoryBudgetExceeded(
+                f"gds.{self._path} could not be estimated after downgrading."
+            )
+        return MemoryBudgetExceeded(
+            f"gds.{self._path} is estimated to need up to {_format_bytes(estimate['bytesMax'])} "
+            f"({estimate['requiredMemory']}), more than the memory budget of "
+            f"{_format_bytes(self._guard.budget_bytes)}. Reduce the size of the problem, "
+            "e.g. with a smaller topK or by filtering nodes, and try again."
+        )
+
+
+def admission(procedure, G, **config):
+    """
+    Admit a run of `procedure` (e.g. `gds.pageRank.stream`) that is executed by other
+    means, such as a Cypher `CALL`. Yields the configuration to run it with, which the
+    "downgrade" action may have changed.
+    """
+    if isinstance(procedure, _EstimatedCall):
+        return procedure.admitted(G, **config)
+    return nullcontext(config)
+
+
+def cypher_projection_admission(
+    procedure, node_count, relationship_count, node_properties, relationship_properties
+):
+    """
+    Admit a Cypher aggregation projection by `procedure` (`gds.graph.cypher.project`),
+    which GDS cannot estimate. It is estimated as a native projection of a graph with
+    `node_count` nodes, `relationship_count` relationships and the given properties,
+    e.g. the count store figures of the database, which bound the projected graph.
+    Yields the procedure to project with.
+    """
+    if isinstance(procedure, _EstimatedCall):
+        return procedure.admitted_projection(
+            node_count,
+            relationship_count,
+            nodeProperties=list(node_properties),
+            relationshipProperties=list(relationship_properties),
+        )
+    return nullcontext(procedure)
+
+
+_memory_guard = None
+
+
+def configure_memory_guard(budget_bytes=None, action="refuse", queue_timeout=None):
+    """
+    Enable admission control of tool calls with a memory budget in bytes.
+
+    None disables it, so nothing is estimated before it runs.
+    """
+    global _memory_guard
+    _memory_guard = (
+        MemoryGuard(budget_bytes, action, queue_timeout)
+        if budget_bytes is not None
+        else None
+    )
+
+
+def get_memory_guard():
+    return _memory_guard
+
+
+def _format_bytes(size_in_bytes):
+    size = float(size_in_bytes)
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
@@ -0,0 +1,255 @@
+import contextvars
+import inspect
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+# Phases of a tool call, in the order they usually happen
+PHASES = [
+    "result_cache",
+    "schema_discovery",
+    "projection",
+    "memory_estimation",
+    "algorithm",
+    "id_translation",
+    "serialization",
+    "handler",
+]
+
+_ALGORITHM_MODES = ["stream", "mutate", "stats", "write"]
+
+_current_timings = contextvars.ContextVar("gds_agent_timings", default=None)
+_include_timings = False
+
+
+class CallTimings:
+    """
+    Time spent in each phase of one tool call.
+
+    Spans nest, and the time of a span excludes the spans inside it, so the phases do not
+    overlap and add up to at most the duration of the call.
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self._start = time.perf_counter()
+        self._open_spans = []
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def to_dict(self):
+        """Milliseconds per phase and in total, for the response of the tool call."""
+        return {
+            "phasesMs": {
+                phase: round(self.seconds[phase] * 1000, 3)
+                for phase in PHASES + sorted(set(self.seconds) - set(PHASES))
+                if phase in self.seconds
+            },
+            "totalMs": round(self.elapsed() * 1000, 3),
+        }
+
+
+@contextmanager
+def span(phase):
+    """Attribute the time spent in the block to `phase` of the current tool call."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    timings._open_spans.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = timings._open_spans.pop()
+        timings.seconds[phase] += elapsed - nested
+        if timings._open_spans:
+            timings._open_spans[-1] += elapsed
+
+
+def timed(phase):
+    """Decorator attributing the time spent in a function to `phase`."""
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TimedGDS:
+    """
+    Wraps a GDS client so that algorithm runs (`gds.<algorithm>.stream(G, ...)` and the
+    other modes) are attributed to the algorithm phase and their memory estimates to
+    the memory_estimation phase.
+    """
+
+    def __init__(self, gds, path=""):
+        self._gds = gds
+        self._path = path
+
+    def __getattr__(self, name):
+        target = getattr(self._gds, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if name in _ALGORITHM_MODES and self._path and not path.startswith("graph."):
+            return _TimedCall(target)
+        if inspect.isroutine(target):
+            return target
+        return TimedGDS(target, path)
+
+    def __call__(self, *args, **kwargs):
+        return self._gds(*args, **kwargs)
+
+
+class _TimedCall:
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __call__(self, *args, **kwargs):
+        with span("algorithm"):
+            return self._target(*args, **kwargs)
+
+    def estimate(self, *args, **kwargs):
+        with span("memory_estimation"):
+            return self._target.estimate(*args, **kwargs)
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in logarithmic buckets, each 19% wider than the previous one.
+    Percentiles are reported as the upper bound of their bucket, at most the maximum.
+    """
+
+    _BASE = 2**0.25
+    _SMALLEST = 1e-6
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets = defaultdict(int)
+
+    def record(self, seconds):
+        bucket = max(
+            0,
+            math.ceil(
+                math.log(max(seconds, self._SMALLEST) / self._SMALLEST, self._BASE)
+            ),
+        )
+        self._buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        if self.count == 0:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self._SMALLEST * self._BASE**bucket, self.max)
+        return self.max
+
+    def summary(self):
+        def ms(seconds):
+            return round(seconds * 1000, 3)
+
+        return {
+            "count": self.count,
+            "meanMs": ms(self.total / self.count),
+            "p50Ms": ms(self.percentile(50)),
+            "p95Ms": ms(self.percentile(95)),
+            "p99Ms": ms(self.percentile(99)),
+            "maxMs": ms(self.max),
+        }
+
+
+class MetricsRegistry:
+    """Per-tool histograms of the duration of every phase of the tool calls since startup."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._histograms = defaultdict(lambda: defaultdict(LatencyHistogram))
+        self._calls = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def tool_call(self, name):
+        """Time the phases of a call of tool `name` while the block runs, and record them."""
+        timings = CallTimings()
+        token = _current_timings.set(timings)
+        failed = False
+        try:
+            yield timings
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _current_timings.reset(token)
+            self.record(name, timings, failed)
+
+    def record(self, name, timings, failed=False):
+        with self._lock:
+            self._calls[name] += 1
+            if failed:
+                self._errors[name] += 1
+            histograms = self._histograms[name]
+            for phase, seconds in timings.seconds.items():
+                histograms[phase].record(seconds)
+            histograms["total"].record(timings.elapsed())
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "uptimeSeconds": round(time.time() - self.started, 3),
+                "tools": {
+                    name: {
+                        "calls": self._calls[name],
+                        "errors": self._errors[name],
+                        "phases": {
+                            phase: histogram.summary()
+                            for phase, histogram in sorted(
+                                histograms.items(),
+                                key=lambda item: _phase_order(item[0]),
+                            )
+                        },
+                    }
+                    for name, histograms in sorted(self._histograms.items())
+                },
+            }
+
+
+def _phase_order(phase):
+    return PHASES.index(phase) if phase in PHASES else len(PHASES)
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry():
+    return _metrics_registry
+
+
+def configure_timings(include_in_response=False):
+    """Choose whether every tool response ends with the timings of its phases."""
+    global _include_timings
+    _include_timings = include_in_response
+
+
+def timings_included():
+    return _include_timings
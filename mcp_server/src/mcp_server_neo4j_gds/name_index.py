@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+_NGRAM_SIZE = 3
+
+
+def _normalize(value):
+    return str(value).lower()
+
+
+def _ngrams(text):
+    return {text[i : i + _NGRAM_SIZE] for i in range(len(text) - _NGRAM_SIZE + 1)}
+
+
+class NameIndex:
+    """
+    In-process index of the string values of one node property.
+
+    Answers the same question as `toLower(n.<property>) CONTAINS toLower($name)`:
+    an exact map from the lowercased value to node ids serves whole-value matches,
+    and a trigram index narrows substring matches down to the nodes containing every
+    trigram of the search text before the candidates are checked.
+    """
+
+    def __init__(self, property_name):
+        self.property_name = property_name
+        self.fingerprint = None
+        self.built_at = None
+        self.max_node_id = -1
+        self._values = {}
+        self._exact = defaultdict(set)
+        self._ngrams = defaultdict(set)
+
+    def __len__(self):
+        return len(self._values)
+
+    def copy(self):
+        """A copy that can be updated while lookups still read this index."""
+        index = NameIndex(self.property_name)
+        index.fingerprint = self.fingerprint
+        index.built_at = self.built_at
+        index.max_node_id = self.max_node_id
+        index._values = dict(self._values)
+        index._exact = defaultdict(
+            set, {text: set(ids) for text, ids in self._exact.items()}
+        )
+        index._ngrams = defaultdict(
+            set, {ngram: set(ids) for ngram, ids in self._ngrams.items()}
+        )
+        return index
+
+    def add(self, node_id, value):
+        if not isinstance(value, str):
+            return
+        node_id = int(node_id)
+        if node_id in self._values:
+            self.remove(node_id)
+        text = _normalize(value)
+        self._values[node_id] = text
+        self._exact[text].add(node_id)
+        for ngram in _ngrams(text):
+            self._ngrams[ngram].add(node_id)
+        self.max_node_id = max(self.max_node_id, node_id)
+
+    def remove(self, node_id):
+        text = self._values.pop(node_id, None)
+        if text is None:
+            return
+        self._discard(self._exact, text, node_id)
+        for ngram in _ngrams(text):
+            self._discard(self._ngrams, ngram, node_id)
+
+    @staticmethod
+    def _discard(mapping, key, node_id):
+        ids = mapping[key]
+        ids.discard(node_id)
+        if not ids:
+            del mapping[key]
+
+    def is_current(self, node_id, value):
+        """Whether the index holds `value` for the node, as it is in the database now."""
+        if not isinstance(value, str):
+            return node_id not in self._values
+        return self._values.get(node_id) == _normalize(value)
+
+    def lookup(self, name):
+        """
+        Return the ids of the nodes whose value contains `name`, ignoring case.
+
+        Nodes whose whole value equals `name` come first, then the other matches,
+        each group in ascending node id order.
+        """
+        text = _normalize(name)
+        exact = sorted(self._exact.get(text, ()))
+        if len(text) < _NGRAM_SIZE:
+            candidates = self._values.keys()
+        else:
+            postings = sorted(
+                (self._ngrams.get(ngram, set()) for ngram in _ngrams(text)), key=len
+            )
+            candidates = set.intersection(*postings) if postings else set()
+        exact_ids = set(exact)
+        partial = sorted(
+            node_id
+            for node_id in candidates
+            if node_id not in exact_ids and text in self._values[node_id]
+        )
+        return exact + partial
+
+
+class NameIndexRegistry:
+    """
+    Name indexes per node property, kept in sync with the database.
+
+    An index is loaded with one bulk read of the property the first time it is used.
+    Before every lookup the graph fingerprint, which includes the last committed
+    transaction, is compared with the one the index was built for: if the node count
+    grew, the new nodes are read and added; any other change, e.g. a `SET` of a value
+    or a node recreated under a reused id, or an index older than `max_age` seconds,
+    rebuilds it. Nodes with an id above the largest indexed one are taken as the added
+    nodes, so if fewer or more of them exist than the node count grew by, nodes were
+    deleted and the index is rebuilt.
+
+    Values changed in the transactions that also added nodes are not seen by the
+    incremental update, nor are any changes on servers that do not report their last
+    committed transaction. Callers therefore check the matches of a lookup against the
+    database and `get` the index with `rebuild=True` if one is stale, and look up the
+    names without a match in the database.
+
+    Indexes are never changed once they are returned: updates are made to a copy that
+    replaces the index, so lookups in other threads can go on reading it.
+    """
+
+    def __init__(self, max_age=300.0):
+        self.max_age = max_age
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def get(self, gds, property_name, fingerprint, read_values, rebuild=False):
+        """
+        Return the up-to-date index of `property_name`.
+
+        Args:
+            fingerprint: Current graph fingerprint of the database
+            read_values: Callable (gds, property_name, after_node_id) returning a
+                DataFrame of nodeId and value of every node with an id above
+                after_node_id, the value null if the node does not have the property
+            rebuild: If True, rebuild the index even if it looks up to date.
+        """
+        key = (gds.database(), property_name)
+        with self._lock_for(key):
+            with self._lock:
+                index = self._indexes.get(key)
+            if rebuild or index is None or self._needs_rebuild(index, fingerprint):
+                index = None
+            elif index.fingerprint == fingerprint:
+                return index
+            else:
+                index = self._add_new_nodes(gds, index, fingerprint, read_values)
+            if index is None:
+                index = NameIndex(property_name)
+                self._load(gds, index, read_values)
+            index.fingerprint = fingerprint
+            with self._lock:
+                self._indexes[key] = index
+            return index
+
+    @contextmanager
+    def _lock_for(self, key):
+        # Serialize loading per key, so that a rebuild of one index does not block
+        # lookups in the others.
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+    def _needs_rebuild(self, index, fingerprint):
+        if time.monotonic() - index.built_at > self.max_age:
+            return True
+        if index.fingerprint == fingerprint:
+            return False
+        # Only a pure growth in nodes can be applied incrementally
+        previous = index.fingerprint
+        return (
+            fingerprint.node_count <= previous.node_count
+            or fingerprint.labels != previous.labels
+            or fingerprint.property_keys != previous.property_keys
+        )
+
+    def _add_new_nodes(self, gds, index, fingerprint, read_values):
+        """
+        A copy of `index` with the nodes created since it was loaded, or None if
+        nodes were deleted.
+        """
+        values = read_values(gds, index.property_name, index.max_node_id)
+        if index.fingerprint.node_count + len(values) != fingerprint.node_count:
+            return None
+        index = index.copy()
+        self._add(index, values)
+        return index
+
+    @staticmethod
+    def _add(index, values):
+        for node_id, value in zip(values["nodeId"], values["value"]):
+            index.add(node_id, value)
+        # Nodes without a value count as well, they are not new in the next refresh
+        if len(values):
+            index.max_node_id = max(index.max_node_id, int(values["nodeId"].max()))
+
+    def _load(self, gds, index, read_values):
+        start = time.monotonic()
+        values = read_values(gds, index.property_name, -1)
+        self._add(index, values)
+        index.built_at = start
+        logger.info(
+            f"Loaded {len(values)} values into the name index of '{index.property_name}' "
+            f"({len(index)} nodes) in {time.monotonic() - start:.3f}s"
+        )
@@ -1,6 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 from graphdatascience import GraphDataScience
 
+from .gds import get_graph_fingerprint
+from .metrics import timed
+from .name_index import NameIndexRegistry
+
+_translation_batch_size = 10000
+_translation_parallelism = 4
+_name_indexes = NameIndexRegistry()
+
+
+def configure_translation_batch_size(batch_size: int):
+    """Set how many node ids are resolved per query when translating ids to identifiers."""
+    global _translation_batch_size
+    if batch_size < 1:
+        raise ValueError("The translation batch size must be a positive integer.")
+    _translation_batch_size = batch_size
+
+
+def configure_translation_parallelism(parallelism: int):
+    """Set how many batches of node ids are looked up at the same time, each on its own connection."""
+    global _translation_parallelism
+    if parallelism < 1:
+        raise ValueError("The translation parallelism must be a positive integer.")
+    _translation_parallelism = parallelism
+
+
+def _map_batches(lookup, batches):
+    if _translation_parallelism == 1 or len(batches) <= 1:
+        return [lookup(batch) for batch in batches]
+    workers = min(_translation_parallelism, len(batches))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="gds-lookup"
+    ) as pool:
+        return list(pool.map(lookup, batches))
+
+
+def configure_name_index(enabled=True, max_age=300.0):
+    """
+    Resolve node names with an in-process index instead of scanning the database.
+
+    Args:
+        enabled: If False, every name lookup runs a CONTAINS query against the database.
+        max_age: Seconds after which an index is rebuilt to pick up changed values.
+    """
+    global _name_indexes
+    _name_indexes = NameIndexRegistry(max_age=max_age) if enabled else None
+
+
+def _read_identifier_values(gds: GraphDataScience, node_identifier_property, after):
+    return gds.run_cypher(
+        """
+        MATCH (n)
+        WHERE id(n) > $after
+        RETURN id(n) AS nodeId, n[$property] AS value
+        """,
+        params={"after": after, "property": node_identifier_property},
+    )
+
+
+@timed("id_translation")
+def lookup_node_ids(gds: GraphDataScience, node_identifier_property, names):
+    """
+    Find the nodes whose `node_identifier_property` contains each of `names`, ignoring case.
+
+    Returns:
+        A dict from each name to the list of matching node ids. Nodes whose whole value
+        equals the name come first, then the other matches, each in ascending node id order.
+        Without the name index, all names are looked up with a single query, with the
+        index only the names it has no match for.
+    """
+    if _name_indexes is None:
+        return _lookup_in_database(gds, node_identifier_property, names)
+
+    fingerprint = get_graph_fingerprint(gds)
+    index = _name_indexes.get(
+        gds, node_identifier_property, fingerprint, _read_identifier_values
+    )
+    matches = {name: index.lookup(name) if name is not None else [] for name in names}
+    if _has_stale_matches(gds, node_identifier_property, index, matches):
+        # A value changed in a transaction the incremental update did not look at
+        index = _name_indexes.get(
+            gds,
+            node_identifier_property,
+            fingerprint,
+            _read_identifier_values,
+            rebuild=True,
+        )
+        matches = {
+            name: index.lookup(name) if name is not None else [] for name in names
+        }
+    # The index may miss values changed since it was updated, see NameIndexRegistry
+    missing = [name for name, node_ids in matches.items() if name and not node_ids]
+    if missing:
+        matches.update(_lookup_in_database(gds, node_identifier_property, missing))
+    return matches
+
+
+def _lookup_in_database(gds: GraphDataScience, node_identifier_property, names):
+    query = f"""
+            UNWIND $names AS name
+            MATCH (s)
+            WHERE toLower(s.{node_identifier_property}) CONTAINS toLower(name)
+            RETURN name AS name, id(s) as node_id
+            ORDER BY toLower(s.{node_identifier_property}) = toLower(name) DESC, node_id
+            """
+    df = gds.run_cypher(query, params={"names": list(dict.fromkeys(names))})
+    matches = {name: [] for name in names}
+    for name, node_id in zip(df["name"], df["node_id"]):
+        matches[name].append(int(node_id))
+    return matches
+
+
+def _has_stale_matches(gds: GraphDataScience, node_identifier_property, index, matches):
+    """Whether a matched node no longer has the value the name index holds for it."""
+    node_ids = sorted({node_id for ids in matches.values() for node_id in ids})
+    if not node_ids:
+        return False
+    df = gds.run_cypher(
+        """
+        UNWIND $ids AS id
+        MATCH (n)
+        WHERE id(n) = id
+        RETURN id AS nodeId, n[$property] AS identifier
+        """,
+        params={"ids": node_ids, "property": node_identifier_property},
+    )
+    current = dict(zip(df["nodeId"], df["identifier"]))
+    return any(
+        node_id not in current or not index.is_current(node_id, current[node_id])
+        for node_id in node_ids
+    )
+
+
+@timed("id_translation")
+def resolve_node_names(gds: GraphDataScience, node_identifier_property, names):
+    """
+    Resolve each of `names` to the id of its best matching node in one lookup.
+
+    The best match is the node whose value equals the name, ignoring case, or else the
+    node with the lowest id whose value contains it, so repeated calls agree.
+
+    Returns:
+        A dict from each name to a node id, or None for names without a match.
+    """
+    matches = lookup_node_ids(gds, node_identifier_property, names)
+    return {
+        name: node_ids[0] if node_ids else None for name, node_ids in matches.items()
+    }
 
+
+@timed("id_translation")
+def find_node_id(gds: GraphDataScience, node_identifier_property, name):
+    """Return the id of the best node matching `name`, or None if there is none."""
+    return resolve_node_names(gds, node_identifier_property, [name])[name]
+
+
+@timed("id_translation")
 def translate_identifiers_to_ids(
     gds: GraphDataScience,
     input_nodes,
@@ -12,40 +170,80 @@ def translate_identifiers_to_ids(
     if input_nodes is not None and node_identifier_property is not None:
         if isinstance(input_nodes, list):
             # Handle list of node names
-            query = f"""
-                    UNWIND $names AS name
-                    MATCH (s)
-                    WHERE toLower(s.{node_identifier_property}) CONTAINS toLower(name)
-                    RETURN id(s) as node_id
-                    """
-            df = gds.run_cypher(
-                query,
-                params={
-                    "names": input_nodes,
-                },
-            )
-            input_node_ids = df["node_id"].tolist()
-            call_params[input_nodes_variable_name] = input_node_ids
+            matches = lookup_node_ids(gds, node_identifier_property, input_nodes)
+            call_params[input_nodes_variable_name] = [
+                node_id for name in input_nodes for node_id in matches[name]
+            ]
         else:
             # Handle single  node name
-            query = f"""
-                    MATCH (s)
-                    WHERE toLower(s.{node_identifier_property}) CONTAINS toLower($name)
-                    RETURN id(s) as node_id
-                    """
-            df = gds.run_cypher(
-                query,
-                params={
-                    "name": input_nodes,
-                },
-            )
-            if not df.empty:
-                call_params[input_nodes_variable_name] = int(df["node_id"].iloc[0])
+            node_id = find_node_id(gds, node_identifier_property, input_nodes)
+            if node_id is not None:
+                call_params[input_nodes_variable_name] = node_id
     elif input_nodes is not None:
         # If input_nodes provided but no nodeIdentifierProperty, pass through as-is
         call_params[input_nodes_variable_name] = input_nodes
 
 
+@timed("id_translation")
+def resolve_node_identifiers(
+    gds: GraphDataScience, node_identifier_property, node_ids, batch_size=None
+):
+    """
+    Look up `node_identifier_property` for many node ids with one query per batch.
+    Batches are looked up in parallel, see configure_translation_parallelism.
+
+    Returns:
+        A Series of identifier values indexed by node id.
+    """
+    batch_size = batch_size or _translation_batch_size
+    unique_ids = pd.unique(pd.Series(node_ids, dtype="int64")).tolist()
+    query = """
+            UNWIND $ids AS id
+            MATCH (n)
+            WHERE id(n) = id
+            RETURN id AS nodeId, n[$property] AS identifier
+            """
+    batches = [
+        unique_ids[start : start + batch_size]
+        for start in range(0, len(unique_ids), batch_size)
+    ]
+    frames = _map_batches(
+        lambda batch: gds.run_cypher(
+            query,
+            params={"ids": batch, "property": node_identifier_property},
+        ),
+        batches,
+    )
+    if not frames:
+        return pd.Series(dtype=object)
+    identifiers = pd.concat(frames, ignore_index=True)
+    return pd.Series(
+        identifiers["identifier"].to_numpy(dtype=object),
+        index=identifiers["nodeId"].astype("int64"),
+    )
+
+
+@timed("id_translation")
+def resolve_nodes(gds: GraphDataScience, node_ids, batch_size=None):
+    """
+    Look up the nodes for many node ids with `gds.util.asNodes`, one call per batch.
+
+    Returns:
+        A Series of nodes, as returned by `gds.util.asNode`, indexed by node id.
+    """
+    batch_size = batch_size or _translation_batch_size
+    unique_ids = pd.unique(pd.Series(node_ids, dtype="int64")).tolist()
+    batches = [
+        unique_ids[start : start + batch_size]
+        for start in range(0, len(unique_ids), batch_size)
+    ]
+    nodes = [
+        node for batch in _map_batches(gds.util.asNodes, batches) for node in batch
+    ]
+    return pd.Series(nodes, index=pd.Index(unique_ids, dtype="int64"), dtype=object)
+
+
+@timed("id_translation")
 def translate_ids_to_identifiers(
     gds: GraphDataScience,
     node_identifier_property,
@@ -54,13 +252,14 @@ def translate_ids_to_identifiers(
     node_identifier_output_name="nodeName",
 ):
     if node_identifier_property is not None:
-        node_name_values = [
-            gds.util.asNode(node_id).get(node_identifier_property)
-            for node_id in results[id_name]
-        ]
-        results[node_identifier_output_name] = node_name_values
+        identifiers = resolve_node_identifiers(
+            gds, node_identifier_property, results[id_name]
+        )
+        # Join the looked up identifiers onto the result rows by node id
+        results[node_identifier_output_name] = results[id_name].map(identifiers)
 
 
+@timed("id_translation")
 def filter_identifiers(
     gds: GraphDataScience,
     node_identifier_property,
@@ -70,22 +269,19 @@ def filter_identifiers(
 ):
     if node_names is None:
         return results
+    node_ids = node_ids_of_identifiers(gds, node_identifier_property, node_names)
+    filtered_results = results[results[id_name].isin(node_ids)]
+    return filtered_results
+
+
+@timed("id_translation")
+def node_ids_of_identifiers(
+    gds: GraphDataScience, node_identifier_property, node_names
+):
+    """Ids of all nodes matching any of the `nodes` argument of a tool."""
     if node_identifier_property is None:
         raise ValueError(
             "If 'nodes' is provided, 'nodeIdentifierProperty' must also be specified."
         )
-    query = f"""
-            UNWIND $names AS name
-            MATCH (s)
-            WHERE toLower(s.{node_identifier_property}) CONTAINS toLower(name)
-            RETURN id(s) as node_id
-            """
-    df = gds.run_cypher(
-        query,
-        params={
-            "names": node_names,
-        },
-    )
-    node_ids = df["node_id"].tolist()
-    filtered_results = results[results[id_name].isin(node_ids)]
-    return filtered_results
+    matches = lookup_node_ids(gds, node_identifier_property, node_names)
+    return [node_id for name in node_names for node_id in matches[name]]
@@ -1,41 +1,106 @@
 import logging
 from typing import Dict, Any
 
+import numpy as np
+import pandas as pd
 
 from .algorithm_handler import AlgorithmHandler
-from .gds import projected_graph
+from .gds import projected_graph, stream_all_pairs_distances, stream_node_ids
+from .node_translator import (
+    find_node_id,
+    node_ids_of_identifiers,
+    resolve_node_names,
+    resolve_node_identifiers,
+    translate_ids_to_identifiers,
+)
+from .path_results import build_path_records
 
 logger = logging.getLogger("mcp_server_neo4j_gds")
 
+# Record layouts of the path algorithm results, see build_path_records
+SINGLE_SOURCE_PATH_FIELDS = [
+    ("targetNode", "targetNode", "int"),
+    ("targetNodeName", "targetNode", "node"),
+    ("totalCost", "totalCost", "float"),
+    ("nodeIds", "nodeIds", "list"),
+    ("nodeNames", "nodeIds", "nodes"),
+    ("costs", "costs", "list"),
+    ("path", "path", "raw"),
+]
+YENS_PATH_FIELDS = [
+    ("index", "index", "int"),
+    ("totalCost", "totalCost", "float"),
+    ("nodeIds", "nodeIds", "list"),
+    ("nodeNames", "nodeIds", "nodes"),
+    ("path", "path", "raw"),
+    ("costs", "costs", "list"),
+]
+TREE_EDGE_FIELDS = [
+    ("nodeId", "nodeId", "int"),
+    ("parentId", "parentId", "int"),
+    ("nodeName", "nodeId", "node"),
+    ("parentName", "parentId", "node"),
+    ("weight", "weight", "float"),
+]
+ALL_PAIRS_FIELDS = [
+    ("sourceNodeId", "sourceNodeId", "int"),
+    ("targetNodeId", "targetNodeId", "int"),
+    ("sourceNodeName", "sourceNodeId", "node"),
+    ("targetNodeName", "targetNodeId", "node"),
+    ("distance", "distance", "float"),
+]
+RANDOM_WALK_FIELDS = [
+    ("nodeIds", "nodeIds", "list"),
+    ("nodeNames", "nodeIds", "nodes"),
+    ("walkLength", "nodeIds", "length"),
+]
+TRAVERSAL_FIELDS = [
+    ("sourceNode", "sourceNode", "int"),
+    ("nodeIds", "nodeIds", "list"),
+    ("nodeNames", "nodeIds", "nodes"),
+    ("visitedNodes", "nodeIds", "length"),
+]
+LONGEST_PATH_FIELDS = [
+    ("index", "index", "int"),
+    ("sourceNode", "sourceNode", "int"),
+    ("targetNode", "targetNode", "int"),
+    ("totalCost", "totalCost", "float"),
+    ("nodeIds", "nodeIds", "list"),
+    ("nodeNames", "nodeIds", "nodes"),
+    ("costs", "costs", "list"),
+]
+BELLMAN_FORD_PATH_FIELDS = LONGEST_PATH_FIELDS + [
+    ("isNegativeCycle", "isNegativeCycle", "bool"),
+]
+
 
 class DijkstraShortestPathHandler(AlgorithmHandler):
     def find_shortest_path(
         self, start_node: str, end_node: str, node_identifier_property: str, **kwargs
     ):
-        query = f"""
-        MATCH (start)
-        WHERE toLower(start.{node_identifier_property}) CONTAINS toLower($start_name)
-        MATCH (end)
-        WHERE toLower(end.{node_identifier_property}) CONTAINS toLower($end_name)
-        RETURN id(start) as start_id, id(end) as end_id
-        """
-
-        df = self.gds.run_cypher(
-            query, params={"start_name": start_node, "end_name": end_node}
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [start_node, end_node]
         )
+        start_node_id, end_node_id = node_ids[start_node], node_ids[end_node]
 
-        if df.empty:
+        if start_node_id is None or end_node_id is None:
             return {"found": False, "message": "One or both node names not found"}
 
-        start_node_id = int(df["start_id"].iloc[0])
-        end_node_id = int(df["end_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             args = locals()
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Dijkstra single-source shortest path parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.shortestPath.dijkstra,
+                    G,
+                    sourceNode=start_node_id,
+                    targetNode=end_node_id,
+                    **params,
+                )
+
             path_data = self.gds.shortestPath.dijkstra.stream(
                 G, sourceNode=start_node_id, targetNode=end_node_id, **params
             )
@@ -80,24 +145,24 @@ class DeltaSteppingShortestPathHandler(AlgorithmHandler):
     def delta_stepping_shortest_path(
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
-        query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
+        source_node_id = find_node_id(self.gds, node_identifier_property, source_node)
 
-        df = self.gds.run_cypher(query, params={"source_name": source_node})
-
-        if df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(df["source_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Delta-Stepping shortest path parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.allShortestPaths.delta,
+                    G,
+                    sourceNode=source_node_id,
+                    **params,
+                )
+
             path_data = self.gds.allShortestPaths.delta.stream(
                 G, sourceNode=source_node_id, **params
             )
@@ -108,38 +173,9 @@ class DeltaSteppingShortestPathHandler(AlgorithmHandler):
                     "message": "No paths found from the source node",
                 }
 
-            # Convert to native Python types as needed
-            result_data = []
-            for _, row in path_data.iterrows():
-                target_node_id = int(row["targetNode"])
-                total_cost = float(row["totalCost"])
-
-                # Get the path details
-                node_ids = row["nodeIds"]
-                costs = row["costs"]
-                path = row["path"]
-
-                # Convert to native Python types if needed
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-                if hasattr(costs, "tolist"):
-                    costs = costs.tolist()
-
-                # Get node names using GDS utility function
-                target_node_name = self.gds.util.asNode(target_node_id)
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                result_data.append(
-                    {
-                        "targetNode": target_node_id,
-                        "targetNodeName": target_node_name,
-                        "totalCost": total_cost,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "costs": costs,
-                        "path": path,
-                    }
-                )
+            result_data = build_path_records(
+                self.gds, path_data, SINGLE_SOURCE_PATH_FIELDS
+            )
 
             # Do we need to return the sourceNodeId and sourceNodeName?
             return {
@@ -162,24 +198,24 @@ class DijkstraSingleSourceShortestPathHandler(AlgorithmHandler):
     def dijkstra_single_source_shortest_path(
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
-        query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
-
-        df = self.gds.run_cypher(query, params={"source_name": source_node})
+        source_node_id = find_node_id(self.gds, node_identifier_property, source_node)
 
-        if df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(df["source_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Dijkstra single-source shortest path parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.allShortestPaths.dijkstra,
+                    G,
+                    sourceNode=source_node_id,
+                    **params,
+                )
+
             path_data = self.gds.allShortestPaths.dijkstra.stream(
                 G, sourceNode=source_node_id, **params
             )
@@ -190,38 +226,9 @@ class DijkstraSingleSourceShortestPathHandler(AlgorithmHandler):
                     "message": "No paths found from the source node",
                 }
 
-            # Convert to native Python types as needed
-            result_data = []
-            for _, row in path_data.iterrows():
-                target_node_id = int(row["targetNode"])
-                total_cost = float(row["totalCost"])
-
-                # Get the path details
-                node_ids = row["nodeIds"]
-                costs = row["costs"]
-                path = row["path"]
-
-                # Convert to native Python types if needed
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-                if hasattr(costs, "tolist"):
-                    costs = costs.tolist()
-
-                # Get node names using GDS utility function
-                target_node_name = self.gds.util.asNode(target_node_id)
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                result_data.append(
-                    {
-                        "targetNode": target_node_id,
-                        "targetNodeName": target_node_name,
-                        "totalCost": total_cost,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "costs": costs,
-                        "path": path,
-                    }
-                )
+            result_data = build_path_records(
+                self.gds, path_data, SINGLE_SOURCE_PATH_FIELDS
+            )
 
             return {
                 "found": True,
@@ -246,29 +253,28 @@ class AStarShortestPathHandler(AlgorithmHandler):
         node_identifier_property: str,
         **kwargs,
     ):
-        query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        MATCH (target)
-        WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-        RETURN id(source) as source_id, id(target) as target_id
-        """
-
-        df = self.gds.run_cypher(
-            query, params={"source_name": source_node, "target_name": target_node}
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [source_node, target_node]
         )
+        source_node_id, target_node_id = node_ids[source_node], node_ids[target_node]
 
-        if df.empty:
+        if source_node_id is None or target_node_id is None:
             return {"found": False, "message": "One or both node names not found"}
 
-        source_node_id = int(df["source_id"].iloc[0])
-        target_node_id = int(df["target_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"A* shortest path parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.shortestPath.astar,
+                    G,
+                    sourceNode=source_node_id,
+                    targetNode=target_node_id,
+                    **params,
+                )
+
             path_data = self.gds.shortestPath.astar.stream(
                 G, sourceNode=source_node_id, targetNode=target_node_id, **params
             )
@@ -319,29 +325,28 @@ class YensShortestPathsHandler(AlgorithmHandler):
         node_identifier_property: str,
         **kwargs,
     ):
-        query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        MATCH (target)
-        WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-        RETURN id(source) as source_id, id(target) as target_id
-        """
-
-        df = self.gds.run_cypher(
-            query, params={"source_name": source_node, "target_name": target_node}
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [source_node, target_node]
         )
+        source_node_id, target_node_id = node_ids[source_node], node_ids[target_node]
 
-        if df.empty:
+        if source_node_id is None or target_node_id is None:
             return {"found": False, "message": "One or both node names not found"}
 
-        source_node_id = int(df["source_id"].iloc[0])
-        target_node_id = int(df["target_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Yen's shortest paths parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.shortestPath.yens,
+                    G,
+                    sourceNode=source_node_id,
+                    targetNode=target_node_id,
+                    **params,
+                )
+
             path_data = self.gds.shortestPath.yens.stream(
                 G, sourceNode=source_node_id, targetNode=target_node_id, **params
             )
@@ -352,32 +357,7 @@ class YensShortestPathsHandler(AlgorithmHandler):
                     "message": "No paths found between the specified nodes",
                 }
 
-            # Convert to native Python types as needed
-            result_data = []
-            for _, row in path_data.iterrows():
-                # Convert to native Python types as needed - handle both list and Series objects
-                node_ids = row["nodeIds"]
-                costs = row["costs"]
-
-                # Convert only if not already a list
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-                if hasattr(costs, "tolist"):
-                    costs = costs.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                result_data.append(
-                    {
-                        "index": int(row["index"]),
-                        "totalCost": float(row["totalCost"]),
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "path": row["path"],
-                        "costs": costs,
-                    }
-                )
+            result_data = build_path_records(self.gds, path_data, YENS_PATH_FIELDS)
 
             return {
                 "found": True,
@@ -403,24 +383,23 @@ class MinimumWeightSpanningTreeHandler(AlgorithmHandler):
     def minimum_weight_spanning_tree(
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
-        query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
-
-        df = self.gds.run_cypher(query, params={"source_name": source_node})
+        source_node_id = find_node_id(self.gds, node_identifier_property, source_node)
 
-        if df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(df["source_id"].iloc[0])
-
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Minimum Weight Spanning Tree parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.spanningTree, G, sourceNode=source_node_id, **params
+                )
+
             mst_data = self.gds.spanningTree.stream(
                 G, sourceNode=source_node_id, **params
             )
@@ -431,34 +410,10 @@ class MinimumWeightSpanningTreeHandler(AlgorithmHandler):
                     "message": "No spanning tree found from the source node",
                 }
 
-            # Convert to native Python types as needed
-            edges = []
-            total_weight = 0.0
-
-            for _, row in mst_data.iterrows():
-                node_id = int(row["nodeId"])
-                parent_id = int(row["parentId"])
-                weight = float(row["weight"])
-
-                # Skip the root node (where nodeId == parentId)
-                if node_id == parent_id:
-                    continue
-
-                total_weight += weight
-
-                # Get node names using GDS utility function
-                parent_name = self.gds.util.asNode(parent_id)
-                node_name = self.gds.util.asNode(node_id)
-
-                edges.append(
-                    {
-                        "nodeId": node_id,
-                        "parentId": parent_id,
-                        "nodeName": node_name,
-                        "parentName": parent_name,
-                        "weight": weight,
-                    }
-                )
+            # Skip the root node (where nodeId == parentId)
+            mst_data = mst_data[mst_data["nodeId"] != mst_data["parentId"]]
+            edges = build_path_records(self.gds, mst_data, TREE_EDGE_FIELDS)
+            total_weight = sum((edge["weight"] for edge in edges), 0.0)
 
             return {
                 "found": True,
@@ -483,43 +438,20 @@ class MinimumDirectedSteinerTreeHandler(AlgorithmHandler):
         node_identifier_property: str,
         **kwargs,
     ):
-        # Find source node ID
-        source_query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
-
-        source_df = self.gds.run_cypher(
-            source_query, params={"source_name": source_node}
+        # Find the source and target node IDs in one lookup
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [source_node, *target_nodes]
         )
+        source_node_id = node_ids[source_node]
 
-        if source_df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(source_df["source_id"].iloc[0])
-
-        # Find target node IDs - ensure ALL target nodes are found
-        target_node_ids = []
-        target_node_names = []
-        unmatched_targets = []
-
-        for target_name in target_nodes:
-            target_query = f"""
-            MATCH (target)
-            WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-            RETURN id(target) as target_id, target.{node_identifier_property} as target_name
-            """
-
-            target_df = self.gds.run_cypher(
-                target_query, params={"target_name": target_name}
-            )
-
-            if not target_df.empty:
-                target_node_ids.append(int(target_df["target_id"].iloc[0]))
-                target_node_names.append(target_df["target_name"].iloc[0])
-            else:
-                unmatched_targets.append(target_name)
+        # Ensure ALL target nodes are found
+        target_node_ids = [
+            node_ids[name] for name in target_nodes if node_ids[name] is not None
+        ]
+        unmatched_targets = [name for name in target_nodes if node_ids[name] is None]
 
         # Check if all target nodes were found
         if unmatched_targets:
@@ -531,11 +463,20 @@ class MinimumDirectedSteinerTreeHandler(AlgorithmHandler):
         if not target_node_ids:
             return {"found": False, "message": "No target nodes found"}
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Minimum Directed Steiner Tree parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.steinerTree,
+                    G,
+                    sourceNode=source_node_id,
+                    targetNodes=target_node_ids,
+                    **params,
+                )
+
             # Run the steiner tree algorithm
             steiner_data = self.gds.steinerTree.stream(
                 G, sourceNode=source_node_id, targetNodes=target_node_ids, **params
@@ -547,34 +488,12 @@ class MinimumDirectedSteinerTreeHandler(AlgorithmHandler):
                     "message": "No steiner tree found connecting the source to all target nodes",
                 }
 
-            # Convert to native Python types as needed
-            edges = []
-            total_weight = 0.0
-
-            for _, row in steiner_data.iterrows():
-                node_id = int(row["nodeId"])
-                parent_id = int(row["parentId"])
-                weight = float(row["weight"])
-
-                # Skip the root node (where nodeId == parentId)
-                if node_id == parent_id:
-                    continue
-
-                total_weight += weight
-
-                # Get node names using GDS utility function
-                node_name = self.gds.util.asNode(node_id)
-                parent_name = self.gds.util.asNode(parent_id)
-
-                edges.append(
-                    {
-                        "nodeId": node_id,
-                        "parentId": parent_id,
-                        "nodeName": node_name,
-                        "parentName": parent_name,
-                        "weight": weight,
-                    }
-                )
+            # Skip the root node (where nodeId == parentId)
+            steiner_data = steiner_data[
+                steiner_data["nodeId"] != steiner_data["parentId"]
+            ]
+            edges = build_path_records(self.gds, steiner_data, TREE_EDGE_FIELDS)
+            total_weight = sum((edge["weight"] for edge in edges), 0.0)
 
             return {
                 "found": True,
@@ -595,11 +514,16 @@ class MinimumDirectedSteinerTreeHandler(AlgorithmHandler):
 
 class PrizeCollectingSteinerTreeHandler(AlgorithmHandler):
     def prize_collecting_steiner_tree(self, **kwargs):
-        with projected_graph(self.gds, undirected=True) as G:
+        with projected_graph(
+            self.gds, undirected=True, projection_filter=self.projection_filter
+        ) as G:
             # Prepare parameters for the algorithm
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"Prize-Collecting Steiner Tree parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.prizeSteinerTree, G, **params)
+
             # Run the prize-collecting steiner tree algorithm
             steiner_data = self.gds.prizeSteinerTree.stream(G, **params)
 
@@ -609,34 +533,12 @@ class PrizeCollectingSteinerTreeHandler(AlgorithmHandler):
                     "message": "No prize-collecting steiner tree found",
                 }
 
-            # Convert to native Python types as needed
-            edges = []
-            total_weight = 0.0
-
-            for _, row in steiner_data.iterrows():
-                node_id = int(row["nodeId"])
-                parent_id = int(row["parentId"])
-                weight = float(row["weight"])
-
-                # Skip the root node (where nodeId == parentId)
-                if node_id == parent_id:
-                    continue
-
-                total_weight += weight
-
-                # Get node names using GDS utility function if available
-                node_name = self.gds.util.asNode(node_id)
-                parent_name = self.gds.util.asNode(parent_id)
-
-                edges.append(
-                    {
-                        "nodeId": node_id,
-                        "parentId": parent_id,
-                        "nodeName": node_name,
-                        "parentName": parent_name,
-                        "weight": weight,
-                    }
-                )
+            # Skip the root node (where nodeId == parentId)
+            steiner_data = steiner_data[
+                steiner_data["nodeId"] != steiner_data["parentId"]
+            ]
+            edges = build_path_records(self.gds, steiner_data, TREE_EDGE_FIELDS)
+            total_weight = sum((edge["weight"] for edge in edges), 0.0)
 
             return {
                 "found": True,
@@ -652,48 +554,154 @@ class PrizeCollectingSteinerTreeHandler(AlgorithmHandler):
 
 
 class AllPairsShortestPathsHandler(AlgorithmHandler):
-    def all_pairs_shortest_paths(self, **kwargs):
-        with projected_graph(self.gds) as G:
+    def all_pairs_shortest_paths(
+        self,
+        output_format="paths",
+        source_nodes=None,
+        target_nodes=None,
+        max_distance=None,
+        row_offset=0,
+        row_limit=None,
+        node_identifier_property=None,
+        **kwargs,
+    ):
+        if self.mode != "stream":
+            raise ValueError(
+                f"all_pairs_shortest_paths cannot run in {self.mode} mode, "
+                "GDS only streams all pairs shortest paths."
+            )
+        if output_format not in ["paths", "dense", "sparse"]:
+            raise ValueError(
+                f"Unknown outputFormat '{output_format}'. Use 'paths', 'dense' or 'sparse'."
+            )
+
+        source_ids = (
+            node_ids_of_identifiers(self.gds, node_identifier_property, source_nodes)
+            if source_nodes is not None
+            else None
+        )
+        target_ids = (
+            node_ids_of_identifiers(self.gds, node_identifier_property, target_nodes)
+            if target_nodes is not None
+            else None
+        )
+        row_block = row_offset > 0 or row_limit is not None
+
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # If any optional parameter is not None, use that parameter
             params = {k: v for k, v in kwargs.items() if v is not None}
             logger.info(f"All Pairs Shortest Paths parameters: {params}")
 
-            # Run the all pairs shortest paths algorithm
-            apsp_data = self.gds.allShortestPaths.stream(G, **params)
+            # All nodes of the graph, so that matrix axes do not depend on the filters
+            node_ids = None
+            if (output_format == "dense" and target_ids is None) or (
+                row_block and source_ids is None
+            ):
+                node_ids = stream_node_ids(self.gds, G)
+            row_ids = (
+                np.unique(np.asarray(source_ids, dtype=np.int64))
+                if source_ids is not None
+                else node_ids
+            )
+            if row_block:
+                end = None if row_limit is None else row_offset + row_limit
+                row_ids = row_ids[row_offset:end]
+                source_ids = row_ids.tolist()
+
+            # Run the all pairs shortest paths algorithm, filtered in the database
+            apsp_data = stream_all_pairs_distances(
+                self.gds,
+                G,
+                params,
+                source_ids=source_ids,
+                target_ids=target_ids,
+                max_distance=max_distance,
+            )
 
-            if apsp_data.empty:
-                return {"found": False, "message": "No shortest paths found"}
+        if apsp_data.empty:
+            return {"found": False, "message": "No shortest paths found"}
 
-            # Convert to native Python types as needed
-            paths = []
+        if output_format == "dense":
+            return self._distance_matrix(
+                apsp_data,
+                row_ids,
+                target_ids if target_ids is not None else node_ids,
+                node_identifier_property,
+            )
 
-            for _, row in apsp_data.iterrows():
-                source_id = int(row["sourceNodeId"])
-                target_id = int(row["targetNodeId"])
-                distance = float(row["distance"])
+        if output_format == "sparse":
+            distances = pd.DataFrame(
+                {
+                    "sourceNodeId": apsp_data["sourceNodeId"].to_numpy(dtype=np.int64),
+                    "targetNodeId": apsp_data["targetNodeId"].to_numpy(dtype=np.int64),
+                    "distance": apsp_data["distance"].to_numpy(dtype=np.float32),
+                }
+            )
+            distances = distances[np.isfinite(distances["distance"])]
+            translate_ids_to_identifiers(
+                self.gds,
+                node_identifier_property,
+                distances,
+                id_name="sourceNodeId",
+                node_identifier_output_name="sourceNodeName",
+            )
+            translate_ids_to_identifiers(
+                self.gds,
+                node_identifier_property,
+                distances,
+                id_name="targetNodeId",
+                node_identifier_output_name="targetNodeName",
+            )
+            return distances.reset_index(drop=True)
 
-                # Get node names using GDS utility function
-                source_name = self.gds.util.asNode(source_id)
-                target_name = self.gds.util.asNode(target_id)
+        paths = build_path_records(self.gds, apsp_data, ALL_PAIRS_FIELDS)
 
-                paths.append(
-                    {
-                        "sourceNodeId": source_id,
-                        "targetNodeId": target_id,
-                        "sourceNodeName": source_name,
-                        "targetNodeName": target_name,
-                        "distance": distance,
-                    }
-                )
+        return {
+            "found": True,
+            "paths": paths,
+        }
 
-            return {
-                "found": True,
-                "paths": paths,
-            }
+    def _distance_matrix(
+        self, apsp_data, row_ids, column_ids, node_identifier_property
+    ):
+        """
+        Distances as a float32 matrix with a row per source and a column per target node id.
+
+        Unreachable pairs, and pairs beyond maxDistance, are Infinity. Rows are the source
+        nodes of the requested block, and columns the target nodes, or all nodes.
+        """
+        sources = apsp_data["sourceNodeId"].to_numpy(dtype=np.int64)
+        targets = apsp_data["targetNodeId"].to_numpy(dtype=np.int64)
+        column_ids = np.unique(np.asarray(column_ids, dtype=np.int64))
+
+        matrix = np.full((len(row_ids), len(column_ids)), np.inf, dtype=np.float32)
+        matrix[
+            np.searchsorted(row_ids, sources), np.searchsorted(column_ids, targets)
+        ] = apsp_data["distance"].to_numpy(dtype=np.float32)
+
+        distances = pd.DataFrame(
+            matrix,
+            index=pd.Index(row_ids, name="sourceNodeId"),
+            columns=column_ids.tolist(),
+            copy=False,
+        )
+        if node_identifier_property is not None:
+            names = resolve_node_identifiers(
+                self.gds, node_identifier_property, row_ids
+            )
+            distances.insert(0, "sourceNodeName", names.reindex(row_ids).to_numpy())
+        return distances
 
     def execute(self, arguments: Dict[str, Any]) -> Any:
         return self.all_pairs_shortest_paths(
-            relationshipWeightProperty=arguments.get("relationshipWeightProperty")
+            output_format=arguments.get("outputFormat") or "paths",
+            source_nodes=arguments.get("sourceNodes"),
+            target_nodes=arguments.get("targetNodes"),
+            max_distance=arguments.get("maxDistance"),
+            row_offset=arguments.get("rowOffset") or 0,
+            row_limit=arguments.get("rowLimit"),
+            node_identifier_property=arguments.get("nodeIdentifierProperty"),
+            relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
         )
 
 
@@ -709,21 +717,16 @@ class RandomWalkHandler(AlgorithmHandler):
                     "message": "nodeIdentifierProperty is required when sourceNodes are provided",
                 }
 
-            for source_name in kwargs["sourceNodes"]:
-                source_query = f"""
-                MATCH (source)
-                WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-                RETURN id(source) as source_id
-                """
-
-                source_df = self.gds.run_cypher(
-                    source_query, params={"source_name": source_name}
-                )
-
-                if not source_df.empty:
-                    source_node_ids.append(int(source_df["source_id"].iloc[0]))
+            node_ids = resolve_node_names(
+                self.gds, node_identifier_property, kwargs["sourceNodes"]
+            )
+            source_node_ids = [
+                node_ids[name]
+                for name in kwargs["sourceNodes"]
+                if node_ids[name] is not None
+            ]
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # Prepare parameters for the random walk algorithm, excluding our internal parameters
             params = {
                 k: v
@@ -737,31 +740,16 @@ class RandomWalkHandler(AlgorithmHandler):
 
             logger.info(f"Random Walk parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.randomWalk, G, **params)
+
             # Run the random walk algorithm
             walk_data = self.gds.randomWalk.stream(G, **params)
 
             if walk_data.empty:
                 return {"found": False, "message": "No random walks generated"}
 
-            # Convert to native Python types as needed
-            walks = []
-
-            for _, row in walk_data.iterrows():
-                node_ids = row["nodeIds"]
-                # Convert node_ids to list if it's not already
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                walks.append(
-                    {
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "walkLength": len(node_ids),
-                    }
-                )
+            walks = build_path_records(self.gds, walk_data, RANDOM_WALK_FIELDS)
 
             return {
                 "found": True,
@@ -778,6 +766,7 @@ class RandomWalkHandler(AlgorithmHandler):
             returnFactor=arguments.get("returnFactor"),
             relationshipWeightProperty=arguments.get("relationshipWeightProperty"),
             walkBufferSize=arguments.get("walkBufferSize"),
+            randomSeed=arguments.get("randomSeed"),
         )
 
 
@@ -785,40 +774,21 @@ class BreadthFirstSearchHandler(AlgorithmHandler):
     def breadth_first_search(
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
-        # Find source node ID
-        source_query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
-
-        source_df = self.gds.run_cypher(
-            source_query, params={"source_name": source_node}
+        # Find the source node ID, and the target node IDs if provided, in one lookup
+        target_nodes = kwargs.get("targetNodes") or []
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [source_node, *target_nodes]
         )
+        source_node_id = node_ids[source_node]
 
-        if source_df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(source_df["source_id"].iloc[0])
-
-        # Process target nodes if provided
-        target_node_ids = []
-        if "targetNodes" in kwargs and kwargs["targetNodes"]:
-            for target_name in kwargs["targetNodes"]:
-                target_query = f"""
-                MATCH (target)
-                WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-                RETURN id(target) as target_id
-                """
-
-                target_df = self.gds.run_cypher(
-                    target_query, params={"target_name": target_name}
-                )
-
-                if not target_df.empty:
-                    target_node_ids.append(int(target_df["target_id"].iloc[0]))
+        target_node_ids = [
+            node_ids[name] for name in target_nodes if node_ids[name] is not None
+        ]
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # Prepare parameters for the BFS algorithm, excluding our internal parameters
             params = {
                 k: v
@@ -832,6 +802,11 @@ class BreadthFirstSearchHandler(AlgorithmHandler):
 
             logger.info(f"Breadth First Search parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.bfs, G, sourceNode=source_node_id, **params
+                )
+
             # Run the breadth first search algorithm
             bfs_data = self.gds.bfs.stream(G, sourceNode=source_node_id, **params)
 
@@ -841,28 +816,7 @@ class BreadthFirstSearchHandler(AlgorithmHandler):
                     "message": "No nodes visited in breadth first search",
                 }
 
-            # Convert to native Python types as needed
-            traversals = []
-
-            for _, row in bfs_data.iterrows():
-                source_node = int(row["sourceNode"])
-                node_ids = row["nodeIds"]
-
-                # Convert node_ids to list if it's not already
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                traversals.append(
-                    {
-                        "sourceNode": source_node,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "visitedNodes": len(node_ids),
-                    }
-                )
+            traversals = build_path_records(self.gds, bfs_data, TRAVERSAL_FIELDS)
 
             return {
                 "found": True,
@@ -882,40 +836,21 @@ class DepthFirstSearchHandler(AlgorithmHandler):
     def depth_first_search(
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
-        # Find source node ID
-        source_query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
-
-        source_df = self.gds.run_cypher(
-            source_query, params={"source_name": source_node}
+        # Find the source node ID, and the target node IDs if provided, in one lookup
+        target_nodes = kwargs.get("targetNodes") or []
+        node_ids = resolve_node_names(
+            self.gds, node_identifier_property, [source_node, *target_nodes]
         )
+        source_node_id = node_ids[source_node]
 
-        if source_df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(source_df["source_id"].iloc[0])
-
-        # Process target nodes if provided
-        target_node_ids = []
-        if "targetNodes" in kwargs and kwargs["targetNodes"]:
-            for target_name in kwargs["targetNodes"]:
-                target_query = f"""
-                MATCH (target)
-                WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-                RETURN id(target) as target_id
-                """
-
-                target_df = self.gds.run_cypher(
-                    target_query, params={"target_name": target_name}
-                )
-
-                if not target_df.empty:
-                    target_node_ids.append(int(target_df["target_id"].iloc[0]))
+        target_node_ids = [
+            node_ids[name] for name in target_nodes if node_ids[name] is not None
+        ]
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # Prepare parameters for the DFS algorithm, excluding our internal parameters
             params = {
                 k: v
@@ -929,6 +864,11 @@ class DepthFirstSearchHandler(AlgorithmHandler):
 
             logger.info(f"Depth First Search parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.dfs, G, sourceNode=source_node_id, **params
+                )
+
             # Run the depth first search algorithm
             dfs_data = self.gds.dfs.stream(G, sourceNode=source_node_id, **params)
 
@@ -938,28 +878,7 @@ class DepthFirstSearchHandler(AlgorithmHandler):
                     "message": "No nodes visited in depth first search",
                 }
 
-            # Convert to native Python types as needed
-            traversals = []
-
-            for _, row in dfs_data.iterrows():
-                source_node = int(row["sourceNode"])
-                node_ids = row["nodeIds"]
-
-                # Convert node_ids to list if it's not already
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                traversals.append(
-                    {
-                        "sourceNode": source_node,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "visitedNodes": len(node_ids),
-                    }
-                )
+            traversals = build_path_records(self.gds, dfs_data, TRAVERSAL_FIELDS)
 
             return {
                 "found": True,
@@ -980,22 +899,12 @@ class BellmanFordSingleSourceShortestPathHandler(AlgorithmHandler):
         self, source_node: str, node_identifier_property: str, **kwargs
     ):
         # Find source node ID
-        source_query = f"""
-        MATCH (source)
-        WHERE toLower(source.{node_identifier_property}) CONTAINS toLower($source_name)
-        RETURN id(source) as source_id
-        """
+        source_node_id = find_node_id(self.gds, node_identifier_property, source_node)
 
-        source_df = self.gds.run_cypher(
-            source_query, params={"source_name": source_node}
-        )
-
-        if source_df.empty:
+        if source_node_id is None:
             return {"found": False, "message": "Source node name not found"}
 
-        source_node_id = int(source_df["source_id"].iloc[0])
-
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # Prepare parameters for the Bellman-Ford algorithm, excluding our internal parameters
             params = {
                 k: v
@@ -1006,6 +915,11 @@ class BellmanFordSingleSourceShortestPathHandler(AlgorithmHandler):
                 f"Bellman-Ford Single-Source Shortest Path parameters: {params}"
             )
 
+            if self.mode != "stream":
+                return self.run_in_mode(
+                    self.gds.bellmanFord, G, sourceNode=source_node_id, **params
+                )
+
             # Run the Bellman-Ford algorithm
             bellman_ford_data = self.gds.bellmanFord.stream(
                 G, sourceNode=source_node_id, **params
@@ -1017,39 +931,9 @@ class BellmanFordSingleSourceShortestPathHandler(AlgorithmHandler):
                     "message": "No paths found from the source node",
                 }
 
-            # Convert to native Python types as needed
-            paths = []
-
-            for _, row in bellman_ford_data.iterrows():
-                index = int(row["index"])
-                source_node = int(row["sourceNode"])
-                target_node = int(row["targetNode"])
-                total_cost = float(row["totalCost"])
-                node_ids = row["nodeIds"]
-                costs = row["costs"]
-                is_negative_cycle = bool(row["isNegativeCycle"])
-
-                # Convert arrays to lists if needed
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-                if hasattr(costs, "tolist"):
-                    costs = costs.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                paths.append(
-                    {
-                        "index": index,
-                        "sourceNode": source_node,
-                        "targetNode": target_node,
-                        "totalCost": total_cost,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "costs": costs,
-                        "isNegativeCycle": is_negative_cycle,
-                    }
-                )
+            paths = build_path_records(
+                self.gds, bellman_ford_data, BELLMAN_FORD_PATH_FIELDS
+            )
 
             return {
                 "found": True,
@@ -1076,19 +960,16 @@ class LongestPathHandler(AlgorithmHandler):
                     "message": "nodeIdentifierProperty is required when targetNodes are provided",
                 }
 
-            for target_name in kwargs["targetNodes"]:
-                target_query = f"""
-                MATCH (target)
-                WHERE toLower(target.{node_identifier_property}) CONTAINS toLower($target_name)
-                RETURN id(target) as target_id
-                """
-                target_df = self.gds.run_cypher(
-                    target_query, params={"target_name": target_name}
-                )
-                if not target_df.empty:
-                    target_node_ids.append(int(target_df["target_id"].iloc[0]))
+            node_ids = resolve_node_names(
+                self.gds, node_identifier_property, kwargs["targetNodes"]
+            )
+            target_node_ids = [
+                node_ids[name]
+                for name in kwargs["targetNodes"]
+                if node_ids[name] is not None
+            ]
 
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             # Prepare parameters for the longest path algorithm, excluding our internal parameters
             params = {
                 k: v
@@ -1097,6 +978,9 @@ class LongestPathHandler(AlgorithmHandler):
             }
             logger.info(f"Longest Path parameters: {params}")
 
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.dag.longestPath, G, **params)
+
             # Run the longest path algorithm
             longest_path_data = self.gds.dag.longestPath.stream(G, **params)
 
@@ -1106,41 +990,12 @@ class LongestPathHandler(AlgorithmHandler):
                     "message": "No longest paths found. The graph may contain cycles or be empty.",
                 }
 
-            # Convert to native Python types as needed
-            paths = []
-
-            for _, row in longest_path_data.iterrows():
-                index = int(row["index"])
-                source_node = int(row["sourceNode"])
-                target_node = int(row["targetNode"])
-                total_cost = float(row["totalCost"])
-                node_ids = row["nodeIds"]
-                costs = row["costs"]
-
-                # Filter by target nodes if specified
-                if target_node_ids and target_node not in target_node_ids:
-                    continue
-
-                # Convert arrays to lists if needed
-                if hasattr(node_ids, "tolist"):
-                    node_ids = node_ids.tolist()
-                if hasattr(costs, "tolist"):
-                    costs = costs.tolist()
-
-                # Get node names using GDS utility function
-                node_names = [self.gds.util.asNode(node_id) for node_id in node_ids]
-
-                paths.append(
-                    {
-                        "index": index,
-                        "sourceNode": source_node,
-                        "targetNode": target_node,
-                        "totalCost": total_cost,
-                        "nodeIds": node_ids,
-                        "nodeNames": node_names,
-                        "costs": costs,
-                    }
-                )
+            # Filter by target nodes if specified
+            if target_node_ids:
+                longest_path_data = longest_path_data[
+                    longest_path_data["targetNode"].isin(target_node_ids)
+                ]
+            paths = build_path_records(self.gds, longest_path_data, LONGEST_PATH_FIELDS)
 
             return {
                 "found": True,
@@ -289,7 +289,44 @@ path_tool_definitions = [
                 "relationshipWeightProperty": {
                     "type": "string",
                     "description": "Name of the relationship property to use as weights. If unspecified, the algorithm runs unweighted.",
-                }
+                },
+                "outputFormat": {
+                    "type": "string",
+                    "enum": ["paths", "dense", "sparse"],
+                    "description": "'paths' (default) returns a record with node names per pair of nodes. "
+                    "'dense' returns a float32 distance matrix with a row per source and a column per target node id, Infinity for unreachable pairs; "
+                    "use rowOffset and rowLimit to fetch it in blocks of rows, and limit and the returned cursor to page through a block. "
+                    "'sparse' returns one row per reachable pair with the source and target node ids and the distance.",
+                },
+                "sourceNodes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return distances from these nodes, identified by nodeIdentifierProperty.",
+                },
+                "targetNodes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return distances to these nodes, identified by nodeIdentifierProperty.",
+                },
+                "maxDistance": {
+                    "type": "number",
+                    "description": "Only return pairs whose distance is at most this value.",
+                },
+                "rowOffset": {
+                    "type": "integer",
+                    "description": "Skip this many source nodes, in node id order (default 0). "
+                    "With rowLimit, returns one block of rows of the result; only the pairs of that block are transferred from the database.",
+                },
+                "rowLimit": {
+                    "type": "integer",
+                    "description": "Only return distances from at most this many source nodes, in node id order, starting at rowOffset.",
+                },
+                "nodeIdentifierProperty": {
+                    "type": "string",
+                    "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). "
+                    "Required with sourceNodes or targetNodes; in the 'dense' and 'sparse' formats it also adds node names to the result. "
+                    "Use get_node_properties_keys to find available properties.",
+                },
             },
             "required": [],
         },
@@ -315,6 +352,10 @@ path_tool_definitions = [
                     "items": {"type": "string"},
                     "description": "The list of nodes from which to do a random walk.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). Use get_node_properties_keys to find available properties.",
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from graphdatascience import GraphDataScience
+
+from .node_translator import resolve_nodes
+
+# Field kinds for build_path_records:
+#   int, float, bool  scalar column converted to the Python type
+#   list              array column (e.g. nodeIds, costs) converted to a list
+#   node              node id column resolved to its node
+#   nodes             node ids column resolved to a list of nodes
+#   length            number of elements of an array column
+#   raw               column value as is (e.g. path)
+_SCALAR_TYPES = {"int": np.int64, "float": np.float64, "bool": bool}
+_ARRAY_KINDS = {"list", "nodes", "length"}
+
+
+def build_path_records(gds: GraphDataScience, data: pd.DataFrame, fields):
+    """
+    Build one record per row of a path algorithm result.
+
+    Array columns are flattened once and the nodes of all distinct ids in the result
+    are resolved in one batched lookup, instead of one `gds.util.asNode` call per node.
+
+    Args:
+        data: The result of the algorithm's stream mode.
+        fields: (output key, column, kind) triples in output order, see the kinds above.
+
+    Returns:
+        A list of records, one per row of `data`.
+    """
+    array_columns = {column for _, column, kind in fields if kind in _ARRAY_KINDS}
+    arrays = {column: _flatten(data[column]) for column in array_columns}
+
+    node_ids = [arrays[column][0] for _, column, kind in fields if kind == "nodes"]
+    node_ids += [
+        data[column].to_numpy(dtype=np.int64)
+        for _, column, kind in fields
+        if kind == "node"
+    ]
+    nodes = (
+        resolve_nodes(gds, np.concatenate(node_ids))
+        if node_ids
+        else pd.Series(dtype=object)
+    )
+
+    columns = []
+    for _, column, kind in fields:
+        if kind in _SCALAR_TYPES:
+            values = data[column].to_numpy(dtype=_SCALAR_TYPES[kind]).tolist()
+        elif kind == "node":
+            values = nodes.loc[data[column].to_numpy(dtype=np.int64)].tolist()
+        elif kind == "list":
+            flat, offsets = arrays[column]
+            values = _split(flat.tolist(), offsets)
+        elif kind == "nodes":
+            flat, offsets = arrays[column]
+            values = _split(nodes.loc[flat].tolist(), offsets)
+        elif kind == "length":
+            values = np.diff(arrays[column][1]).tolist()
+        elif kind == "raw":
+            values = data[column].tolist()
+        else:
+            raise ValueError(f"Unknown path result field kind '{kind}'")
+        columns.append(values)
+
+    keys = [key for key, _, _ in fields]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def _flatten(column: pd.Series):
+    """Concatenate the arrays of a column, returning the values and row offsets."""
+    lengths = np.fromiter(
+        (len(value) for value in column), dtype=np.int64, count=len(column)
+    )
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.array([], dtype=np.int64), offsets
+    return np.concatenate([np.asarray(value) for value in column]), offsets
+
+
+def _split(values, offsets):
+    bounds = offsets.tolist()
+    return [values[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
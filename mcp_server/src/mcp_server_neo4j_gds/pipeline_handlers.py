@@ -0,0 +1,208 @@
+import logging
+from functools import reduce
+from typing import Dict, Any
+
+from .algorithm_handler import AlgorithmHandler
+from .centrality_algorithm_specs import centrality_tool_definitions
+from .community_algorithm_specs import community_tool_definitions
+from .community_summary import SUMMARY_ARGUMENTS
+from .gds import projected_graph
+from .node_translator import (
+    translate_ids_to_identifiers,
+    translate_identifiers_to_ids,
+)
+from .shared_specs import ranking_properties
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Registry tool name -> (GDS endpoint, supports mutate mode, requires undirected graph)
+PIPELINE_ALGORITHMS = {
+    # Centrality algorithms
+    "article_rank": ("articleRank", True, False),
+    "articulation_points": ("articulationPoints", True, True),
+    "betweenness_centrality": ("betweenness", True, False),
+    "CELF": ("influenceMaximization.celf", True, False),
+    "closeness_centrality": ("closeness", True, False),
+    "degree_centrality": ("degree", True, False),
+    "eigenvector_centrality": ("eigenvector", True, False),
+    "pagerank": ("pageRank", True, False),
+    "harmonic_centrality": ("closeness.harmonic", True, False),
+    "HITS": ("hits", True, False),
+    # Community algorithms
+    "conductance": ("conductance", False, False),
+    "hdbscan": ("hdbscan", True, False),
+    "k_core_decomposition": ("kcore", True, True),
+    "k_1_coloring": ("k1coloring", True, False),
+    "k_means_clustering": ("kmeans", True, False),
+    "label_propagation": ("labelPropagation", True, False),
+    "leiden": ("leiden", True, True),
+    "local_clustering_coefficient": ("localClusteringCoefficient", True, True),
+    "louvain": ("louvain", True, False),
+    "modularity_metric": ("modularity", False, False),
+    "modularity_optimization": ("modularityOptimization", True, False),
+    "strongly_connected_components": ("scc", True, False),
+    "triangle_count": ("triangleCount", True, True),
+    "weakly_connected_components": ("wcc", True, False),
+    "approximate_maximum_k_cut": ("maxkcut", True, False),
+    "speaker_listener_label_propagation": ("sllpa", True, False),
+}
+
+# Parameters each algorithm's tool accepts, by lowercased tool name
+_TOOL_PARAMETERS = {
+    tool.name.lower(): set(tool.inputSchema.get("properties", {}))
+    for tool in centrality_tool_definitions + community_tool_definitions
+}
+# Tool arguments that shape the response of a tool rather than configure the
+# algorithm, which a pipeline step has no use for
+_RESPONSE_ARGUMENTS = ["nodes", *ranking_properties, *SUMMARY_ARGUMENTS]
+# Tool arguments holding node names that the tools translate to node ids
+_NODE_NAME_ARGUMENTS = ["sourceNodes"]
+# Algorithms whose tools run single-threaded when given a randomSeed, as GDS requires
+_SEEDED_SINGLE_THREADED = ["k_means_clustering", "approximate_maximum_k_cut"]
+
+
+class RunPipelineHandler(AlgorithmHandler):
+    """
+    Runs several algorithms on one projection.
+
+    Steps with a mutateProperty write their result into the projection so that
+    later steps can read it, e.g. conductance on a community computed by Louvain.
+    The projection is private to the pipeline and dropped afterwards.
+    """
+
+    def run_pipeline(self, steps, nodeIdentifierProperty=None):
+        steps = [self._validate_step(index, step) for index, step in enumerate(steps)]
+        if not steps:
+            raise ValueError("A pipeline needs at least one step.")
+        undirected = self._orientation(steps)
+        for step in steps:
+            for argument in _NODE_NAME_ARGUMENTS:
+                translate_identifiers_to_ids(
+                    self.gds,
+                    step["parameters"].pop(argument, None),
+                    argument,
+                    nodeIdentifierProperty,
+                    step["parameters"],
+                )
+
+        results = {}
+        with projected_graph(
+            self.gds,
+            undirected=undirected,
+            cached=False,
+            projection_filter=self.projection_filter,
+        ) as G:
+            for step in steps:
+                result = self._run_step(G, step)
+                if result is not None:
+                    results[step["name"]] = result
+
+        for result in results.values():
+            # Results such as conductance are per community rather than per node
+            if "nodeId" in result.columns:
+                translate_ids_to_identifiers(self.gds, nodeIdentifierProperty, result)
+
+        if len(results) == 1:
+            return next(iter(results.values()))
+        return {name: result.to_dict("records") for name, result in results.items()}
+
+    @staticmethod
+    def _orientation(steps):
+        """
+        Whether the steps run on an undirected projection. All steps share one
+        projection, so a directed step such as pagerank cannot follow or precede
+        a step that needs an undirected graph such as leiden.
+        """
+        undirected = [
+            step["name"] for step in steps if PIPELINE_ALGORITHMS[step["algorithm"]][2]
+        ]
+        if undirected and len(undirected) < len(steps):
+            directed = [
+                step["name"] for step in steps if step["name"] not in undirected
+            ]
+            raise ValueError(
+                f"Steps {undirected} need an undirected graph and steps {directed} a "
+                "directed one. They cannot share a projection, run them in separate pipelines."
+            )
+        return bool(undirected)
+
+    def _validate_step(self, index, step):
+        algorithm = step.get("algorithm")
+        if algorithm not in PIPELINE_ALGORITHMS:
+            raise ValueError(
+                f"Step {index}: '{algorithm}' cannot be used in a pipeline. "
+                f"Supported algorithms: {sorted(PIPELINE_ALGORITHMS)}"
+            )
+        _, supports_mutate, _ = PIPELINE_ALGORITHMS[algorithm]
+        mutate_property = step.get("mutateProperty")
+        if mutate_property is not None and not supports_mutate:
+            raise ValueError(
+                f"Step {index}: '{algorithm}' has no mutate mode, remove mutateProperty."
+            )
+        stream = step.get("stream", mutate_property is None)
+        if not stream and mutate_property is None:
+            raise ValueError(
+                f"Step {index}: '{algorithm}' needs a mutateProperty or stream=true."
+            )
+        return {
+            "algorithm": algorithm,
+            "name": step.get("name") or f"{index}_{algorithm}",
+            "parameters": self._step_parameters(index, algorithm, step),
+            "mutateProperty": mutate_property,
+            "stream": stream,
+        }
+
+    @staticmethod
+    def _step_parameters(index, algorithm, step):
+        """
+        The parameters of a step as its tool takes them, checked before anything runs.
+        nodeIdentifierProperty is taken from the pipeline.
+        """
+        parameters = {
+            k: v
+            for k, v in (step.get("parameters") or {}).items()
+            if v is not None and k not in ["nodeIdentifierProperty"]
+        }
+        response_arguments = [k for k in parameters if k in _RESPONSE_ARGUMENTS]
+        if response_arguments:
+            raise ValueError(
+                f"Step {index}: {response_arguments} select what the '{algorithm}' tool "
+                "returns and cannot be used in a pipeline step."
+            )
+        accepted = _TOOL_PARAMETERS[algorithm.lower()] - {
+            "nodeIdentifierProperty",
+            *_RESPONSE_ARGUMENTS,
+        }
+        unknown = sorted(set(parameters) - accepted)
+        if unknown:
+            raise ValueError(
+                f"Step {index}: '{algorithm}' has no parameters {unknown}. "
+                f"Its parameters are {sorted(accepted)}."
+            )
+        if (
+            algorithm in _SEEDED_SINGLE_THREADED
+            and parameters.get("randomSeed") is not None
+        ):
+            parameters["concurrency"] = 1
+        return parameters
+
+    def _run_step(self, G, step):
+        endpoint_name = PIPELINE_ALGORITHMS[step["algorithm"]][0]
+        endpoint = reduce(getattr, endpoint_name.split("."), self.gds)
+        params = step["parameters"]
+        mutate_property = step["mutateProperty"]
+        logger.info(f"Pipeline step '{step['name']}' parameters: {params}")
+
+        if mutate_property is None:
+            return endpoint.stream(G, **params)
+
+        endpoint.mutate(G, mutateProperty=mutate_property, **params)
+        if step["stream"]:
+            return self.gds.graph.nodeProperty.stream(G, mutate_property)
+        return None
+
+    def execute(self, arguments: Dict[str, Any]) -> Any:
+        return self.run_pipeline(
+            steps=arguments.get("steps") or [],
+            nodeIdentifierProperty=arguments.get("nodeIdentifierProperty"),
+        )
@@ -0,0 +1,60 @@
+from mcp import types
+
+from .pipeline_handlers import PIPELINE_ALGORITHMS
+
+pipeline_tool_definitions = [
+    types.Tool(
+        name="run_pipeline",
+        description="Run a sequence of centrality and community algorithms on a single graph projection. "
+        "Steps run in order. A step with a mutateProperty stores its result (e.g. the community or score of each node) "
+        "in the projection under that name, so that later steps can use it as a parameter, "
+        "e.g. louvain with mutateProperty 'community' followed by conductance with communityProperty 'community'. "
+        "Only the results of steps with stream=true are returned; this is the default for steps without a mutateProperty. "
+        "Steps that require an undirected graph (e.g. leiden, triangle_count, k_core_decomposition) cannot be combined with steps on a directed graph in one pipeline.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "description": "The algorithms to run, in order.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "algorithm": {
+                                "type": "string",
+                                "enum": sorted(PIPELINE_ALGORITHMS),
+                                "description": "Name of the algorithm tool to run.",
+                            },
+                            "parameters": {
+                                "type": "object",
+                                "description": "Parameters of the algorithm, as accepted by its tool, except the arguments that select what the tool returns "
+                                "(nodes, topK, bottomK, outputFormat, summaryTopN, summarySampleSize). "
+                                "Node names in sourceNodes are resolved with the nodeIdentifierProperty of the pipeline.",
+                            },
+                            "mutateProperty": {
+                                "type": "string",
+                                "description": "Store the result of this step in the projection under this node property.",
+                            },
+                            "stream": {
+                                "type": "boolean",
+                                "description": "Return the result of this step. "
+                                "Defaults to true for steps without a mutateProperty and false otherwise.",
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Name of this step in the returned results.",
+                            },
+                        },
+                        "required": ["algorithm"],
+                    },
+                },
+                "nodeIdentifierProperty": {
+                    "type": "string",
+                    "description": "Property name to use for identifying nodes in the returned results (e.g., 'name', 'Name', 'title'). "
+                    "Use get_node_properties_keys to find available properties.",
+                },
+            },
+            "required": ["steps"],
+        },
+    ),
+]
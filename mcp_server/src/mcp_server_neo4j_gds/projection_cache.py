@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .tool_progress import ToolCancelled
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+
+class _CacheEntry:
+    def __init__(self, gds, graph, size_in_bytes):
+        self.gds = gds
+        self.graph = graph
+        self.size_in_bytes = size_in_bytes
+        self.last_used = time.monotonic()
+        self.users = 0
+
+
+class ProjectionCache:
+    """
+    Keeps projected graphs alive in the GDS graph catalog across tool calls.
+
+    Entries are keyed by whatever describes the projection (database, orientation,
+    projected properties and a fingerprint of the database contents). Projections
+    that are not in use are evicted least-recently-used first whenever the cache
+    holds more than `max_entries` graphs or more than `memory_budget_bytes` of
+    graph memory, and as soon as they have been idle for longer than `idle_ttl`
+    seconds. A projection made by a tool call that is then cancelled is not kept.
+    """
+
+    def __init__(self, max_entries=4, idle_ttl=600.0, memory_budget_bytes=None):
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @contextmanager
+    def graph(self, gds, key, project):
+        """
+        Yield the cached projection for `key`, calling `project()` to create it on a miss.
+
+        Args:
+            gds: GraphDataScience instance
+            key: Hashable description of the projection
+            project: Callable returning a newly projected Graph object
+        """
+        created = False
+        with self._lock_for(key):
+            entry = self._lookup(key)
+            if entry is None:
+                graph = project()
+                entry = _CacheEntry(gds, graph, _graph_size_in_bytes(graph))
+                logger.info(
+                    f"Caching projection '{graph.name()}' ({entry.size_in_bytes} bytes)"
+                )
+                with self._lock:
+                    entry = self._entries.setdefault(key, entry)
+                    created = entry.graph is graph
+                    duplicate = [] if created else [_CacheEntry(gds, graph, 0)]
+                self._drop(duplicate)
+            else:
+                logger.info(f"Reusing cached projection '{entry.graph.name()}'")
+            with self._lock:
+                entry.users += 1
+
+        cancelled = False
+        try:
+            yield entry.graph
+        except ToolCancelled:
+            cancelled = True
+            raise
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+                evicted = self._collect_evictions()
+                if (
+                    cancelled
+                    and created
+                    and entry.users == 0
+                    and self._entries.get(key) is entry
+                ):
+                    evicted.append(self._entries.pop(key))
+                    self._key_locks.pop(key, None)
+            self._drop(evicted)
+
+    def clear(self):
+        """Drop every cached projection, regardless of whether it is in use."""
+        with self._lock:
+            evicted = list(self._entries.values())
+            self._entries.clear()
+        self._drop(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @contextmanager
+    def _lock_for(self, key):
+        # Serialize projection per key so concurrent misses only project once,
+        # while projections for different keys can still proceed in parallel.
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+    def _lookup(self, key):
+        with self._lock:
+            evicted = self._collect_evictions()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._drop(evicted)
+
+        if entry is not None and not entry.graph.exists():
+            logger.info(
+                f"Cached projection '{entry.graph.name()}' no longer exists in the catalog"
+            )
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return entry
+
+    def _collect_evictions(self):
+        # Must be called while holding self._lock.
+        now = time.monotonic()
+        evicted = []
+        for key, entry in list(self._entries.items()):
+            if entry.users == 0 and now - entry.last_used > self.idle_ttl:
+                evicted.append(self._entries.pop(key))
+                self._key_locks.pop(key, None)
+
+        for key, entry in list(self._entries.items()):
+            if not self._over_capacity():
+                break
+            if entry.users == 0:
+                evicted.append(self._entries.pop(key))
+                self._key_locks.pop(key, None)
+        return evicted
+
+    def _over_capacity(self):
+        if len(self._entries) > self.max_entries:
+            return True
+        if self.memory_budget_bytes is None:
+            return False
+        total = sum(entry.size_in_bytes for entry in self._entries.values())
+        return total > self.memory_budget_bytes
+
+    @staticmethod
+    def _drop(entries):
+        for entry in entries:
+            logger.info(f"Evicting cached projection '{entry.graph.name()}'")
+            try:
+                entry.gds.graph.drop(entry.graph)
+            except Exception as e:
+                logger.warning(f"Failed to drop projection '{entry.graph.name()}': {e}")
+
+
+def _graph_size_in_bytes(graph):
+    try:
+        return max(int(graph.size_in_bytes()), 0)
+    except Exception as e:
+        logger.warning(f"Could not determine size of '{graph.name()}': {e}")
+        return 0
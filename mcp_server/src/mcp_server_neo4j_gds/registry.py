@@ -1,6 +1,7 @@
-from typing import Dict, Type
+from typing import Any, Dict, Type
 from graphdatascience import GraphDataScience
 from .algorithm_handler import AlgorithmHandler
+from .gds import ProjectionFilter
 from .centrality_algorithm_handlers import (
     PageRankHandler,
     ArticleRankHandler,
@@ -36,6 +37,7 @@ from .similarity_algorithm_handlers import (
     NodeSimilarityHandler,
     KNearestNeighborsHandler,
 )
+from .pipeline_handlers import RunPipelineHandler
 from .path_algorithm_handlers import (
     DijkstraShortestPathHandler,
     DeltaSteppingShortestPathHandler,
@@ -103,11 +105,20 @@ class AlgorithmRegistry:
         "depth_first_search": DepthFirstSearchHandler,
         "bellman_ford_single_source_shortest_path": BellmanFordSingleSourceShortestPathHandler,
         "longest_path": LongestPathHandler,
+        # Pipelines
+        "run_pipeline": RunPipelineHandler,
     }
 
     @classmethod
-    def get_handler(cls, name: str, gds: GraphDataScience) -> AlgorithmHandler:
+    def get_handler(
+        cls,
+        name: str,
+        gds: GraphDataScience,
+        projection_filter: ProjectionFilter = None,
+        mode: str = "stream",
+        mode_config: Dict[str, Any] = None,
+    ) -> AlgorithmHandler:
         handler_class = cls._handlers.get(name)
         if handler_class is None:
             raise ValueError(f"Unknown tool: {name}.")
-        return handler_class(gds)
+        return handler_class(gds, projection_filter, mode, mode_config)
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from .gds import get_graph_fingerprint
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Tools whose results vary between runs, and the argument that fixes their random seed
+# (None if they have none). Their results are only cached when a seed is given.
+RANDOMIZED_TOOLS = {
+    "CELF": "randomSeed",
+    "approximate_maximum_k_cut": "randomSeed",
+    "k_means_clustering": "randomSeed",
+    "k_nearest_neighbors": "randomSeed",
+    "leiden": "randomSeed",
+    "random_walk": "randomSeed",
+    "speaker_listener_label_propagation": None,
+}
+# Tools that are randomized only when sampling, with the argument that enables it
+SAMPLING_TOOLS = {"betweenness_centrality": "samplingSize"}
+
+# Suffixes of the files of the on-disk tier: DataFrames as Arrow IPC files, other
+# results as JSON. Nothing is unpickled, so the files cannot run code when loaded.
+_ARROW_SUFFIX = ".arrow"
+_JSON_SUFFIX = ".json"
+
+
+class ResultCache:
+    """
+    Memoizes tool results by tool name, arguments and database state.
+
+    A result is reused as long as the graph fingerprint (labels, relationship types,
+    property keys, counts and the last committed transaction of the database) is
+    unchanged. Results are kept in memory up to `max_bytes`, least-recently-used first.
+    With a `directory`, results evicted from memory, or too large for it, are written to
+    disk up to `max_disk_bytes` and loaded from there on a later hit, also after a restart.
+    DataFrames are stored as Arrow and other results as JSON; results that would not
+    read back unchanged, e.g. DataFrames of lists, are only kept in memory.
+    """
+
+    def __init__(self, max_bytes, directory=None, max_disk_bytes=None):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheable(name, arguments):
+        """
+        Whether a call of tool `name` with `arguments` returns the same result every
+        time, so that it can be cached. Randomized algorithms need a random seed.
+        """
+        if name == "run_pipeline":
+            return all(
+                ResultCache.cacheable(
+                    step.get("algorithm"), step.get("parameters") or {}
+                )
+                for step in arguments.get("steps") or []
+            )
+        if name in RANDOMIZED_TOOLS:
+            seed = RANDOMIZED_TOOLS[name]
+            return seed is not None and arguments.get(seed) is not None
+        if name in SAMPLING_TOOLS:
+            return arguments.get(SAMPLING_TOOLS[name]) is None
+        return True
+
+    def key(self, gds, name, arguments):
+        """Cache key of a call of tool `name` with `arguments` in the current database state."""
+        state = {
+            "database": gds.database(),
+            "fingerprint": get_graph_fingerprint(gds),
+        }
+        payload = json.dumps(
+            [name, arguments, state], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        """The cached result for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        result = self._load(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        if result is None:
+            return
+        size_in_bytes = _size_in_bytes(result)
+        if size_in_bytes > self.max_bytes:
+            self._spill([(key, result)])
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size_in_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (result, size_in_bytes)
+            self._size_in_bytes += size_in_bytes
+            evicted = []
+            while self._size_in_bytes > self.max_bytes:
+                evicted_key, (evicted_result, evicted_size) = self._entries.popitem(
+                    last=False
+                )
+                self._size_in_bytes -= evicted_size
+                evicted.append((evicted_key, evicted_result))
+        self._spill(evicted)
+
+    def clear(self):
+        """Forget all results, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+        if self.directory is not None:
+            for path in self._files():
+                path.unlink(missing_ok=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "sizeBytes": self._size_in_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _files(self):
+        return [
+            path
+            for suffix in (_ARROW_SUFFIX, _JSON_SUFFIX)
+            for path in self.directory.glob(f"*{suffix}")
+        ]
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        for suffix, read in ((_ARROW_SUFFIX, _read_arrow), (_JSON_SUFFIX, _read_json)):
+            path = self.directory / f"{key}{suffix}"
+            try:
+                result = read(path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"Could not load cached result {path}: {e}")
+                path.unlink(missing_ok=True)
+                return None
+            path.touch()
+            return result
+        return None
+
+    def _spill(self, entries):
+        if self.directory is None or not entries:
+            return
+        for key, result in entries:
+            if isinstance(result, pd.DataFrame):
+                suffix, contents = _ARROW_SUFFIX, _arrow_bytes(result)
+            else:
+                suffix, contents = _JSON_SUFFIX, _json_bytes(result)
+            if contents is None:
+                logger.debug(f"Result {key} cannot be stored on disk, dropping it")
+                continue
+            path = self.directory / f"{key}{suffix}"
+            temporary = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temporary.write_bytes(contents)
+            temporary.replace(path)
+        self._evict_from_disk()
+
+    def _evict_from_disk(self):
+        if self.max_disk_bytes is None:
+            return
+        files = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path) for path in self._files()
+        )
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _arrow_bytes(result):
+    """
+    `result` as an Arrow IPC file, or None if it would not read back unchanged. The
+    column names are kept as JSON, as Arrow turns them into strings.
+    """
+    try:
+        columns = json.dumps(list(result.columns))
+        with warnings.catch_warnings():
+            # Arrow warns that non-string column names do not round trip
+            warnings.simplefilter("ignore", UserWarning)
+            table = pa.Table.from_pandas(result)
+    except (TypeError, ValueError, pa.ArrowException):
+        return None
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return None
+    table = table.replace_schema_metadata(
+        {**table.schema.metadata, b"gds_agent_columns": columns.encode()}
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _read_arrow(path):
+    with pa.OSFile(str(path), "rb") as source:
+        table = pa.ipc.open_file(source).read_all()
+    result = table.to_pandas()
+    result.columns = json.loads(table.schema.metadata[b"gds_agent_columns"])
+    return result
+
+
+def _json_bytes(result):
+    try:
+        return json.dumps(result).encode()
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_json(path):
+    return json.loads(path.read_bytes())
+
+
+def _size_in_bytes(result):
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    return len(json.dumps(result, default=str))
+
+
+_result_cache = None
+
+
+def configure_result_cache(max_bytes=0, directory=None, max_disk_bytes=None):
+    """
+    Enable memoization of tool results.
+
+    Args:
+        max_bytes: Memory budget of the cache. 0 disables it.
+        directory: Directory of the on-disk tier (optional).
+        max_disk_bytes: Upper bound on the size of the on-disk tier (optional).
+    """
+    global _result_cache
+    _result_cache = (
+        ResultCache(max_bytes, directory, max_disk_bytes) if max_bytes > 0 else None
+    )
+
+
+def get_result_cache():
+    return _result_cache
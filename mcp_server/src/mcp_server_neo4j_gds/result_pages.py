@@ -0,0 +1,143 @@
+import base64
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import pandas as pd
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+PAGINATION_ARGUMENTS = ["offset", "limit", "cursor", "orderBy", "ascending"]
+
+
+def encode_cursor(result_id, offset, limit):
+    payload = json.dumps({"r": result_id, "o": offset, "l": limit})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return payload["r"], int(payload["o"]), payload["l"]
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'.") from None
+
+
+def check_limit(limit):
+    limit = int(limit)
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}.")
+    return limit
+
+
+class ResultPaginator:
+    """
+    Splits large DataFrame results into pages.
+
+    The full result of a paginated call is kept in memory so that follow-up pages,
+    requested with the returned cursor, are served without running the algorithm again.
+    Results are dropped least-recently-used first once more than `max_cached_results`
+    are held, or after `ttl` seconds.
+    """
+
+    def __init__(self, max_rows=10000, max_cached_results=16, ttl=900.0):
+        self.max_rows = max_rows
+        self.max_cached_results = max_cached_results
+        self.ttl = ttl
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def pop_page_request(arguments):
+        """Remove the pagination arguments from the tool arguments and return them."""
+        return {
+            key: arguments.pop(key)
+            for key in PAGINATION_ARGUMENTS
+            if arguments.get(key) is not None
+        }
+
+    def should_paginate(self, result, page_request):
+        if not isinstance(result, pd.DataFrame):
+            return False
+        return bool(page_request) or len(result) > self.max_rows
+
+    def first_page(self, tool_name, result, page_request):
+        """Cache `result` and return its first requested page with pagination metadata."""
+        limit = check_limit(page_request.get("limit", self.max_rows))
+        order_by = page_request.get("orderBy")
+        if order_by is not None:
+            if order_by not in result.columns:
+                raise ValueError(
+                    f"Cannot order by '{order_by}'. Available columns: {list(result.columns)}"
+                )
+            result = result.sort_values(
+                order_by,
+                ascending=bool(page_request.get("ascending", False)),
+                kind="stable",
+            )
+
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict_expired()
+            self._results[result_id] = (tool_name, result, time.monotonic())
+            while len(self._results) > self.max_cached_results:
+                self._results.popitem(last=False)
+
+        return self._page(
+            result_id,
+            result,
+            page_request.get("offset", 0),
+            limit,
+        )
+
+    def next_page(self, tool_name, page_request):
+        """Return a page of a previously cached result identified by the request's cursor."""
+        result_id, offset, limit = decode_cursor(page_request["cursor"])
+        with self._lock:
+            self._evict_expired()
+            cached = self._results.get(result_id)
+            if cached is None:
+                raise ValueError(
+                    "The cursor has expired. Call the tool again without a cursor."
+                )
+            cached_tool_name, result, _ = cached
+            if cached_tool_name != tool_name:
+                raise ValueError(
+                    f"The cursor belongs to '{cached_tool_name}', not '{tool_name}'."
+                )
+            self._results[result_id] = (tool_name, result, time.monotonic())
+            self._results.move_to_end(result_id)
+
+        return self._page(
+            result_id,
+            result,
+            page_request.get("offset", offset),
+            page_request.get("limit", limit),
+        )
+
+    def _page(self, result_id, result, offset, limit):
+        offset = max(int(offset), 0)
+        limit = check_limit(limit)
+        page = result.iloc[offset : offset + limit]
+        next_offset = offset + len(page)
+        metadata = {
+            "totalRows": len(result),
+            "offset": offset,
+            "limit": limit,
+            "returnedRows": len(page),
+            "nextCursor": encode_cursor(result_id, next_offset, limit)
+            if next_offset < len(result)
+            else None,
+        }
+        logger.info(f"Returning page {metadata}")
+        return page, metadata
+
+    def _evict_expired(self):
+        # Must be called while holding self._lock.
+        now = time.monotonic()
+        for result_id, (_, _, last_used) in list(self._results.items()):
+            if now - last_used > self.ttl:
+                del self._results[result_id]
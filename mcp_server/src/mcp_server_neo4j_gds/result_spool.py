@@ -0,0 +1,161 @@
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Result format -> (file suffix, MIME type). "text" is the serialized text response.
+RESULT_FORMATS = {
+    "text": None,
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+_result_spool = None
+_spool_lock = threading.Lock()
+
+
+class ResultSpool:
+    """
+    Writes DataFrame results to Arrow IPC or Parquet files in a spool directory.
+
+    The tool response then only holds the schema, the row count and a preview of the
+    result, plus a `file://` resource URI of the file. Clients on the same machine can
+    memory-map the file, others read it through the MCP resource. The oldest files are
+    deleted once the spooled files take more than `max_bytes`.
+    """
+
+    def __init__(self, directory=None, max_bytes=1024 * 1024 * 1024, preview_rows=10):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="gds-agent-results-")
+            self._owns_directory = True
+        else:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            self._owns_directory = False
+        self.directory = Path(directory).resolve()
+        self.max_bytes = max_bytes
+        self.preview_rows = preview_rows
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def write(self, tool_name, result, result_format):
+        """Write the DataFrame `result` to a new file and return its description."""
+        suffix, mime_type = RESULT_FORMATS[result_format]
+        table = pa.Table.from_pandas(result, preserve_index=False)
+        path = self.directory / f"{tool_name}-{uuid.uuid4().hex[:12]}{suffix}"
+        if result_format == "arrow":
+            with pa.OSFile(str(path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            pq.write_table(table, path)
+
+        size_in_bytes = path.stat().st_size
+        uri = path.as_uri()
+        with self._lock:
+            self._files[uri] = (path, mime_type, size_in_bytes)
+            self._evict(keep=uri)
+        logger.info(
+            f"Spooled {len(result)} rows of {tool_name} to {path} ({size_in_bytes} bytes)"
+        )
+        return {
+            "resultFormat": result_format,
+            "uri": uri,
+            "path": str(path),
+            "mimeType": mime_type,
+            "sizeBytes": size_in_bytes,
+            "rowCount": len(result),
+            "schema": [
+                {"name": field.name, "type": str(field.type)} for field in table.schema
+            ],
+            "preview": json.loads(
+                result.head(self.preview_rows).to_json(orient="records")
+            ),
+        }
+
+    def resources(self):
+        """(uri, file name, MIME type, size in bytes) of every spooled file."""
+        with self._lock:
+            return [
+                (uri, path.name, mime_type, size_in_bytes)
+                for uri, (path, mime_type, size_in_bytes) in self._files.items()
+            ]
+
+    def read(self, uri):
+        """Return the contents and MIME type of a spooled file."""
+        with self._lock:
+            entry = self._files.get(str(uri))
+        if entry is None:
+            raise ValueError(f"Unknown or expired result resource '{uri}'.")
+        path, mime_type, _ = entry
+        return path.read_bytes(), mime_type
+
+    def clear(self):
+        """Delete all spooled files."""
+        with self._lock:
+            for path, *_ in self._files.values():
+                path.unlink(missing_ok=True)
+            self._files.clear()
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _evict(self, keep):
+        total = sum(size for *_, size in self._files.values())
+        for uri in list(self._files):
+            if total <= self.max_bytes:
+                break
+            if uri == keep:
+                continue
+            path, _, size_in_bytes = self._files.pop(uri)
+            path.unlink(missing_ok=True)
+            total -= size_in_bytes
+            logger.info(f"Deleted spooled result {path}")
+
+
+def configure_result_spool(directory=None, max_bytes=1024 * 1024 * 1024):
+    """
+    Configure where Arrow and Parquet results are written.
+
+    Args:
+        directory: Spool directory. Default is a new temporary directory.
+        max_bytes: Upper bound on the total size of the spooled files.
+    """
+    global _result_spool
+    with _spool_lock:
+        if _result_spool is not None:
+            _result_spool.clear()
+        _result_spool = ResultSpool(directory=directory, max_bytes=max_bytes)
+
+
+def get_result_spool():
+    """The configured result spool, created in a temporary directory on first use."""
+    global _result_spool
+    with _spool_lock:
+        if _result_spool is None:
+            _result_spool = ResultSpool()
+        return _result_spool
+
+
+def clear_result_spool():
+    """Delete the spooled files, e.g. when the server shuts down."""
+    with _spool_lock:
+        if _result_spool is not None:
+            _result_spool.clear()
+
+
+def pop_result_format(arguments):
+    """Remove the resultFormat argument from the tool arguments and return it."""
+    result_format = arguments.pop("resultFormat", None) or "text"
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(
+            f"Unknown resultFormat '{result_format}'. Expected one of {list(RESULT_FORMATS)}."
+        )
+    return result_format
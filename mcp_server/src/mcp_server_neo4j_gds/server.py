@@ -1,20 +1,66 @@
 # server.py
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from typing import Any
 import mcp.server.stdio
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 import pandas as pd
 import json
 from graphdatascience import GraphDataScience
+from neo4j import GraphDatabase
 
 from .similarity_algorithm_specs import similarity_tool_definitions
 from .centrality_algorithm_specs import centrality_tool_definitions
 from .community_algorithm_specs import community_tool_definitions
 from .path_algorithm_specs import path_tool_definitions
+from .pipeline_specs import pipeline_tool_definitions
 from .registry import AlgorithmRegistry
-from .gds import count_nodes, get_node_properties_keys, get_relationship_properties_keys
+from .result_pages import ResultPaginator
+from .shared_specs import (
+    mode_properties,
+    pagination_properties,
+    projection_properties,
+    result_format_properties,
+    with_properties,
+)
+from .node_translator import (
+    configure_name_index,
+    configure_translation_batch_size,
+    configure_translation_parallelism,
+)
+from .algorithm_modes import pop_mode
+from .memory_estimation import configure_memory_guard, get_memory_guard
+from .tool_progress import ToolCall, TrackedGDS, report_progress
+from .result_cache import configure_result_cache, get_result_cache
+from .metrics import (
+    TimedGDS,
+    configure_timings,
+    get_metrics_registry,
+    timings_included,
+    span,
+)
+from .result_spool import (
+    clear_result_spool,
+    configure_result_spool,
+    get_result_spool,
+    pop_result_format,
+)
+from .gds import (
+    clear_projection_cache,
+    clear_schema_cache,
+    configure_projection_cache,
+    configure_projection_mode,
+    count_graph_elements,
+    count_nodes,
+    get_node_properties_keys,
+    get_relationship_properties_keys,
+    projection_filter_from_arguments,
+)
 
 logger = logging.getLogger("mcp_server_neo4j_gds")
 
@@ -42,58 +88,330 @@ def serialize_result(result: Any) -> str:
         return str(result)
 
 
-async def main(db_url: str, username: str, password: str, database: str = None):
+def create_driver(
+    db_url: str,
+    username: str,
+    password: str,
+    max_connection_pool_size: int = None,
+    connection_acquisition_timeout: float = None,
+    max_connection_lifetime: float = None,
+):
+    """
+    Create the Neo4j driver shared by all tool calls.
+
+    Every query opens a session on a connection checked out from the driver's pool,
+    so tool calls running in parallel use separate connections. Options left as None
+    keep the driver defaults.
+    """
+    config = {
+        key: value
+        for key, value in {
+            "max_connection_pool_size": max_connection_pool_size,
+            "connection_acquisition_timeout": connection_acquisition_timeout,
+            "max_connection_lifetime": max_connection_lifetime,
+        }.items()
+        if value is not None
+    }
+    logger.info(f"Creating Neo4j driver with connection pool configuration {config}")
+    return GraphDatabase.driver(db_url, auth=(username, password), **config)
+
+
+def execute_tool(
+    gds: GraphDataScience,
+    name: str,
+    arguments: dict[str, Any],
+    paginator: ResultPaginator = None,
+    tool_call: ToolCall = None,
+) -> list[str | types.ResourceLink]:
+    """
+    Run a tool synchronously and return its serialized result.
+    A result spooled to an Arrow or Parquet file is returned as its description
+    followed by a link to the file. With a `tool_call`, the GDS jobs of the call can be
+    followed and cancelled through it. The time spent in each phase of the call is
+    recorded in the server metrics, and appended to the output if timings are enabled.
+    """
+    with get_metrics_registry().tool_call(name) as timings:
+        output = _execute_tool(gds, name, arguments, paginator, tool_call)
+    if timings_included():
+        output.append(serialize_result({"timings": timings.to_dict()}))
+    return output
+
+
+def _execute_tool(gds, name, arguments, paginator, tool_call):
+    arguments = dict(arguments)
+    page_request = (
+        ResultPaginator.pop_page_request(arguments) if paginator is not None else {}
+    )
+    result_format = pop_result_format(arguments)
+    if result_format != "text" and page_request:
+        raise ValueError(
+            f"Pagination cannot be combined with resultFormat '{result_format}', "
+            "the whole result is written to the file."
+        )
+    if "cursor" in page_request:
+        page, metadata = paginator.next_page(name, page_request)
+        with span("serialization"):
+            return [serialize_result(page), serialize_result(metadata)]
+
+    memory_estimates = []
+    if name == "get_server_metrics":
+        result = get_metrics_registry().snapshot()
+        if get_result_cache() is not None:
+            result["resultCache"] = get_result_cache().stats()
+    elif name == "count_nodes":
+        if arguments.get("includeLabelAndTypeCounts"):
+            result = count_graph_elements(gds)
+        else:
+            result = count_nodes(gds)
+    elif name == "get_node_properties_keys":
+        result = get_node_properties_keys(gds)
+    elif name == "get_relationship_properties_keys":
+        result = get_relationship_properties_keys(gds)
+    else:
+        mode, mode_config = pop_mode(arguments)
+        if mode != "stream" and name == "run_pipeline":
+            raise ValueError(
+                "run_pipeline has no mode, use the mutateProperty of its steps instead."
+            )
+        result_cache = get_result_cache()
+        cache_key = None
+        result = None
+        if (
+            result_cache is not None
+            and mode == "stream"
+            and result_cache.cacheable(name, arguments)
+        ):
+            with span("result_cache"):
+                cache_key = result_cache.key(gds, name, arguments)
+                result = result_cache.get(cache_key)
+        if result is None:
+            with span("handler"):
+                result = run_algorithm(
+                    gds, name, arguments, mode, mode_config, tool_call, memory_estimates
+                )
+            if cache_key is not None:
+                with span("result_cache"):
+                    result_cache.put(cache_key, result)
+        if result_cache is not None and mode != "stream":
+            # Cached results may have been computed from the projections or
+            # database contents this run changed
+            result_cache.clear()
+        if mode == "write":
+            # The written values are not in the cached projections, and the database
+            # may not report a new last committed transaction to tell them apart
+            clear_projection_cache()
+            clear_schema_cache()
+
+    with span("serialization"):
+        return _serialize_output(
+            name, result, result_format, paginator, page_request, memory_estimates
+        )
+
+
+def _serialize_output(
+    name, result, result_format, paginator, page_request, memory_estimates
+):
+    if result_format != "text" and isinstance(result, pd.DataFrame):
+        spooled = get_result_spool().write(name, result, result_format)
+        output = [
+            serialize_result(spooled),
+            types.ResourceLink(
+                type="resource_link",
+                uri=spooled["uri"],
+                name=Path(spooled["path"]).name,
+                mimeType=spooled["mimeType"],
+                size=spooled["sizeBytes"],
+            ),
+        ]
+    elif paginator is not None and paginator.should_paginate(result, page_request):
+        page, metadata = paginator.first_page(name, result, page_request)
+        output = [serialize_result(page), serialize_result(metadata)]
+    else:
+        output = [serialize_result(result)]
+    if memory_estimates:
+        output.append(serialize_result({"memoryEstimates": memory_estimates}))
+    return output
+
+
+def run_algorithm(
+    gds, name, arguments, mode, mode_config, tool_call=None, memory_estimates=None
+):
+    """Run the handler of algorithm tool `name` in `mode` and return its result."""
+    gds = TimedGDS(gds)
+    if tool_call is not None:
+        gds = TrackedGDS(gds, tool_call)
+    memory_guard = get_memory_guard()
+    if memory_guard is not None:
+        gds = memory_guard.admit(
+            gds, memory_estimates if memory_estimates is not None else []
+        )
+    handler = AlgorithmRegistry.get_handler(
+        name, gds, projection_filter_from_arguments(arguments), mode, mode_config
+    )
+    return handler.execute(arguments)
+
+
+def _create_in_memory_gds(db_url, database):
+    try:
+        from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+    except ImportError:
+        raise ValueError(
+            "memory:// URLs use the in-process stand-in for GDS in "
+            "src/mcp_server_neo4j_gds_testing, which is only available in a source checkout."
+        ) from None
+    return create_in_memory_gds(db_url, database)
+
+
+async def main(
+    db_url: str,
+    username: str,
+    password: str,
+    database: str = None,
+    projection_cache_size: int = 4,
+    projection_cache_ttl: float = 600.0,
+    projection_cache_memory_mb: int = None,
+    translation_batch_size: int = 10000,
+    name_index_max_age: float = 300.0,
+    max_concurrent_tools: int = 4,
+    tool_timeout: float = None,
+    tool_timeouts: dict[str, float] = None,
+    max_result_rows: int = 10000,
+    projection_mode: str = "auto",
+    driver_config: dict[str, Any] = None,
+    translation_parallelism: int = 4,
+    memory_budget_mb: int = None,
+    memory_budget_action: str = "refuse",
+    result_spool_dir: str = None,
+    result_spool_max_mb: int = 1024,
+    progress_interval: float = 2.0,
+    result_cache_mb: int = 256,
+    result_cache_dir: str = None,
+    result_cache_disk_mb: int = None,
+    include_timings: bool = False,
+):
     logger.info(f"Starting MCP Server for {db_url} with username {username}")
     if database:
         logger.info(f"Connecting to database: {database}")
 
+    configure_projection_cache(
+        max_entries=projection_cache_size,
+        idle_ttl=projection_cache_ttl,
+        memory_budget_bytes=projection_cache_memory_mb * 1024 * 1024
+        if projection_cache_memory_mb is not None
+        else None,
+    )
+    configure_projection_mode(projection_mode)
+    configure_translation_batch_size(translation_batch_size)
+    configure_translation_parallelism(translation_parallelism)
+    configure_name_index(enabled=name_index_max_age > 0, max_age=name_index_max_age)
+    configure_memory_guard(
+        budget_bytes=memory_budget_mb * 1024 * 1024
+        if memory_budget_mb is not None
+        else None,
+        action=memory_budget_action,
+        queue_timeout=tool_timeout,
+    )
+    configure_result_spool(
+        directory=result_spool_dir,
+        max_bytes=result_spool_max_mb * 1024 * 1024,
+    )
+    configure_result_cache(
+        max_bytes=result_cache_mb * 1024 * 1024,
+        directory=result_cache_dir,
+        max_disk_bytes=result_cache_disk_mb * 1024 * 1024
+        if result_cache_disk_mb is not None
+        else None,
+    )
+
+    configure_timings(include_in_response=include_timings)
+
+    # Tools block on Neo4j, so they run on worker threads to keep the event loop
+    # responsive. The pool size bounds how many tool calls run at the same time.
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrent_tools, thread_name_prefix="gds-tool"
+    )
+    tool_timeouts = tool_timeouts or {}
+    paginator = ResultPaginator(max_rows=max_result_rows)
+
     server = Server("gds-agent")
 
     # Create GraphDataScience object with optional database parameter
+    driver = None
     try:
-        if database:
+        if db_url.startswith("memory://"):
+            gds = _create_in_memory_gds(db_url, database)
+        else:
+            driver_config = driver_config or {}
+            pool_size = driver_config.get("max_connection_pool_size")
+            if pool_size is not None and pool_size < max_concurrent_tools:
+                logger.warning(
+                    f"The connection pool ({pool_size}) is smaller than the number of concurrent tool calls "
+                    f"({max_concurrent_tools}), tool calls will wait for connections"
+                )
+            driver = create_driver(db_url, username, password, **driver_config)
             gds = GraphDataScience(
-                db_url, auth=(username, password), aura_ds=False, database=database
+                driver, auth=(username, password), aura_ds=False, database=database
             )
-        else:
-            gds = GraphDataScience(db_url, auth=(username, password), aura_ds=False)
         logger.info("Successfully connected to Neo4j database")
     except Exception as e:
         logger.error(f"Failed to connect to Neo4j database: {e}")
+        if driver is not None:
+            driver.close()
         raise
 
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
         """List available tools"""
         try:
-            tools = (
-                [
-                    types.Tool(
-                        name="count_nodes",
-                        description="""Count the number of nodes in the graph""",
-                        inputSchema={
-                            "type": "object",
+            tools = [
+                types.Tool(
+                    name="count_nodes",
+                    description="""Count the number of nodes in the graph""",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "includeLabelAndTypeCounts": {
+                                "type": "boolean",
+                                "description": "Also return the number of relationships and the node and relationship counts per label and per relationship type.",
+                            },
                         },
-                    ),
-                    types.Tool(
-                        name="get_node_properties_keys",
-                        description="""Get all node properties keys in the database""",
-                        inputSchema={
-                            "type": "object",
-                        },
-                    ),
-                    types.Tool(
-                        name="get_relationship_properties_keys",
-                        description="""Get all relationship properties keys in the database""",
-                        inputSchema={
-                            "type": "object",
-                        },
-                    ),
-                ]
-                + centrality_tool_definitions
+                    },
+                ),
+                types.Tool(
+                    name="get_server_metrics",
+                    description="""Get the latency of the tool calls since the server started: per tool and per phase (result_cache, schema_discovery, projection, memory_estimation, algorithm, id_translation, serialization and the remaining handler time) the number of calls and the mean, p50, p95, p99 and maximum duration in milliseconds""",
+                    inputSchema={
+                        "type": "object",
+                    },
+                ),
+                types.Tool(
+                    name="get_node_properties_keys",
+                    description="""Get all node properties keys in the database""",
+                    inputSchema={
+                        "type": "object",
+                    },
+                ),
+                types.Tool(
+                    name="get_relationship_properties_keys",
+                    description="""Get all relationship properties keys in the database""",
+                    inputSchema={
+                        "type": "object",
+                    },
+                ),
+            ]
+            algorithm_tools = with_properties(
+                centrality_tool_definitions
                 + community_tool_definitions
                 + path_tool_definitions
-                + similarity_tool_definitions
+                + similarity_tool_definitions,
+                mode_properties,
+            )
+            tools += with_properties(
+                with_properties(
+                    algorithm_tools + pipeline_tool_definitions,
+                    projection_properties,
+                ),
+                {**pagination_properties, **result_format_properties},
             )
             logger.info(f"Returning {len(tools)} tools")
             return tools
@@ -101,29 +419,78 @@ async def main(db_url: str, username: str, password: str, database: str = None):
             logger.error(f"Error in handle_list_tools: {e}")
             raise
 
+    @server.list_resources()
+    async def handle_list_resources() -> list[types.Resource]:
+        """List the results spooled to Arrow and Parquet files"""
+        return [
+            types.Resource(uri=uri, name=name, mimeType=mime_type, size=size)
+            for uri, name, mime_type, size in get_result_spool().resources()
+        ]
+
+    @server.read_resource()
+    async def handle_read_resource(uri) -> list[ReadResourceContents]:
+        """Read a spooled result file"""
+        content, mime_type = get_result_spool().read(uri)
+        return [ReadResourceContents(content=content, mime_type=mime_type)]
+
     @server.call_tool()
     async def handle_call_tool(
         name: str, arguments: dict[str, Any] | None
-    ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    ) -> list[
+        types.TextContent
+        | types.ImageContent
+        | types.EmbeddedResource
+        | types.ResourceLink
+    ]:
         """Handle tool execution requests"""
+        timeout = tool_timeouts.get(name, tool_timeout)
+        context = server.request_context
+        progress_token = context.meta.progressToken if context.meta else None
+        tool_call = ToolCall(name)
+        loop = asyncio.get_running_loop()
         try:
-            if name == "count_nodes":
-                result = count_nodes(gds)
-                return [types.TextContent(type="text", text=serialize_result(result))]
-
-            elif name == "get_node_properties_keys":
-                result = get_node_properties_keys(gds)
-                return [types.TextContent(type="text", text=serialize_result(result))]
+            future = loop.run_in_executor(
+                executor,
+                execute_tool,
+                gds,
+                name,
+                arguments or {},
+                paginator,
+                tool_call,
+            )
+            if progress_token is not None:
 
-            elif name == "get_relationship_properties_keys":
-                result = get_relationship_properties_keys(gds)
-                return [types.TextContent(type="text", text=serialize_result(result))]
+                async def notify(progress, message):
+                    await context.session.send_progress_notification(
+                        progress_token, progress, total=100.0, message=message
+                    )
 
-            else:
-                handler = AlgorithmRegistry.get_handler(name, gds)
-                result = handler.execute(arguments or {})
-                return [types.TextContent(type="text", text=serialize_result(result))]
+                future = report_progress(
+                    future, tool_call, gds, notify, progress_interval
+                )
+            results = await asyncio.wait_for(future, timeout=timeout)
+            return [
+                types.TextContent(type="text", text=result)
+                if isinstance(result, str)
+                else result
+                for result in results
+            ]
 
+        except asyncio.CancelledError:
+            # The client cancelled the request: stop the GDS jobs of the call, whose
+            # projections are dropped as the tool call unwinds
+            logger.info(f"Tool '{name}' was cancelled by the client")
+            loop.run_in_executor(None, tool_call.cancel, gds)
+            raise
+        except TimeoutError:
+            logger.warning(f"Tool '{name}' timed out after {timeout} seconds")
+            loop.run_in_executor(None, tool_call.cancel, gds)
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"Error: Tool '{name}' timed out after {timeout} seconds",
+                )
+            ]
         except Exception as e:
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
@@ -144,12 +511,16 @@ async def main(db_url: str, username: str, password: str, database: str = None):
             )
     finally:
         logger.info("Closing GDS connection as MCP server is shutting down.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        clear_projection_cache()
+        clear_result_spool()
         gds.close()
+        if driver is not None:
+            driver.close()
 
 
 if __name__ == "__main__":
     import sys
-    import asyncio
 
     if len(sys.argv) < 4:
         print(
@@ -0,0 +1,138 @@
+pagination_properties = {
+    "offset": {
+        "type": "integer",
+        "description": "Number of result rows to skip. Only applies to tabular results.",
+    },
+    "limit": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Maximum number of result rows to return. Large results are always paginated; "
+        "the response then contains the total row count and a cursor for the next page.",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Cursor returned by a previous call of the same tool. "
+        "Returns the next page of that result without running the algorithm again; other parameters are ignored.",
+    },
+    "orderBy": {
+        "type": "string",
+        "description": "Column to sort the result rows by before paginating, e.g. 'score'. Combined with limit this returns the top N rows.",
+    },
+    "ascending": {
+        "type": "boolean",
+        "description": "Sort in ascending instead of descending order when orderBy is given. Default is false.",
+    },
+}
+
+result_format_properties = {
+    "resultFormat": {
+        "type": "string",
+        "enum": ["text", "arrow", "parquet"],
+        "description": "'text' (default) returns the rows in the response. "
+        "'arrow' (Arrow IPC file) and 'parquet' write tabular results to a file on the server and return only its schema, "
+        "row count, a preview of the first rows and a resource link to the file. "
+        "Use them for large results that are processed by other tools rather than read. Cannot be combined with pagination.",
+    },
+}
+
+ranking_properties = {
+    "topK": {
+        "type": "integer",
+        "description": "Only return the K nodes with the highest scores, in descending order of score. "
+        "The ranking is done in the database, so only K rows are returned. Combined with nodes, ranks only those nodes.",
+    },
+    "bottomK": {
+        "type": "integer",
+        "description": "Only return the K nodes with the lowest scores, in ascending order of score. Cannot be combined with topK.",
+    },
+}
+
+community_summary_properties = {
+    "outputFormat": {
+        "type": "string",
+        "enum": ["nodes", "summary"],
+        "description": "'nodes' (default) returns the community of every node. "
+        "'summary' returns the number of communities, percentiles and a histogram of the community sizes, "
+        "quality metrics such as modularity where available, and the largest communities with a sample of their members. "
+        "Prefer 'summary' on large graphs, its size does not depend on the number of nodes.",
+    },
+    "summaryTopN": {
+        "type": "integer",
+        "description": "Number of largest communities listed in the summary. Default is 10.",
+    },
+    "summarySampleSize": {
+        "type": "integer",
+        "description": "Number of member nodes listed for each community in the summary. Default is 5.",
+    },
+}
+
+mode_properties = {
+    "mode": {
+        "type": "string",
+        "enum": ["stream", "stats", "write"],
+        "description": "'stream' (default) returns the result for every node or relationship. "
+        "'stats' only returns the summary of the run, e.g. convergence, community counts or modularity, without per-node results. "
+        "'write' writes it to the database in bulk (needs writeProperty or writeRelationshipType). Both return only the summary of the run. "
+        "To store a result in the projection for further algorithms, use the mutateProperty of a run_pipeline step.",
+    },
+    "writeProperty": {
+        "type": "string",
+        "description": "Node or relationship property to write the result to, in write mode.",
+    },
+    "writeRelationshipType": {
+        "type": "string",
+        "description": "Relationship type to write relationship results (paths, similarities) as, in write mode.",
+    },
+    "writeConcurrency": {
+        "type": "integer",
+        "description": "Number of threads GDS uses to write the results, in write mode.",
+    },
+}
+
+
+projection_properties = {
+    "nodeLabels": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only project nodes with one of these labels, e.g. ['Station']. "
+        "Projecting only the relevant subgraph makes the projection and the algorithm faster. Default is all nodes.",
+    },
+    "relationshipTypes": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only project relationships of these types. Default is all relationship types.",
+    },
+    "nodeProperties": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only project these node properties. Properties the algorithm is configured to use are always projected. "
+        "Default is all numeric node properties.",
+    },
+    "relationshipProperties": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only project these relationship properties, e.g. [] when the algorithm is unweighted. "
+        "The relationshipWeightProperty is always projected. Default is all numeric relationship properties.",
+    },
+}
+
+
+def with_properties(tools, properties):
+    """
+    Return copies of `tools` whose input schemas also accept `properties`.
+    A property a tool already defines keeps the tool's definition.
+    """
+    return [
+        tool.model_copy(
+            update={
+                "inputSchema": {
+                    **tool.inputSchema,
+                    "properties": {
+                        **properties,
+                        **tool.inputSchema.get("properties", {}),
+                    },
+                }
+            }
+        )
+        for tool in tools
+    ]
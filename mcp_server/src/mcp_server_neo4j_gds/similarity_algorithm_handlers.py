@@ -13,7 +13,7 @@ logger = logging.getLogger("mcp_server_neo4j_gds")
 
 class NodeSimilarityHandler(AlgorithmHandler):
     def node_similarity(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
@@ -43,6 +43,9 @@ class NodeSimilarityHandler(AlgorithmHandler):
                 params,
             )
             logger.info(f"Node Similarity parameters: {params}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.nodeSimilarity.filtered, G, **params)
+
             node_similarity_result = self.gds.nodeSimilarity.filtered.stream(
                 G, **params
             )
@@ -85,7 +88,7 @@ class NodeSimilarityHandler(AlgorithmHandler):
 
 class KNearestNeighborsHandler(AlgorithmHandler):
     def k_nearest_neighbors(self, **kwargs):
-        with projected_graph(self.gds) as G:
+        with projected_graph(self.gds, projection_filter=self.projection_filter) as G:
             params = {
                 k: v
                 for k, v in kwargs.items()
@@ -116,6 +119,9 @@ class KNearestNeighborsHandler(AlgorithmHandler):
             )
 
             logger.info(f"K-Nearest Neighbors parameters: {kwargs}")
+            if self.mode != "stream":
+                return self.run_in_mode(self.gds.knn.filtered, G, **params)
+
             k_nearest_neighbors_result = self.gds.knn.filtered.stream(G, **params)
 
         # Add node names to the results if nodeIdentifierProperty is provided
@@ -152,4 +158,7 @@ class KNearestNeighborsHandler(AlgorithmHandler):
             similarityCutoff=arguments.get("similarityCutoff"),
             perturbationRate=arguments.get("perturbationRate"),
             seedTargetNodes=arguments.get("seedTargetNodes"),
+            randomSeed=arguments.get("randomSeed"),
+            # GDS only accepts a random seed for single-threaded runs
+            concurrency=1 if arguments.get("randomSeed") is not None else None,
         )
@@ -141,6 +141,10 @@ similarity_tool_definitions = [
                     "type": "boolean",
                     "description": "Enable seeding of target nodes. If seeded, every node picks some of the target nodes initially. This guarantees that for every node we can avoid empty result (when the algorithm did not find for it any similar neighbors from the target set). Can only be used if targetNodeFilter is set.",
                 },
+                "randomSeed": {
+                    "type": "integer",
+                    "description": "A seed for the random number generator, to make the results reproducible; the algorithm then runs single-threaded. Without it, results vary between calls and are not cached.",
+                },
                 "nodeIdentifierProperty": {
                     "type": "string",
                     "description": "Property name to use for identifying nodes (e.g., 'name', 'Name', 'title'). Use get_node_properties_keys to find available properties.",
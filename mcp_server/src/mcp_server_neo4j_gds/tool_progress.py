@@ -0,0 +1,230 @@
+import asyncio
+import inspect
+import logging
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Algorithm modes that run as GDS jobs with a job id
+_JOB_MODES = ["stream", "mutate", "stats", "write"]
+_PROJECTIONS = ["graph.project", "graph.cypher.project"]
+# Algorithms called from Cypher with their configuration in the $config parameter
+_ALGORITHM_CALL = re.compile(
+    r"CALL gds\.([\w.]+)\.(stream|mutate|stats|write)\([^)]*\$config"
+)
+
+
+class ToolCancelled(Exception):
+    """Raised in a tool call that was cancelled by the client or timed out."""
+
+
+class ToolCall:
+    """
+    Progress and cancellation of one running tool call.
+
+    Every GDS algorithm the call runs is given a job id, so that its progress can be read
+    with `gds.listProgress` and its transaction found and terminated when the call is
+    cancelled.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.phase = "starting"
+        self._running_jobs = {}
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise ToolCancelled(f"Tool '{self.name}' was cancelled.")
+
+    @contextmanager
+    def job(self, procedure):
+        """Register a GDS job of this call while the block runs and yield its id."""
+        job_id = f"gds-agent-{uuid.uuid4().hex}"
+        with self._lock:
+            self._running_jobs[job_id] = procedure
+        self.phase = (
+            "projecting graph"
+            if procedure.startswith("graph.")
+            else f"running gds.{procedure}"
+        )
+        try:
+            yield job_id
+        finally:
+            with self._lock:
+                self._running_jobs.pop(job_id, None)
+
+    def progress(self, gds):
+        """
+        Progress of the running GDS job in percent (None if unknown) and a message
+        describing what the call is doing.
+        """
+        with self._lock:
+            jobs = list(self._running_jobs.items())
+        if not jobs:
+            return None, self.phase
+        job_id, procedure = jobs[-1]
+        try:
+            tasks = gds.listProgress(job_id)
+        except Exception as e:
+            logger.debug(f"Could not read the progress of job {job_id}: {e}")
+            return None, self.phase
+        if tasks.empty:
+            return None, self.phase
+        # The first row is the root task of the job
+        task = tasks.iloc[0]
+        return (
+            _percent(task["progress"]),
+            f"gds.{procedure}: {task['taskName']} {task['progress']}",
+        )
+
+    def cancel(self, gds):
+        """Stop the call: no further GDS calls are made and running jobs are terminated."""
+        self._cancelled.set()
+        with self._lock:
+            job_ids = list(self._running_jobs)
+        if job_ids:
+            logger.info(f"Terminating jobs {job_ids} of cancelled tool '{self.name}'")
+            terminate_jobs(gds, job_ids)
+
+
+def terminate_jobs(gds, job_ids):
+    """Terminate the transactions running the GDS jobs with the given ids."""
+    transactions = gds.run_cypher(
+        """
+        SHOW TRANSACTIONS YIELD transactionId, parameters
+        WHERE parameters.config.jobId IN $job_ids
+        RETURN transactionId
+        """,
+        params={"job_ids": job_ids},
+    )
+    transaction_ids = list(transactions["transactionId"])
+    if transaction_ids:
+        gds.run_cypher(
+            "TERMINATE TRANSACTIONS $transaction_ids",
+            params={"transaction_ids": transaction_ids},
+        )
+    return transaction_ids
+
+
+def _percent(progress):
+    # GDS reports progress as e.g. "42.5%", or "n/a" for tasks of unknown volume
+    try:
+        return float(str(progress).rstrip("%"))
+    except ValueError:
+        return None
+
+
+class TrackedGDS:
+    """
+    Wraps a GDS client for one tool call so that its progress can be reported and the
+    call cancelled.
+
+    Algorithm runs and native projections get a job id and are registered with the
+    `ToolCall` while they run, and so do algorithms called from Cypher, e.g. by
+    `stream_top_k`, whose job id is added to the `$config` parameter. Before each
+    projection, algorithm run or Cypher query the call checks whether it was cancelled,
+    and a projection that completes after cancellation is dropped again.
+    """
+
+    def __init__(self, gds, tool_call, path="", root=None):
+        self._gds = gds
+        self._tool_call = tool_call
+        self._path = path
+        self._root = gds if root is None else root
+
+    def __getattr__(self, name):
+        target = getattr(self._gds, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if path in _PROJECTIONS or (
+            name in _JOB_MODES and self._path and not path.startswith("graph.")
+        ):
+            return _TrackedCall(target, path, self._tool_call, self._root)
+        if name == "run_cypher":
+            return self._run_cypher
+        if inspect.isroutine(target):
+            return target
+        return TrackedGDS(target, self._tool_call, path, self._root)
+
+    def __call__(self, *args, **kwargs):
+        return self._gds(*args, **kwargs)
+
+    def _run_cypher(self, query, params=None, **kwargs):
+        self._tool_call.check_cancelled()
+        call = _ALGORITHM_CALL.search(query)
+        if call is None:
+            return self._gds.run_cypher(query, params, **kwargs)
+        procedure = f"{call.group(1)}.{call.group(2)}"
+        with self._tool_call.job(procedure) as job_id:
+            params = {**params, "config": {**params["config"], "jobId": job_id}}
+            try:
+                return self._gds.run_cypher(query, params, **kwargs)
+            except Exception as e:
+                if self._tool_call.cancelled:
+                    raise ToolCancelled(
+                        f"Tool '{self._tool_call.name}' was cancelled."
+                    ) from e
+                raise
+
+
+class _TrackedCall:
+    def __init__(self, target, path, tool_call, root):
+        self._target = target
+        self._path = path
+        self._tool_call = tool_call
+        self._root = root
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __call__(self, *args, **config):
+        self._tool_call.check_cancelled()
+        if self._path == "graph.cypher.project":
+            self._tool_call.phase = "projecting graph"
+            return self._dropped_if_cancelled(self._run(args, config))
+        with self._tool_call.job(self._path) as job_id:
+            result = self._run(args, {**config, "jobId": job_id})
+        if self._path == "graph.project":
+            return self._dropped_if_cancelled(result)
+        return result
+
+    def _run(self, args, config):
+        try:
+            return self._target(*args, **config)
+        except Exception as e:
+            if self._tool_call.cancelled:
+                raise ToolCancelled(
+                    f"Tool '{self._tool_call.name}' was cancelled."
+                ) from e
+            raise
+
+    def _dropped_if_cancelled(self, projection):
+        if self._tool_call.cancelled:
+            G, _ = projection
+            self._root.graph.drop(G)
+            self._tool_call.check_cancelled()
+        return projection
+
+
+async def report_progress(future, tool_call, gds, notify, interval):
+    """
+    Wait for the tool call running in `future`, calling `notify(progress, message)`
+    every `interval` seconds with the progress of its GDS job, out of 100.
+    """
+    reported = 0.0
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=interval)
+        if done:
+            return future.result()
+        progress, message = await asyncio.to_thread(tool_call.progress, gds)
+        # Progress notifications must not go backwards, e.g. when the next job starts
+        reported = max(reported, progress or 0.0)
+        await notify(reported, message)
@@ -0,0 +1,7 @@
+"""
+Test support for mcp_server_neo4j_gds: an in-process stand-in for GDS.
+
+Lives next to the server package in the source tree but is not part of the wheel.
+The server imports it for `memory://` URLs, and the tests and benchmarks use it to run
+without Neo4j.
+"""
@@ -0,0 +1,1330 @@
+"""
+Pure Python implementations of the GDS algorithms used by the tool handlers.
+
+They run on an `InMemoryGraph` and return DataFrames with the same columns as the
+corresponding GDS `.stream` procedures. The implementations favour simplicity over
+fidelity: results have the right shape and are deterministic, but heuristics such as
+community detection or Steiner trees do not reproduce GDS results exactly.
+"""
+
+import heapq
+import math
+import random
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+
+
+def _adjacency(G, weight_property=None, reverse=False):
+    weights = G.relationship_weights(weight_property)
+    adjacency = [[] for _ in range(G.node_count())]
+    sources, targets = (G.targets, G.sources) if reverse else (G.sources, G.targets)
+    for source, target, weight in zip(sources, targets, weights):
+        adjacency[source].append((target, weight))
+    return adjacency
+
+
+def _undirected_neighbors(G):
+    neighbors = [set() for _ in range(G.node_count())]
+    for source, target in zip(G.sources, G.targets):
+        if source != target:
+            neighbors[source].add(target)
+            neighbors[target].add(source)
+    return neighbors
+
+
+def _index(G, node_id):
+    try:
+        return G.index[int(node_id)]
+    except KeyError:
+        raise ValueError(f"Node {node_id} is not part of the graph.") from None
+
+
+def _node_scores(G, scores, column="score"):
+    return pd.DataFrame({"nodeId": G.node_ids, column: list(scores)})
+
+
+def _paths(G, rows):
+    """Build a shortest-path style result from (source, target, [nodes], [costs]) rows."""
+    return pd.DataFrame(
+        [
+            {
+                "index": index,
+                "sourceNode": G.node_ids[source],
+                "targetNode": G.node_ids[target],
+                "totalCost": float(costs[-1]),
+                "nodeIds": [G.node_ids[node] for node in nodes],
+                "costs": [float(cost) for cost in costs],
+                "path": None,
+            }
+            for index, (source, target, nodes, costs) in enumerate(rows)
+        ],
+        columns=[
+            "index",
+            "sourceNode",
+            "targetNode",
+            "totalCost",
+            "nodeIds",
+            "costs",
+            "path",
+        ],
+    )
+
+
+def _tree(G, parents, root_indices):
+    rows = []
+    for node, (parent, weight) in parents.items():
+        if node in root_indices:
+            rows.append((G.node_ids[node], G.node_ids[node], 0.0))
+        else:
+            rows.append((G.node_ids[node], G.node_ids[parent], float(weight)))
+    return pd.DataFrame(rows, columns=["nodeId", "parentId", "weight"])
+
+
+def _dijkstra(adjacency, sources, banned_nodes=(), banned_edges=()):
+    distances = {}
+    predecessors = {}
+    heap = [(0.0, source, source) for source in sources]
+    heapq.heapify(heap)
+    while heap:
+        distance, node, predecessor = heapq.heappop(heap)
+        if node in distances:
+            continue
+        distances[node] = distance
+        predecessors[node] = predecessor
+        for neighbor, weight in adjacency[node]:
+            if neighbor in distances or neighbor in banned_nodes:
+                continue
+            if (node, neighbor) in banned_edges:
+                continue
+            heapq.heappush(heap, (distance + weight, neighbor, node))
+    return distances, predecessors
+
+
+def _walk_back(predecessors, distances, target):
+    nodes = [target]
+    while predecessors[nodes[-1]] != nodes[-1]:
+        nodes.append(predecessors[nodes[-1]])
+    nodes.reverse()
+    return nodes, [distances[node] for node in nodes]
+
+
+# Centrality
+
+
+def _power_iteration(
+    G,
+    dampingFactor,
+    maxIterations,
+    tolerance,
+    sourceNodes,
+    relationshipWeightProperty,
+    extra_degree=0.0,
+):
+    n = G.node_count()
+    sources = np.asarray(G.sources, dtype=np.int64)
+    targets = np.asarray(G.targets, dtype=np.int64)
+    weights = np.asarray(G.relationship_weights(relationshipWeightProperty))
+    out_weight = np.bincount(sources, weights=weights, minlength=n) + extra_degree
+    teleport = np.full(n, 1.0 - dampingFactor)
+    if sourceNodes:
+        teleport = np.zeros(n)
+        for node_id in sourceNodes:
+            teleport[_index(G, node_id)] = 1.0 - dampingFactor
+
+    scores = teleport.copy()
+    for _ in range(maxIterations):
+        share = np.divide(scores, out_weight, out=np.zeros(n), where=out_weight > 0)
+        contributions = np.bincount(
+            targets, weights=share[sources] * weights, minlength=n
+        )
+        updated = teleport + dampingFactor * contributions
+        converged = np.max(np.abs(updated - scores), initial=0.0) < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def _scale(scores, scaler):
+    scaler = (scaler or "NONE").upper()
+    if scaler in ("NONE", "") or len(scores) == 0:
+        return scores
+    if scaler == "MINMAX":
+        low, high = scores.min(), scores.max()
+        return (scores - low) / (high - low) if high > low else np.zeros_like(scores)
+    if scaler == "MAX":
+        high = np.abs(scores).max()
+        return scores / high if high > 0 else scores
+    if scaler == "MEAN":
+        low, high = scores.min(), scores.max()
+        return (scores - scores.mean()) / (high - low) if high > low else scores * 0
+    if scaler == "L1NORM":
+        total = np.abs(scores).sum()
+        return scores / total if total > 0 else scores
+    if scaler == "L2NORM":
+        total = np.linalg.norm(scores)
+        return scores / total if total > 0 else scores
+    if scaler == "STDSCORE":
+        deviation = scores.std()
+        return (scores - scores.mean()) / deviation if deviation > 0 else scores * 0
+    if scaler == "LOG":
+        return np.log(scores + 1)
+    raise ValueError(f"Unknown scaler '{scaler}'.")
+
+
+def page_rank(
+    G,
+    dampingFactor=0.85,
+    maxIterations=20,
+    tolerance=1e-7,
+    sourceNodes=None,
+    relationshipWeightProperty=None,
+    scaler=None,
+    **config,
+):
+    scores = _power_iteration(
+        G,
+        dampingFactor,
+        maxIterations,
+        tolerance,
+        sourceNodes,
+        relationshipWeightProperty,
+    )
+    return _node_scores(G, _scale(scores, scaler))
+
+
+def article_rank(
+    G,
+    dampingFactor=0.85,
+    maxIterations=20,
+    tolerance=1e-7,
+    sourceNodes=None,
+    relationshipWeightProperty=None,
+    scaler=None,
+    **config,
+):
+    average_degree = len(G.sources) / max(G.node_count(), 1)
+    scores = _power_iteration(
+        G,
+        dampingFactor,
+        maxIterations,
+        tolerance,
+        sourceNodes,
+        relationshipWeightProperty,
+        extra_degree=average_degree,
+    )
+    return _node_scores(G, _scale(scores, scaler))
+
+
+def eigenvector(
+    G,
+    maxIterations=20,
+    tolerance=1e-7,
+    sourceNodes=None,
+    relationshipWeightProperty=None,
+    scaler=None,
+    **config,
+):
+    n = G.node_count()
+    sources = np.asarray(G.sources, dtype=np.int64)
+    targets = np.asarray(G.targets, dtype=np.int64)
+    weights = np.asarray(G.relationship_weights(relationshipWeightProperty))
+    scores = np.full(n, 1.0 / max(n, 1))
+    if sourceNodes:
+        scores = np.zeros(n)
+        for node_id in sourceNodes:
+            scores[_index(G, node_id)] = 1.0 / len(sourceNodes)
+    for _ in range(maxIterations):
+        updated = scores + np.bincount(
+            targets, weights=scores[sources] * weights, minlength=n
+        )
+        norm = np.linalg.norm(updated)
+        if norm > 0:
+            updated = updated / norm
+        converged = np.max(np.abs(updated - scores), initial=0.0) < tolerance
+        scores = updated
+        if converged:
+            break
+    return _node_scores(G, _scale(scores, scaler))
+
+
+def degree(G, orientation="NATURAL", relationshipWeightProperty=None, **config):
+    weights = np.asarray(G.relationship_weights(relationshipWeightProperty))
+    n = G.node_count()
+    out_degree = np.bincount(np.asarray(G.sources, dtype=np.int64), weights, n)
+    in_degree = np.bincount(np.asarray(G.targets, dtype=np.int64), weights, n)
+    orientation = orientation.upper()
+    if orientation == "REVERSE":
+        scores = in_degree
+    elif orientation == "UNDIRECTED":
+        scores = out_degree + in_degree
+    else:
+        scores = out_degree
+    return _node_scores(G, scores)
+
+
+def betweenness(G, relationshipWeightProperty=None, **config):
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    n = G.node_count()
+    centrality = [0.0] * n
+    for source in range(n):
+        # Brandes' algorithm with Dijkstra, which also covers the unweighted case
+        stack = []
+        predecessors = [[] for _ in range(n)]
+        sigma = [0] * n
+        sigma[source] = 1
+        distance = [math.inf] * n
+        distance[source] = 0.0
+        heap = [(0.0, source)]
+        settled = [False] * n
+        while heap:
+            d, node = heapq.heappop(heap)
+            if settled[node]:
+                continue
+            settled[node] = True
+            stack.append(node)
+            for neighbor, weight in adjacency[node]:
+                candidate = d + weight
+                if candidate < distance[neighbor]:
+                    distance[neighbor] = candidate
+                    sigma[neighbor] = sigma[node]
+                    predecessors[neighbor] = [node]
+                    heapq.heappush(heap, (candidate, neighbor))
+                elif candidate == distance[neighbor] and not settled[neighbor]:
+                    sigma[neighbor] += sigma[node]
+                    predecessors[neighbor].append(node)
+        delta = [0.0] * n
+        while stack:
+            node = stack.pop()
+            for predecessor in predecessors[node]:
+                delta[predecessor] += (
+                    sigma[predecessor] / sigma[node] * (1 + delta[node])
+                )
+            if node != source:
+                centrality[node] += delta[node]
+    if G.undirected:
+        centrality = [score / 2 for score in centrality]
+    return _node_scores(G, centrality)
+
+
+def _bfs_distances(adjacency, source):
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for neighbor, _ in adjacency[node]:
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def closeness(G, useWassermanFaust=False, **config):
+    adjacency = _adjacency(G)
+    n = G.node_count()
+    scores = []
+    for node in range(n):
+        distances = _bfs_distances(adjacency, node)
+        reached = len(distances) - 1
+        total = sum(distances.values())
+        score = reached / total if total > 0 else 0.0
+        if useWassermanFaust and n > 1:
+            score *= reached / (n - 1)
+        scores.append(score)
+    return _node_scores(G, scores)
+
+
+def harmonic(G, **config):
+    adjacency = _adjacency(G)
+    n = G.node_count()
+    scores = []
+    for node in range(n):
+        distances = _bfs_distances(adjacency, node)
+        total = sum(1.0 / d for d in distances.values() if d > 0)
+        scores.append(total / (n - 1) if n > 1 else 0.0)
+    return _node_scores(G, scores)
+
+
+def hits(G, hitsIterations=20, **config):
+    n = G.node_count()
+    sources = np.asarray(G.sources, dtype=np.int64)
+    targets = np.asarray(G.targets, dtype=np.int64)
+    auth = np.ones(n)
+    hub = np.ones(n)
+    for _ in range(hitsIterations):
+        auth = np.bincount(targets, weights=hub[sources], minlength=n)
+        auth = auth / (np.linalg.norm(auth) or 1.0)
+        hub = np.bincount(sources, weights=auth[targets], minlength=n)
+        hub = hub / (np.linalg.norm(hub) or 1.0)
+    return pd.DataFrame(
+        {
+            "nodeId": G.node_ids,
+            "values": [{"auth": float(a), "hub": float(h)} for a, h in zip(auth, hub)],
+        }
+    )
+
+
+def celf(
+    G,
+    seedSetSize=1,
+    monteCarloSimulations=100,
+    propagationProbability=0.1,
+    randomSeed=0,
+    **config,
+):
+    adjacency = _adjacency(G)
+    rng = random.Random(randomSeed)
+
+    def spread(seeds):
+        total = 0
+        for _ in range(monteCarloSimulations):
+            active = set(seeds)
+            frontier = list(seeds)
+            while frontier:
+                node = frontier.pop()
+                for neighbor, _ in adjacency[node]:
+                    if neighbor not in active and rng.random() < propagationProbability:
+                        active.add(neighbor)
+                        frontier.append(neighbor)
+            total += len(active)
+        return total / monteCarloSimulations
+
+    # Lazy forward selection: marginal gains only shrink, so stale gains are upper bounds
+    heap = [(-spread([node]), node, 0) for node in range(G.node_count())]
+    heapq.heapify(heap)
+    seeds, gains, current = [], [], 0.0
+    while heap and len(seeds) < seedSetSize:
+        negative_gain, node, round_computed = heapq.heappop(heap)
+        if round_computed == len(seeds):
+            seeds.append(node)
+            gains.append(-negative_gain)
+            current += -negative_gain
+        else:
+            gain = spread(seeds + [node]) - current
+            heapq.heappush(heap, (-gain, node, len(seeds)))
+    return pd.DataFrame(
+        {"nodeId": [G.node_ids[node] for node in seeds], "spread": gains}
+    )
+
+
+def _low_links(neighbors):
+    """
+    Iterative Tarjan DFS over an undirected graph.
+
+    Returns discovery times, low links, DFS tree parents, DFS subtree sizes and the
+    root of each node's DFS tree.
+    """
+    n = len(neighbors)
+    discovery = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    size = [1] * n
+    roots = [-1] * n
+    time = 0
+    for root in range(n):
+        if discovery[root] != -1:
+            continue
+        discovery[root] = low[root] = time
+        roots[root] = root
+        time += 1
+        stack = [(root, iter(sorted(neighbors[root])))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if discovery[child] == -1:
+                    parent[child] = node
+                    roots[child] = root
+                    discovery[child] = low[child] = time
+                    time += 1
+                    stack.append((child, iter(sorted(neighbors[child]))))
+                    break
+                if child != parent[node]:
+                    low[node] = min(low[node], discovery[child])
+            else:
+                stack.pop()
+                if parent[node] != -1:
+                    low[parent[node]] = min(low[parent[node]], low[node])
+                    size[parent[node]] += size[node]
+    return discovery, low, parent, size, roots
+
+
+def articulation_points(G, **config):
+    neighbors = _undirected_neighbors(G)
+    discovery, low, parent, size, roots = _low_links(neighbors)
+    rows = []
+    for node in range(len(neighbors)):
+        children = [child for child in neighbors[node] if parent[child] == node]
+        if parent[node] == -1:
+            separated = children
+        else:
+            separated = [child for child in children if low[child] >= discovery[node]]
+        if parent[node] == -1 and len(children) < 2 or not separated:
+            continue
+        # Components left after removing the node: each separated DFS subtree plus
+        # whatever remains connected to the node's parent
+        sizes = [size[child] for child in separated]
+        rest = size[roots[node]] - 1 - sum(sizes)
+        if rest > 0:
+            sizes.append(rest)
+        rows.append(
+            (
+                G.node_ids[node],
+                {"max": max(sizes), "min": min(sizes), "count": len(sizes)},
+            )
+        )
+    return pd.DataFrame(rows, columns=["nodeId", "resultingComponents"])
+
+
+def bridges(G, **config):
+    neighbors = _undirected_neighbors(G)
+    discovery, low, parent, size, roots = _low_links(neighbors)
+    rows = [
+        (
+            G.node_ids[parent[node]],
+            G.node_ids[node],
+            [size[roots[node]] - size[node], size[node]],
+        )
+        for node in range(len(neighbors))
+        if parent[node] != -1 and low[node] > discovery[parent[node]]
+    ]
+    return pd.DataFrame(rows, columns=["from", "to", "remainingSizes"])
+
+
+# Community detection
+
+
+def _components(n, edges):
+    parent = list(range(n))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for source, target in edges:
+        root_source, root_target = find(source), find(target)
+        if root_source != root_target:
+            parent[max(root_source, root_target)] = min(root_source, root_target)
+    return [find(node) for node in range(n)]
+
+
+def wcc(G, relationshipWeightProperty=None, threshold=None, **config):
+    weights = G.relationship_weights(relationshipWeightProperty)
+    edges = [
+        (source, target)
+        for source, target, weight in zip(G.sources, G.targets, weights)
+        if threshold is None or weight > threshold
+    ]
+    components = _components(G.node_count(), edges)
+    return _node_scores(G, [G.node_ids[c] for c in components], "componentId")
+
+
+def scc(G, **config):
+    adjacency = _adjacency(G)
+    n = G.node_count()
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack, components, counter = [], [0] * n, 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if position == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            recurse = False
+            for offset in range(position, len(adjacency[node])):
+                neighbor = adjacency[node][offset][0]
+                if index[neighbor] == -1:
+                    work.append((node, offset + 1))
+                    work.append((neighbor, 0))
+                    recurse = True
+                    break
+                if on_stack[neighbor]:
+                    low[node] = min(low[node], index[neighbor])
+            if recurse:
+                continue
+            if low[node] == index[node]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    members.append(member)
+                    if member == node:
+                        break
+                component = G.node_ids[min(members)]
+                for member in members:
+                    components[member] = component
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return _node_scores(G, components, "componentId")
+
+
+def _label_propagation(G, maxIterations, weight_property=None):
+    adjacency = _adjacency(G, weight_property)
+    reverse = _adjacency(G, weight_property, reverse=True)
+    labels = list(range(G.node_count()))
+    for _ in range(maxIterations):
+        changed = False
+        for node in range(G.node_count()):
+            votes = Counter()
+            for neighbor, weight in adjacency[node] + reverse[node]:
+                votes[labels[neighbor]] += weight
+            if not votes:
+                continue
+            best = max(votes.values())
+            label = min(label for label, vote in votes.items() if vote == best)
+            if label != labels[node]:
+                labels[node] = label
+                changed = True
+        if not changed:
+            break
+    return labels
+
+
+def label_propagation(G, maxIterations=10, relationshipWeightProperty=None, **config):
+    labels = _label_propagation(G, maxIterations, relationshipWeightProperty)
+    return _node_scores(G, [G.node_ids[label] for label in labels], "communityId")
+
+
+def speaker_listener_label_propagation(G, maxIterations=10, **config):
+    labels = _label_propagation(G, maxIterations)
+    return _node_scores(
+        G,
+        [{"communityIds": [int(G.node_ids[label])]} for label in labels],
+        "values",
+    )
+
+
+def _symmetric_weights(G, weight_property):
+    weights = {}
+    for source, target, weight in zip(
+        G.sources, G.targets, G.relationship_weights(weight_property)
+    ):
+        weights[(source, target)] = weights.get((source, target), 0.0) + weight
+        if not G.undirected:
+            weights[(target, source)] = weights.get((target, source), 0.0) + weight
+    return weights
+
+
+def _local_moving(n, weights, maxIterations=10, tolerance=1e-4):
+    """One level of Louvain: move nodes to the neighbouring community with best gain."""
+    neighbors = [[] for _ in range(n)]
+    strength = [0.0] * n
+    for (source, target), weight in weights.items():
+        neighbors[source].append((target, weight))
+        strength[source] += weight
+    total = sum(strength) or 1.0
+    communities = list(range(n))
+    community_strength = strength[:]
+    for _ in range(maxIterations):
+        moved = 0
+        for node in range(n):
+            current = communities[node]
+            links = Counter()
+            for neighbor, weight in neighbors[node]:
+                if neighbor != node:
+                    links[communities[neighbor]] += weight
+            community_strength[current] -= strength[node]
+            best, best_gain = (
+                current,
+                links[current] - community_strength[current] * strength[node] / total,
+            )
+            for community, link in sorted(links.items()):
+                gain = link - community_strength[community] * strength[node] / total
+                if gain > best_gain + tolerance:
+                    best, best_gain = community, gain
+            community_strength[best] += strength[node]
+            if best != current:
+                communities[node] = best
+                moved += 1
+        if moved == 0:
+            break
+    return communities
+
+
+def louvain(
+    G,
+    maxLevels=10,
+    maxIterations=10,
+    tolerance=1e-4,
+    includeIntermediateCommunities=False,
+    relationshipWeightProperty=None,
+    **config,
+):
+    weights = _symmetric_weights(G, relationshipWeightProperty)
+    assignment = list(range(G.node_count()))
+    intermediate = [[] for _ in assignment]
+    n = G.node_count()
+    for _ in range(maxLevels):
+        communities = _local_moving(n, weights, maxIterations, tolerance)
+        renumber = {c: i for i, c in enumerate(sorted(set(communities)))}
+        if len(renumber) == n:
+            break
+        assignment = [renumber[communities[a]] for a in assignment]
+        for node, community in enumerate(assignment):
+            intermediate[node].append(community)
+        aggregated = {}
+        for (source, target), weight in weights.items():
+            key = (renumber[communities[source]], renumber[communities[target]])
+            aggregated[key] = aggregated.get(key, 0.0) + weight
+        weights, n = aggregated, len(renumber)
+    result = _node_scores(G, assignment, "communityId")
+    result["intermediateCommunityIds"] = (
+        intermediate if includeIntermediateCommunities else None
+    )
+    return result
+
+
+def modularity_optimization(
+    G, maxIterations=10, tolerance=1e-4, relationshipWeightProperty=None, **config
+):
+    weights = _symmetric_weights(G, relationshipWeightProperty)
+    communities = _local_moving(G.node_count(), weights, maxIterations, tolerance)
+    return _node_scores(G, communities, "communityId")
+
+
+def triangle_count(G, **config):
+    neighbors = _undirected_neighbors(G)
+    counts = [
+        sum(len(neighbors[node] & neighbors[other]) for other in neighbors[node]) // 2
+        for node in range(G.node_count())
+    ]
+    return _node_scores(G, counts, "triangleCount")
+
+
+def local_clustering_coefficient(G, **config):
+    neighbors = _undirected_neighbors(G)
+    triangles = triangle_count(G)["triangleCount"]
+    coefficients = []
+    for node, count in enumerate(triangles):
+        degree = len(neighbors[node])
+        coefficients.append(
+            2.0 * count / (degree * (degree - 1)) if degree > 1 else 0.0
+        )
+    return _node_scores(G, coefficients, "localClusteringCoefficient")
+
+
+def kcore(G, **config):
+    neighbors = _undirected_neighbors(G)
+    degrees = [len(adjacent) for adjacent in neighbors]
+    core = [0] * len(degrees)
+    heap = [(degree, node) for node, degree in enumerate(degrees)]
+    heapq.heapify(heap)
+    removed = [False] * len(degrees)
+    k = 0
+    while heap:
+        degree, node = heapq.heappop(heap)
+        if removed[node] or degree != degrees[node]:
+            continue
+        removed[node] = True
+        k = max(k, degree)
+        core[node] = k
+        for neighbor in neighbors[node]:
+            if not removed[neighbor]:
+                degrees[neighbor] -= 1
+                heapq.heappush(heap, (degrees[neighbor], neighbor))
+    return _node_scores(G, core, "coreValue")
+
+
+def k1coloring(G, minCommunitySize=0, **config):
+    neighbors = _undirected_neighbors(G)
+    colors = [-1] * G.node_count()
+    for node in range(G.node_count()):
+        used = {colors[neighbor] for neighbor in neighbors[node]}
+        colors[node] = next(
+            color for color in range(len(used) + 1) if color not in used
+        )
+    result = _node_scores(G, colors, "color")
+    sizes = result["color"].map(result["color"].value_counts())
+    return result[sizes >= minCommunitySize].reset_index(drop=True)
+
+
+def _property_matrix(G, node_property):
+    values = G.node_properties[node_property]
+    return np.array([np.atleast_1d(np.asarray(value, dtype=float)) for value in values])
+
+
+def kmeans(
+    G,
+    nodeProperty,
+    k=10,
+    maxIterations=10,
+    deltaThreshold=0.05,
+    numberOfRestarts=1,
+    seedCentroids=None,
+    computeSilhouette=False,
+    randomSeed=0,
+    **config,
+):
+    points = _property_matrix(G, nodeProperty)
+    rng = np.random.default_rng(randomSeed)
+    k = min(k, len(points))
+    if seedCentroids:
+        centroids = np.asarray(seedCentroids, dtype=float)
+    else:
+        centroids = points[rng.choice(len(points), size=k, replace=False)]
+    for _ in range(maxIterations):
+        distances = np.linalg.norm(points[:, None, :] - centroids[None, :, :], axis=2)
+        assignment = distances.argmin(axis=1)
+        updated = np.array(
+            [
+                points[assignment == c].mean(axis=0)
+                if np.any(assignment == c)
+                else centroids[c]
+                for c in range(len(centroids))
+            ]
+        )
+        moved = np.mean(np.any(updated != centroids, axis=1))
+        centroids = updated
+        if moved <= deltaThreshold:
+            break
+    distances = np.linalg.norm(points[:, None, :] - centroids[None, :, :], axis=2)
+    assignment = distances.argmin(axis=1)
+    result = _node_scores(G, assignment, "communityId")
+    result["distanceFromCentroid"] = distances[np.arange(len(points)), assignment]
+    # GDS streams NaN silhouettes unless computeSilhouette is set
+    result["silhouette"] = (
+        _silhouette(points, assignment) if computeSilhouette else np.nan
+    )
+    return result
+
+
+def _silhouette(points, assignment):
+    distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+    scores = []
+    for node, community in enumerate(assignment):
+        same = assignment == community
+        if same.sum() <= 1:
+            scores.append(0.0)
+            continue
+        inner = distances[node, same].sum() / (same.sum() - 1)
+        outer = min(
+            (
+                distances[node, assignment == other].mean()
+                for other in set(assignment)
+                if other != community
+            ),
+            default=0.0,
+        )
+        scores.append((outer - inner) / max(inner, outer) if max(inner, outer) else 0.0)
+    return scores
+
+
+def hdbscan(G, nodeProperty, minClusterSize=5, samples=10, **config):
+    # Density based approximation: link every point to its nearest neighbours, keep
+    # connected groups of at least minClusterSize points and label the rest as noise.
+    points = _property_matrix(G, nodeProperty)
+    distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+    nearest = np.argsort(distances, axis=1)[:, 1 : samples + 1]
+    edges = [(node, other) for node, others in enumerate(nearest) for other in others]
+    components = _components(len(points), edges)
+    sizes = Counter(components)
+    clusters = sorted({c for c in components if sizes[c] >= minClusterSize})
+    renumber = {c: i for i, c in enumerate(clusters)}
+    return _node_scores(G, [renumber.get(c, -1) for c in components], "label")
+
+
+def conductance(G, communityProperty, relationshipWeightProperty=None, **config):
+    communities = G.node_properties[communityProperty]
+    internal, external = Counter(), Counter()
+    for source, target, weight in zip(
+        G.sources, G.targets, G.relationship_weights(relationshipWeightProperty)
+    ):
+        community = communities[source]
+        if community is None or community < 0:
+            continue
+        if communities[target] == community:
+            internal[community] += weight
+        else:
+            external[community] += weight
+    rows = [
+        (
+            int(community),
+            external[community] / (internal[community] + external[community]),
+        )
+        for community in sorted(set(internal) | set(external))
+    ]
+    return pd.DataFrame(rows, columns=["community", "conductance"])
+
+
+def modularity(G, communityProperty, relationshipWeightProperty=None, **config):
+    communities = G.node_properties[communityProperty]
+    weights = _symmetric_weights(G, relationshipWeightProperty)
+    total = sum(weights.values()) or 1.0
+    inside, degree = Counter(), Counter()
+    for (source, target), weight in weights.items():
+        degree[communities[source]] += weight
+        if communities[source] == communities[target]:
+            inside[communities[source]] += weight
+    rows = [
+        (int(c), inside[c] / total - (degree[c] / total) ** 2) for c in sorted(degree)
+    ]
+    return pd.DataFrame(rows, columns=["communityId", "modularity"])
+
+
+def maxkcut(G, k=2, iterations=8, relationshipWeightProperty=None, **config):
+    weights = _symmetric_weights(G, relationshipWeightProperty)
+    neighbors = [[] for _ in range(G.node_count())]
+    for (source, target), weight in weights.items():
+        neighbors[source].append((target, weight))
+    communities = [node % k for node in range(G.node_count())]
+    for _ in range(iterations):
+        changed = False
+        for node in range(G.node_count()):
+            # Move each node to the side it has the least relationship weight with
+            inside = Counter({c: 0.0 for c in range(k)})
+            for neighbor, weight in neighbors[node]:
+                inside[communities[neighbor]] += weight
+            best = min(range(k), key=lambda c: (inside[c], c != communities[node]))
+            if best != communities[node]:
+                communities[node] = best
+                changed = True
+        if not changed:
+            break
+    return _node_scores(G, communities, "communityId")
+
+
+# Similarity
+
+
+def _filter_indices(G, node_filter):
+    if node_filter is None or isinstance(node_filter, str):
+        return range(G.node_count())
+    if not isinstance(node_filter, (list, tuple)):
+        node_filter = [node_filter]
+    return sorted(_index(G, node_id) for node_id in node_filter)
+
+
+def _top_similarities(G, similarities, topK, topN, similarityCutoff, bottomK=None):
+    rows = []
+    for node, scores in similarities.items():
+        ranked = sorted(
+            (item for item in scores if item[1] >= similarityCutoff),
+            key=lambda item: (-item[1], item[0]),
+        )
+        if bottomK:
+            ranked = ranked[::-1][:bottomK]
+        else:
+            ranked = ranked[:topK]
+        rows.extend(
+            (G.node_ids[node], G.node_ids[other], float(score))
+            for other, score in ranked
+        )
+    result = pd.DataFrame(rows, columns=["node1", "node2", "similarity"])
+    if topN:
+        result = result.sort_values("similarity", ascending=False, kind="stable")
+        result = result.head(topN).reset_index(drop=True)
+    return result
+
+
+def node_similarity(
+    G,
+    similarityCutoff=1e-42,
+    degreeCutoff=1,
+    upperDegreeCutoff=2**31 - 1,
+    topK=10,
+    bottomK=None,
+    topN=0,
+    bottomN=None,
+    similarityMetric="JACCARD",
+    sourceNodeFilter=None,
+    targetNodeFilter=None,
+    **config,
+):
+    neighbors = [set() for _ in range(G.node_count())]
+    for source, target in zip(G.sources, G.targets):
+        neighbors[source].add(target)
+    eligible = [
+        node
+        for node in range(G.node_count())
+        if degreeCutoff <= len(neighbors[node]) <= upperDegreeCutoff
+    ]
+    targets = set(_filter_indices(G, targetNodeFilter)) & set(eligible)
+    metric = similarityMetric.upper()
+    similarities = {}
+    for node in set(_filter_indices(G, sourceNodeFilter)) & set(eligible):
+        scores = []
+        for other in sorted(targets):
+            if other == node:
+                continue
+            shared = len(neighbors[node] & neighbors[other])
+            if shared == 0:
+                continue
+            if metric == "OVERLAP":
+                score = shared / min(len(neighbors[node]), len(neighbors[other]))
+            elif metric == "COSINE":
+                score = shared / math.sqrt(len(neighbors[node]) * len(neighbors[other]))
+            else:
+                score = shared / len(neighbors[node] | neighbors[other])
+            scores.append((other, score))
+        similarities[node] = scores
+    result = _top_similarities(G, similarities, topK, topN, similarityCutoff, bottomK)
+    if bottomN:
+        result = result.sort_values("similarity", kind="stable").head(bottomN)
+    return result.reset_index(drop=True)
+
+
+def knn(
+    G,
+    nodeProperties,
+    topK=10,
+    similarityCutoff=0.0,
+    sourceNodeFilter=None,
+    targetNodeFilter=None,
+    **config,
+):
+    if isinstance(nodeProperties, str):
+        nodeProperties = [nodeProperties]
+    if isinstance(nodeProperties, dict):
+        nodeProperties = list(nodeProperties)
+    vectors = [_property_matrix(G, prop) for prop in nodeProperties]
+
+    def similarity(a, b):
+        scores = []
+        for matrix in vectors:
+            x, y = matrix[a], matrix[b]
+            if len(x) == 1:
+                scores.append(1.0 / (1.0 + abs(float(x[0] - y[0]))))
+            else:
+                norm = np.linalg.norm(x) * np.linalg.norm(y)
+                scores.append(float(x @ y / norm) if norm else 0.0)
+        return sum(scores) / len(scores)
+
+    targets = list(_filter_indices(G, targetNodeFilter))
+    similarities = {
+        node: [(other, similarity(node, other)) for other in targets if other != node]
+        for node in _filter_indices(G, sourceNodeFilter)
+    }
+    return _top_similarities(G, similarities, topK, None, similarityCutoff)
+
+
+# Path finding
+
+
+def shortest_path(G, sourceNode, targetNode, relationshipWeightProperty=None, **config):
+    source, target = _index(G, sourceNode), _index(G, targetNode)
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    distances, predecessors = _dijkstra(adjacency, [source])
+    if target not in distances:
+        return _paths(G, [])
+    nodes, costs = _walk_back(predecessors, distances, target)
+    return _paths(G, [(source, target, nodes, costs)])
+
+
+def all_shortest_paths_from(G, sourceNode, relationshipWeightProperty=None, **config):
+    source = _index(G, sourceNode)
+    distances, predecessors = _dijkstra(
+        _adjacency(G, relationshipWeightProperty), [source]
+    )
+    rows = [
+        (source, target, *_walk_back(predecessors, distances, target))
+        for target in distances
+    ]
+    return _paths(G, rows)
+
+
+def yens(G, sourceNode, targetNode, k=1, relationshipWeightProperty=None, **config):
+    source, target = _index(G, sourceNode), _index(G, targetNode)
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    weight_of = {}
+    for node, edges in enumerate(adjacency):
+        for neighbor, weight in edges:
+            weight_of[(node, neighbor)] = min(
+                weight, weight_of.get((node, neighbor), math.inf)
+            )
+
+    distances, predecessors = _dijkstra(adjacency, [source])
+    if target not in distances:
+        return _paths(G, [])
+    paths = [_walk_back(predecessors, distances, target)[0]]
+    candidates = []
+    while len(paths) < k:
+        previous = paths[-1]
+        for i in range(len(previous) - 1):
+            root = previous[: i + 1]
+            banned_edges = {
+                (path[i], path[i + 1]) for path in paths if path[: i + 1] == root
+            }
+            spur_distances, spur_predecessors = _dijkstra(
+                adjacency, [root[-1]], set(root[:-1]), banned_edges
+            )
+            if target not in spur_distances:
+                continue
+            spur = _walk_back(spur_predecessors, spur_distances, target)[0]
+            candidate = root[:-1] + spur
+            cost = sum(weight_of[edge] for edge in zip(candidate, candidate[1:]))
+            if candidate not in paths and (cost, candidate) not in candidates:
+                heapq.heappush(candidates, (cost, candidate))
+        if not candidates:
+            break
+        paths.append(heapq.heappop(candidates)[1])
+
+    rows = []
+    for path in paths:
+        costs = [0.0]
+        for edge in zip(path, path[1:]):
+            costs.append(costs[-1] + weight_of[edge])
+        rows.append((source, target, path, costs))
+    return _paths(G, rows)
+
+
+def bellman_ford(G, sourceNode, relationshipWeightProperty=None, **config):
+    source = _index(G, sourceNode)
+    weights = G.relationship_weights(relationshipWeightProperty)
+    distances = {source: 0.0}
+    predecessors = {source: source}
+    for _ in range(G.node_count()):
+        changed = False
+        for u, v, weight in zip(G.sources, G.targets, weights):
+            if u in distances and distances[u] + weight < distances.get(v, math.inf):
+                distances[v] = distances[u] + weight
+                predecessors[v] = u
+                changed = True
+        if not changed:
+            break
+    rows = [
+        (source, target, *_walk_back(predecessors, distances, target))
+        for target in distances
+    ]
+    result = _paths(G, rows)
+    result["isNegativeCycle"] = False
+    return result
+
+
+def spanning_tree(
+    G, sourceNode, relationshipWeightProperty=None, objective="minimum", **config
+):
+    source = _index(G, sourceNode)
+    sign = -1.0 if objective.lower() == "maximum" else 1.0
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    parents = {}
+    heap = [(0.0, source, source, 0.0)]
+    while heap:
+        _, node, parent, weight = heapq.heappop(heap)
+        if node in parents:
+            continue
+        parents[node] = (parent, weight)
+        for neighbor, edge_weight in adjacency[node]:
+            if neighbor not in parents:
+                heapq.heappush(heap, (sign * edge_weight, neighbor, node, edge_weight))
+    return _tree(G, parents, {source})
+
+
+def steiner_tree(G, sourceNode, targetNodes, relationshipWeightProperty=None, **config):
+    # Shortest path heuristic: repeatedly connect the target closest to the tree
+    source = _index(G, sourceNode)
+    remaining = {_index(G, target) for target in targetNodes}
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    weight_of = {}
+    for node, edges in enumerate(adjacency):
+        for neighbor, weight in edges:
+            weight_of[(node, neighbor)] = min(
+                weight, weight_of.get((node, neighbor), math.inf)
+            )
+    parents = {source: (source, 0.0)}
+    remaining.discard(source)
+    while remaining:
+        distances, predecessors = _dijkstra(adjacency, list(parents))
+        reachable = [target for target in remaining if target in distances]
+        if not reachable:
+            return pd.DataFrame(columns=["nodeId", "parentId", "weight"])
+        target = min(reachable, key=lambda node: (distances[node], node))
+        node = target
+        while node not in parents:
+            parent = predecessors[node]
+            parents[node] = (parent, weight_of[(parent, node)])
+            node = parent
+        remaining.discard(target)
+    return _tree(G, parents, {source})
+
+
+def prize_steiner_tree(G, prizeProperty, relationshipWeightProperty=None, **config):
+    # Greedy growth from the most valuable node while the next prize outweighs its cost
+    prizes = [
+        float(prize) if prize is not None and not np.isnan(prize) else 0.0
+        for prize in G.node_properties[prizeProperty]
+    ]
+    if not prizes:
+        return pd.DataFrame(columns=["nodeId", "parentId", "weight"])
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    root = max(range(len(prizes)), key=lambda node: (prizes[node], -node))
+    parents = {root: (root, 0.0)}
+    heap = [(-(prizes[n] - w), n, root, w) for n, w in adjacency[root]]
+    heapq.heapify(heap)
+    while heap:
+        negative_gain, node, parent, weight = heapq.heappop(heap)
+        if node in parents or -negative_gain <= 0:
+            continue
+        parents[node] = (parent, weight)
+        for neighbor, edge_weight in adjacency[node]:
+            if neighbor not in parents:
+                heapq.heappush(
+                    heap,
+                    (-(prizes[neighbor] - edge_weight), neighbor, node, edge_weight),
+                )
+    return _tree(G, parents, {root})
+
+
+def all_pairs_shortest_paths(G, relationshipWeightProperty=None, **config):
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    rows = []
+    for source in range(G.node_count()):
+        distances, _ = _dijkstra(adjacency, [source])
+        rows.extend(
+            (G.node_ids[source], G.node_ids[target], float(distance))
+            for target, distance in sorted(distances.items())
+        )
+    return pd.DataFrame(rows, columns=["sourceNodeId", "targetNodeId", "distance"])
+
+
+def random_walk(
+    G,
+    sourceNodes=None,
+    walkLength=80,
+    walksPerNode=10,
+    relationshipWeightProperty=None,
+    randomSeed=0,
+    **config,
+):
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    rng = random.Random(randomSeed)
+    starts = (
+        [_index(G, node) for node in sourceNodes]
+        if sourceNodes
+        else range(G.node_count())
+    )
+    walks = []
+    for start in starts:
+        # Like GDS, nodes without outgoing relationships do not start walks
+        if not adjacency[start]:
+            continue
+        for _ in range(walksPerNode):
+            walk = [start]
+            while len(walk) < walkLength and adjacency[walk[-1]]:
+                neighbors, weights = zip(*adjacency[walk[-1]])
+                walk.append(rng.choices(neighbors, weights=weights)[0])
+            walks.append([G.node_ids[node] for node in walk])
+    return pd.DataFrame({"nodeIds": walks, "path": [None] * len(walks)})
+
+
+def _traverse(G, sourceNode, targetNodes, maxDepth, depth_first):
+    adjacency = _adjacency(G)
+    source = _index(G, sourceNode)
+    targets = {_index(G, target) for target in targetNodes or []}
+    max_depth = math.inf if maxDepth is None or maxDepth < 0 else maxDepth
+    visited, order = set(), []
+    frontier = deque([(source, 0)])
+    while frontier:
+        node, depth = frontier.pop() if depth_first else frontier.popleft()
+        if node in visited:
+            continue
+        visited.add(node)
+        order.append(node)
+        if node in targets:
+            break
+        if depth >= max_depth:
+            continue
+        neighbors = [neighbor for neighbor, _ in adjacency[node]]
+        if depth_first:
+            neighbors.reverse()
+        frontier.extend((neighbor, depth + 1) for neighbor in neighbors)
+    return pd.DataFrame(
+        {
+            "sourceNode": [G.node_ids[source]],
+            "nodeIds": [[G.node_ids[node] for node in order]],
+            "path": [None],
+        }
+    )
+
+
+def bfs(G, sourceNode, targetNodes=None, maxDepth=None, **config):
+    return _traverse(G, sourceNode, targetNodes, maxDepth, depth_first=False)
+
+
+def dfs(G, sourceNode, targetNodes=None, maxDepth=None, **config):
+    return _traverse(G, sourceNode, targetNodes, maxDepth, depth_first=True)
+
+
+def longest_path(G, relationshipWeightProperty=None, **config):
+    adjacency = _adjacency(G, relationshipWeightProperty)
+    in_degree = Counter(G.targets)
+    queue = deque(node for node in range(G.node_count()) if in_degree[node] == 0)
+    distances = {node: 0.0 for node in queue}
+    predecessors = {node: node for node in queue}
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for neighbor, weight in adjacency[node]:
+            if distances[node] + weight > distances.get(neighbor, -math.inf):
+                distances[neighbor] = distances[node] + weight
+                predecessors[neighbor] = node
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+    # Nodes on cycles are never released by the topological sort and get no path
+    rows = []
+    for target in order:
+        nodes, costs = _walk_back(predecessors, distances, target)
+        rows.append((nodes[0], target, nodes, costs))
+    return _paths(G, rows)
+
+
+# Endpoint name -> implementation of its `.stream` procedure
+ALGORITHMS = {
+    "articleRank": article_rank,
+    "articulationPoints": articulation_points,
+    "betweenness": betweenness,
+    "bridges": bridges,
+    "influenceMaximization.celf": celf,
+    "closeness": closeness,
+    "closeness.harmonic": harmonic,
+    "degree": degree,
+    "eigenvector": eigenvector,
+    "pageRank": page_rank,
+    "hits": hits,
+    "conductance": conductance,
+    "hdbscan": hdbscan,
+    "kcore": kcore,
+    "k1coloring": k1coloring,
+    "kmeans": kmeans,
+    "labelPropagation": label_propagation,
+    "leiden": louvain,
+    "localClusteringCoefficient": local_clustering_coefficient,
+    "louvain": louvain,
+    "modularity": modularity,
+    "modularityOptimization": modularity_optimization,
+    "scc": scc,
+    "triangleCount": triangle_count,
+    "wcc": wcc,
+    "maxkcut": maxkcut,
+    "sllpa": speaker_listener_label_propagation,
+    "nodeSimilarity.filtered": node_similarity,
+    "nodeSimilarity": node_similarity,
+    "knn.filtered": knn,
+    "knn": knn,
+    "shortestPath.dijkstra": shortest_path,
+    "shortestPath.astar": shortest_path,
+    "shortestPath.yens": yens,
+    "allShortestPaths.dijkstra": all_shortest_paths_from,
+    "allShortestPaths.delta": all_shortest_paths_from,
+    "allShortestPaths": all_pairs_shortest_paths,
+    "bellmanFord": bellman_ford,
+    "spanningTree": spanning_tree,
+    "steinerTree": steiner_tree,
+    "prizeSteinerTree": prize_steiner_tree,
+    "randomWalk": random_walk,
+    "bfs": bfs,
+    "dfs": dfs,
+    "dag.longestPath": longest_path,
+}
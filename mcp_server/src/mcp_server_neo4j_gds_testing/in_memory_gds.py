@@ -0,0 +1,1082 @@
+"""
+In-process stand-in for `GraphDataScience`, for tests and benchmarks without Neo4j.
+
+`InMemoryGraphDataScience` implements the subset of the client the tool handlers use:
+`run_cypher` for the queries issued by mcp_server_neo4j_gds, native and Cypher projections,
+the graph catalog, `util.asNode` and the `.stream`, `.stats`, `.mutate` and `.write`
+procedures of the registered algorithms (see `in_memory_algorithms`), with rough
+`.estimate`s. Mutate and write modes only store node results. Queries are recognised
+by their shape rather than parsed, so new queries need a matching entry in `run_cypher`.
+
+The server uses it when started with a `memory://` URL:
+
+    memory://london                         dataset/london.json
+    memory:///path/to/london.json           any file in the London dataset format
+    memory://synthetic?nodes=10000&seed=42  power-law graph, see `synthetic_database`
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from .in_memory_algorithms import ALGORITHMS
+
+logger = logging.getLogger("mcp_server_neo4j_gds")
+
+# Jobs started with a jobId, by id: {"taskName", "terminated"}. Jobs run synchronously,
+# so a termination takes effect when the job finishes.
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+@contextmanager
+def _job(job_id, task_name):
+    if job_id is None:
+        yield
+        return
+    with _jobs_lock:
+        _jobs[job_id] = {"taskName": task_name, "terminated": False}
+    try:
+        yield
+    finally:
+        with _jobs_lock:
+            job = _jobs.pop(job_id)
+    if job["terminated"]:
+        raise RuntimeError(
+            "The transaction has been terminated. Retry your operation in a new transaction."
+        )
+
+
+# Test support is not part of the wheel, so the dataset of the source checkout is used
+LONDON_DATASET = Path(__file__).parents[3] / "dataset" / "london.json"
+
+
+class InMemoryNode:
+    """Mimics `neo4j.graph.Node` as returned by `gds.util.asNode`."""
+
+    def __init__(self, node_id, labels, properties):
+        self.id = node_id
+        self.element_id = f"4:in-memory:{node_id}"
+        self.labels = frozenset(labels)
+        self._properties = dict(properties)
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def keys(self):
+        return self._properties.keys()
+
+    def items(self):
+        return self._properties.items()
+
+    def __eq__(self, other):
+        return isinstance(other, InMemoryNode) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return (
+            f"<Node element_id={self.element_id!r} labels={self.labels!r} "
+            f"properties={self._properties!r}>"
+        )
+
+
+class InMemoryDatabase:
+    """
+    Nodes and relationships of an in-memory property graph.
+
+    Node ids are positions in `nodes`. Relationships are (source, target, type,
+    properties) tuples.
+    """
+
+    def __init__(self, nodes=None, relationships=None):
+        self.nodes = list(nodes or [])
+        self.relationships = list(relationships or [])
+        # Counts changes, like the id of the last committed transaction of a database
+        self.last_committed_txn = 0
+
+    def add_node(self, labels, properties):
+        self.nodes.append((list(labels), dict(properties)))
+        self.last_committed_txn += 1
+        return len(self.nodes) - 1
+
+    def recreate_node(self, node_id, labels, properties):
+        """Delete a node and create a new one that reuses its id, as Neo4j may."""
+        self.nodes[node_id] = (list(labels), dict(properties))
+        self.last_committed_txn += 2
+
+    def set_node_property(self, node_id, key, value):
+        """`SET n.<key> = value`, which leaves the counts as they are."""
+        self.nodes[node_id][1][key] = value
+        self.last_committed_txn += 1
+
+    def add_relationship(self, source, target, relationship_type, properties):
+        self.relationships.append((source, target, relationship_type, dict(properties)))
+        self.last_committed_txn += 1
+
+    def labels(self):
+        return sorted({label for labels, _ in self.nodes for label in labels})
+
+    def relationship_types(self):
+        return sorted({rel_type for _, _, rel_type, _ in self.relationships})
+
+    def property_keys(self):
+        keys = {key for _, properties in self.nodes for key in properties}
+        keys.update(key for *_, properties in self.relationships for key in properties)
+        return sorted(keys)
+
+
+def _storage_type(value):
+    if isinstance(value, bool):
+        return "Boolean"
+    if isinstance(value, int):
+        return "Long"
+    if isinstance(value, float):
+        return "Double"
+    if isinstance(value, str):
+        return "String"
+    if isinstance(value, (list, tuple)):
+        element_types = {_storage_type(element) for element in value}
+        if element_types <= {"Long"}:
+            return "LongArray"
+        if element_types <= {"Long", "Double"}:
+            return "DoubleArray"
+        return "StringArray"
+    return type(value).__name__
+
+
+class InMemoryGraph:
+    """A projected graph in the in-memory catalog, with the `Graph` object API."""
+
+    def __init__(
+        self,
+        catalog,
+        name,
+        node_ids,
+        node_properties,
+        relationships,
+        relationship_properties,
+        undirected,
+    ):
+        self._catalog = catalog
+        self._name = name
+        self.node_ids = [int(node_id) for node_id in node_ids]
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.node_properties = node_properties
+        self.undirected = undirected
+        self.sources, self.targets = [], []
+        self.relationship_properties = {prop: [] for prop in relationship_properties}
+        for source, target, properties in relationships:
+            directions = [(source, target)]
+            if undirected:
+                directions.append((target, source))
+            for u, v in directions:
+                self.sources.append(self.index[u])
+                self.targets.append(self.index[v])
+                for prop in relationship_properties:
+                    value = properties.get(prop)
+                    self.relationship_properties[prop].append(
+                        np.nan if value is None else float(value)
+                    )
+
+    def relationship_weights(self, weight_property=None):
+        if weight_property is None:
+            return [1.0] * len(self.sources)
+        if weight_property not in self.relationship_properties:
+            raise ValueError(
+                f"Relationship weight property `{weight_property}` not found in graph "
+                f"with relationship properties: {list(self.relationship_properties)}"
+            )
+        return self.relationship_properties[weight_property]
+
+    def name(self):
+        return self._name
+
+    def exists(self):
+        return self._catalog.get(self._name) is self
+
+    def node_count(self):
+        return len(self.node_ids)
+
+    def relationship_count(self):
+        return len(self.sources)
+
+    def node_properties_list(self):
+        return list(self.node_properties)
+
+    def size_in_bytes(self):
+        per_node = 8 * (1 + len(self.node_properties))
+        per_relationship = 16 + 8 * len(self.relationship_properties)
+        return per_node * self.node_count() + per_relationship * len(self.sources)
+
+    def __repr__(self):
+        return (
+            f"InMemoryGraph(name={self._name}, node_count={self.node_count()}, "
+            f"relationship_count={self.relationship_count()})"
+        )
+
+
+def _estimated_algorithm_bytes(path, n, m, config):
+    """Rough memory footprint of an algorithm run, in the spirit of the GDS estimates."""
+    if path == "allShortestPaths":
+        return 8 * n * n
+    if path.startswith(("nodeSimilarity", "knn")):
+        return 16 * n * config.get("topK", 10) + 8 * n
+    if path == "betweenness":
+        return 8 * config.get("samplingSize", n) * n // 16 + 16 * (n + m)
+    if path == "randomWalk":
+        walks = config.get("walksPerNode", 10) * config.get("walkLength", 80)
+        return 8 * n * walks
+    return 16 * (n + m)
+
+
+def _memory_estimate(n, m, bytes_min, bytes_max):
+    def size(value):
+        return f"{value / 1024:.0f} KiB" if value >= 1024 else f"{value} Bytes"
+
+    return pd.Series(
+        {
+            "requiredMemory": f"[{size(bytes_min)} ... {size(bytes_max)}]",
+            "treeView": "",
+            "mapView": {},
+            "bytesMin": bytes_min,
+            "bytesMax": bytes_max,
+            "nodeCount": n,
+            "relationshipCount": m,
+            "heapPercentageMin": 0.0,
+            "heapPercentageMax": 0.0,
+        }
+    )
+
+
+class _Mode:
+    """`gds.<path>.stream` and friends: callable, with an `estimate` like the real client."""
+
+    def __init__(self, endpoint, run):
+        self._endpoint = endpoint
+        self._run = run
+
+    def __call__(self, G, *args, jobId=None, **config):
+        with _job(jobId, self._endpoint._path):
+            return self._run(G, *args, **config)
+
+    def estimate(self, G, *args, **config):
+        self._endpoint._algorithm()
+        config = {key: value for key, value in config.items() if value is not None}
+        n, m = G.node_count(), G.relationship_count()
+        algorithm_bytes = _estimated_algorithm_bytes(self._endpoint._path, n, m, config)
+        return _memory_estimate(n, m, algorithm_bytes // 2, algorithm_bytes)
+
+
+class _Endpoint:
+    """Resolves `gds.<path>.stream(G, ...)` and `gds.<path>.mutate(G, ...)` calls."""
+
+    def __init__(self, path):
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _Endpoint(f"{self._path}.{name}")
+
+    def _algorithm(self):
+        algorithm = ALGORITHMS.get(self._path)
+        if algorithm is None:
+            raise NotImplementedError(
+                f"gds.{self._path} is not supported by the in-memory backend"
+            )
+        return algorithm
+
+    @property
+    def stream(self):
+        return _Mode(self, self._stream)
+
+    @property
+    def mutate(self):
+        return _Mode(self, self._mutate)
+
+    def _stream(self, G, **config):
+        logger.debug(f"In-memory gds.{self._path}.stream({G.name()}, {config})")
+        # Like GDS procedures, treat null configuration values as unset
+        config = {key: value for key, value in config.items() if value is not None}
+        return self._algorithm()(G, **config)
+
+    @property
+    def stats(self):
+        return _Mode(self, self._stats)
+
+    @property
+    def write(self):
+        return _Mode(self, self._write)
+
+    def _node_values(self, G, config):
+        result = self._stream(G, **config)
+        if "nodeId" not in result.columns:
+            raise NotImplementedError(
+                f"Only node results of gds.{self._path} can be stored by the in-memory backend"
+            )
+        value_column = next(
+            column for column in result.columns if column not in ("nodeId",)
+        )
+        return value_column, dict(zip(result["nodeId"], result[value_column]))
+
+    def _mutate(self, G, mutateProperty, **config):
+        _, values = self._node_values(G, config)
+        G.node_properties[mutateProperty] = [
+            values.get(node_id) for node_id in G.node_ids
+        ]
+        return pd.Series(
+            {
+                "nodePropertiesWritten": len(values),
+                "mutateMillis": 0,
+                "configuration": config,
+            }
+        )
+
+    def _write(self, G, writeProperty, **config):
+        _, values = self._node_values(G, config)
+        database = G._catalog._gds.database_contents
+        for node_id, value in values.items():
+            database.nodes[node_id][1][writeProperty] = value
+        database.last_committed_txn += 1
+        return pd.Series(
+            {
+                "nodePropertiesWritten": len(values),
+                "writeMillis": 0,
+                "configuration": config,
+            }
+        )
+
+    def _stats(self, G, **config):
+        """Summary row in the shape of the GDS stats procedures."""
+        value_column, values = self._node_values(G, config)
+        values = pd.Series(list(values.values()))
+        if value_column in ("communityId", "componentId", "color", "label"):
+            sizes = values.value_counts()
+            count_name = (
+                "componentCount" if value_column == "componentId" else "communityCount"
+            )
+            distribution_name = count_name.replace("Count", "Distribution")
+            return pd.Series(
+                {
+                    count_name: len(sizes),
+                    distribution_name: _distribution(sizes),
+                    "computeMillis": 0,
+                    "configuration": config,
+                }
+            )
+        return pd.Series(
+            {
+                "centralityDistribution": _distribution(values),
+                "computeMillis": 0,
+                "configuration": config,
+            }
+        )
+
+
+def _distribution(values):
+    values = pd.to_numeric(values)
+    return {
+        "min": float(values.min()),
+        "mean": float(values.mean()),
+        "p50": float(values.quantile(0.5)),
+        "p90": float(values.quantile(0.9)),
+        "p99": float(values.quantile(0.99)),
+        "max": float(values.max()),
+    }
+
+
+class _NodePropertyEndpoint:
+    def stream(self, G, node_property, **config):
+        return pd.DataFrame(
+            {
+                "nodeId": G.node_ids,
+                "propertyValue": G.node_properties[node_property],
+            }
+        )
+
+
+class _NodePropertiesEndpoint:
+    def drop(self, G, node_properties, **config):
+        for node_property in node_properties:
+            G.node_properties.pop(node_property, None)
+        return pd.Series(
+            {"graphName": G.name(), "propertiesRemoved": len(node_properties)}
+        )
+
+
+class _CypherProjection:
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def project(self, query, database=None, **params):
+        return self._catalog.project_cypher(query, params)
+
+
+class _NativeProjection:
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __call__(self, graph_name, node_spec, relationship_spec, **config):
+        return self._catalog.project_native(graph_name, node_spec, relationship_spec)
+
+    def estimate(self, node_spec, relationship_spec, **config):
+        return self._catalog.estimate_native(node_spec, relationship_spec, **config)
+
+
+class _GraphCatalog:
+    def __init__(self, gds):
+        self._gds = gds
+        self._graphs = {}
+        self.cypher = _CypherProjection(self)
+        self.project = _NativeProjection(self)
+        self.nodeProperty = _NodePropertyEndpoint()
+        self.nodeProperties = _NodePropertiesEndpoint()
+
+    def get(self, graph_name):
+        return self._graphs.get(graph_name)
+
+    def exists(self, graph_name):
+        return pd.Series(
+            {"graphName": graph_name, "exists": graph_name in self._graphs}
+        )
+
+    def list(self):
+        return pd.DataFrame(
+            [
+                {
+                    "graphName": name,
+                    "nodeCount": G.node_count(),
+                    "relationshipCount": G.relationship_count(),
+                    "sizeInBytes": G.size_in_bytes(),
+                }
+                for name, G in self._graphs.items()
+            ],
+            columns=["graphName", "nodeCount", "relationshipCount", "sizeInBytes"],
+        )
+
+    def drop(self, graph, failIfMissing=False, **config):
+        name = graph if isinstance(graph, str) else graph.name()
+        dropped = self._graphs.pop(name, None)
+        if dropped is None and failIfMissing:
+            raise ValueError(f"Graph with name `{name}` does not exist.")
+        return pd.Series({"graphName": name})
+
+    def _select(self, node_spec, relationship_spec):
+        database = self._gds.database_contents
+        labels = set(node_spec)
+        node_ids = [
+            node_id
+            for node_id, (node_labels, _) in enumerate(database.nodes)
+            if "*" in labels or labels & set(node_labels)
+        ]
+        projected = set(node_ids)
+        relationships = [
+            (source, target, properties)
+            for source, target, rel_type, properties in database.relationships
+            if ("*" in relationship_spec or rel_type in relationship_spec)
+            and source in projected
+            and target in projected
+        ]
+        return node_ids, relationships
+
+    @staticmethod
+    def _projected_properties(spec):
+        return sorted(
+            {
+                prop
+                for element in spec.values()
+                for prop in element.get("properties", [])
+            }
+        )
+
+    def project_native(self, graph_name, node_spec, relationship_spec):
+        """Native projection with node and relationship specs in map syntax."""
+        database = self._gds.database_contents
+        node_ids, relationships = self._select(node_spec, relationship_spec)
+        undirected = any(
+            spec.get("orientation") == "UNDIRECTED"
+            for spec in relationship_spec.values()
+        )
+        return self._register(
+            graph_name,
+            node_ids,
+            {
+                prop: [database.nodes[node_id][1].get(prop) for node_id in node_ids]
+                for prop in self._projected_properties(node_spec)
+            },
+            relationships,
+            self._projected_properties(relationship_spec),
+            undirected,
+        )
+
+    def estimate_native(self, node_spec, relationship_spec, **config):
+        if "nodeCount" in config:
+            # A fictitious graph, as estimated for Cypher projections
+            n, m = config["nodeCount"], config["relationshipCount"]
+            node_properties = config.get("nodeProperties", [])
+            relationship_properties = config.get("relationshipProperties", [])
+        else:
+            node_ids, relationships = self._select(node_spec, relationship_spec)
+            n, m = len(node_ids), len(relationships)
+            node_properties = self._projected_properties(node_spec)
+            relationship_properties = self._projected_properties(relationship_spec)
+        per_node = 8 * (1 + len(node_properties))
+        per_relationship = 16 + 8 * len(relationship_properties)
+        size = per_node * n + per_relationship * m
+        return _memory_estimate(n, m, size, 2 * size)
+
+    def project_cypher(self, query, params):
+        """
+        Cypher projection of `MATCH (n:A|B)-[r:T]->(m:A|B)` queries built by `gds.py`,
+        with optional label and relationship type predicates.
+        """
+        match = re.search(
+            r"MATCH \(n(:[^)]*)?\)-\[r(:[^\]]*)?\]->\(m(:[^)]*)?\)", query
+        )
+        if match is None:
+            raise NotImplementedError(
+                "Only projections of a single relationship pattern are supported by the in-memory backend"
+            )
+        labels = _pattern_names(match.group(1))
+        relationship_types = _pattern_names(match.group(2))
+        database = self._gds.database_contents
+        node_map = re.search(r"sourceNodeProperties: \{(.*?)\}", query)
+        node_properties = {}
+        for name, conversion, prop in re.findall(
+            r"(\w+): (toFloatList|toFloat)?\(?n\.\s*(\w+)",
+            node_map.group(1) if node_map else "",
+        ):
+            node_properties[name] = (prop, conversion)
+        relationship_map = re.search(r"relationshipProperties: \{(.*?)\}", query)
+        relationship_properties = re.findall(
+            r"(\w+): r\.\w+", relationship_map.group(1) if relationship_map else ""
+        )
+        undirected = "undirectedRelationshipTypes" in query
+
+        def matches(node_id):
+            return labels is None or bool(labels & set(database.nodes[node_id][0]))
+
+        relationships = [
+            (source, target, properties)
+            for source, target, rel_type, properties in database.relationships
+            if (relationship_types is None or rel_type in relationship_types)
+            and matches(source)
+            and matches(target)
+        ]
+        node_ids = sorted(
+            {source for source, *_ in relationships}
+            | {target for _, target, *_ in relationships}
+        )
+
+        def convert(value, conversion):
+            if value is None or conversion is None:
+                return value
+            if conversion == "toFloatList":
+                return [float(element) for element in value]
+            return float(value)
+
+        return self._register(
+            params["graph_name"],
+            node_ids,
+            {
+                name: [
+                    convert(database.nodes[node_id][1].get(prop), conversion)
+                    for node_id in node_ids
+                ]
+                for name, (prop, conversion) in node_properties.items()
+            },
+            relationships,
+            relationship_properties,
+            undirected,
+        )
+
+    def _register(
+        self,
+        graph_name,
+        node_ids,
+        node_properties,
+        relationships,
+        rel_props,
+        undirected,
+    ):
+        if graph_name in self._graphs:
+            raise ValueError(f"A graph with name '{graph_name}' already exists.")
+        G = InMemoryGraph(
+            self,
+            graph_name,
+            node_ids,
+            node_properties,
+            relationships,
+            rel_props,
+            undirected,
+        )
+        self._graphs[graph_name] = G
+        result = pd.Series(
+            {
+                "graphName": graph_name,
+                "nodeCount": G.node_count(),
+                "relationshipCount": G.relationship_count(),
+            }
+        )
+        return G, result
+
+
+def _pattern_names(pattern):
+    """Names in a `:`A`|`B`` label or relationship type pattern, None if there is none."""
+    if not pattern:
+        return None
+    return {
+        name.replace("``", "`") for name in re.findall(r"`((?:[^`]|``)*)`", pattern)
+    }
+
+
+class _Util:
+    def __init__(self, gds):
+        self._gds = gds
+
+    def asNode(self, node_id):
+        return self._gds.node(int(node_id))
+
+    def asNodes(self, node_ids):
+        return [self._gds.node(int(node_id)) for node_id in node_ids]
+
+
+class InMemoryGraphDataScience:
+    """Drop-in replacement for `GraphDataScience` backed by an `InMemoryDatabase`."""
+
+    def __init__(self, database_contents, database="neo4j"):
+        self.database_contents = database_contents
+        self._database = database
+        self.graph = _GraphCatalog(self)
+        self.util = _Util(self)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _Endpoint(name)
+
+    def database(self):
+        return self._database
+
+    def set_database(self, database):
+        self._database = database
+
+    def close(self):
+        pass
+
+    def listProgress(self, job_id=None):
+        """Running jobs. Progress is not tracked, so it is always reported as n/a."""
+        with _jobs_lock:
+            rows = [
+                (running_id, job["taskName"], "n/a", "RUNNING")
+                for running_id, job in _jobs.items()
+                if job_id is None or running_id == job_id
+            ]
+        return pd.DataFrame(rows, columns=["jobId", "taskName", "progress", "status"])
+
+    def node(self, node_id):
+        labels, properties = self.database_contents.nodes[node_id]
+        return InMemoryNode(node_id, labels, properties)
+
+    def run_cypher(self, query, params=None, database=None):
+        params = params or {}
+        call = _ALGORITHM_CALL.search(query)
+        if call:
+            return self._call_algorithm(call.group(1), query, params)
+        for pattern, handler in _QUERIES:
+            match = pattern.search(query)
+            if match:
+                return handler(self.database_contents, match, params)
+        raise NotImplementedError(
+            f"Query not supported by the in-memory backend: {query}"
+        )
+
+    def _call_algorithm(self, path, query, params):
+        """
+        `CALL gds.<path>.stream(...)` sorted and limited, as issued by `stream_top_k`,
+        `stream_all_pairs_distances` and `stream_node_ids`.
+        """
+        G = self.graph.get(params["graph_name"])
+        result = _Endpoint(path).stream(G, **params["config"])
+        if "YIELD sourceNodeId" in query:
+            return _distances_by_source(result, query, params)
+        if "LIMIT $k" not in query:
+            return result[["nodeId"]].sort_values("nodeId").reset_index(drop=True)
+        if "$node_ids" in query:
+            result = result[result["nodeId"].isin(params["node_ids"])]
+        column, keyed, direction = _ORDER_BY.search(query).groups()
+        order = result[column]
+        if keyed:
+            order = order.map(lambda value: value[params["score_key"]])
+        result = result.assign(order=order).sort_values(
+            ["order", "nodeId"], ascending=[direction == "ASC", True], kind="stable"
+        )
+        return result[["nodeId", column]].head(params["k"]).reset_index(drop=True)
+
+
+_ALGORITHM_CALL = re.compile(r"CALL gds\.([\w.]+)\.stream\(\$graph_name, \$config\)")
+_ORDER_BY = re.compile(r"ORDER BY (\w+)(\[\$score_key\])? (ASC|DESC)")
+
+
+def _distances_by_source(result, query, params):
+    if "$source_ids" in query:
+        result = result[result["sourceNodeId"].isin(params["source_ids"])]
+    if "$target_ids" in query:
+        result = result[result["targetNodeId"].isin(params["target_ids"])]
+    if "$max_distance" in query:
+        result = result[result["distance"] <= params["max_distance"]]
+    rows = [
+        {
+            "sourceNodeId": source,
+            "targetNodeIds": pairs["targetNodeId"].tolist(),
+            "distances": pairs["distance"].tolist(),
+        }
+        for source, pairs in result.sort_values(
+            ["sourceNodeId", "targetNodeId"]
+        ).groupby("sourceNodeId", sort=True)
+    ]
+    return pd.DataFrame(
+        rows,
+        columns=["sourceNodeId", "targetNodeIds", "distances"],
+    )
+
+
+def _fingerprint(db, match, params):
+    return pd.DataFrame(
+        [
+            {
+                "labels": db.labels(),
+                "relationshipTypes": db.relationship_types(),
+                "propertyKeys": db.property_keys(),
+                "nodeCount": len(db.nodes),
+                "relationshipCount": len(db.relationships),
+            }
+        ]
+    )
+
+
+def _last_committed_transaction(db, match, params):
+    return pd.DataFrame({"lastCommittedTxn": [db.last_committed_txn]})
+
+
+def _label_and_type_counts(db, match, params):
+    label_counts = Counter(label for labels, _ in db.nodes for label in labels)
+    type_counts = Counter(rel_type for _, _, rel_type, _ in db.relationships)
+    return pd.DataFrame(
+        [
+            {
+                "nodeCountsByLabel": dict(label_counts),
+                "relationshipCountsByType": dict(type_counts),
+            }
+        ]
+    )
+
+
+def _schema(db, match, params):
+    node_types, relationship_types = {}, {}
+    for labels, properties in db.nodes:
+        key = tuple(sorted(labels))
+        node_types.setdefault(key, {})
+        for prop, value in properties.items():
+            node_types[key].setdefault(prop, set()).add(_storage_type(value))
+    for _, _, rel_type, properties in db.relationships:
+        relationship_types.setdefault(rel_type, {})
+        for prop, value in properties.items():
+            relationship_types[rel_type].setdefault(prop, set()).add(
+                _storage_type(value)
+            )
+    rows = []
+    for labels, properties in node_types.items():
+        if not properties:
+            rows.append(("node", list(labels), None, None))
+        for prop, types in properties.items():
+            rows.append(("node", list(labels), prop, sorted(types)))
+    for properties in relationship_types.values():
+        for prop, types in properties.items():
+            rows.append(("relationship", [], prop, sorted(types)))
+    return pd.DataFrame(
+        rows, columns=["entity", "nodeLabels", "propertyName", "propertyTypes"]
+    )
+
+
+def _distinct_keys(entities):
+    keys = []
+    for properties in entities:
+        entity_keys = list(properties)
+        if entity_keys not in keys:
+            keys.append(entity_keys)
+    return pd.DataFrame({"properties_keys": keys})
+
+
+def _node_property_keys(db, match, params):
+    return _distinct_keys(properties for _, properties in db.nodes)
+
+
+def _relationship_property_keys(db, match, params):
+    return _distinct_keys(properties for *_, properties in db.relationships)
+
+
+def _identifiers_by_id(db, match, params):
+    prop = params["property"]
+    rows = [
+        (node_id, db.nodes[node_id][1].get(prop))
+        for node_id in params["ids"]
+        if 0 <= node_id < len(db.nodes)
+    ]
+    return pd.DataFrame(rows, columns=["nodeId", "identifier"])
+
+
+_NAME_MATCH = re.compile(
+    r"MATCH \((\w+)\)\s*WHERE toLower\(\1\.(\w+)\) CONTAINS toLower\(\$?(\w+)\)"
+)
+_RETURN_ITEM = re.compile(
+    r"(?:id\((\w+)\)|(\w+)\.(\w+)|(\w+))\s+as\s+(\w+)", re.IGNORECASE
+)
+
+
+def _nodes_containing(db, prop, text):
+    text = str(text).lower()
+    return [
+        node_id
+        for node_id, (_, properties) in enumerate(db.nodes)
+        if isinstance(properties.get(prop), str) and text in properties[prop].lower()
+    ]
+
+
+def _name_lookup(db, match, params):
+    """`[UNWIND $names AS name] MATCH (x) WHERE toLower(x.p) CONTAINS toLower(...)` lookups."""
+    query = match.string
+    unwind = re.search(r"UNWIND \$(\w+) AS (\w+)", query)
+    clauses = _NAME_MATCH.findall(query)
+    return_clause = query[query.rindex("RETURN") :]
+    items = _RETURN_ITEM.findall(return_clause)
+
+    def bindings(values):
+        rows = [{}]
+        for variable, prop, parameter in clauses:
+            text = values[parameter]
+            rows = [
+                {**row, variable: node_id}
+                for row in rows
+                for node_id in _nodes_containing(db, prop, text)
+            ]
+        return rows
+
+    if unwind:
+        rows = []
+        for value in params[unwind.group(1)]:
+            matches = bindings({**params, unwind.group(2): value})
+            if "ORDER BY" in query:
+                # Exact matches first, then by node id
+                variable, prop, _ = clauses[0]
+                matches.sort(
+                    key=lambda row: (
+                        str(db.nodes[row[variable]][1][prop]).lower()
+                        != str(value).lower(),
+                        row[variable],
+                    )
+                )
+            rows.extend({**row, unwind.group(2): value} for row in matches)
+    else:
+        rows = bindings(params)
+
+    def value(row, id_variable, variable, prop, plain_variable):
+        if id_variable:
+            return row[id_variable]
+        if plain_variable:
+            return row[plain_variable]
+        return db.nodes[row[variable]][1].get(prop)
+
+    columns = [alias for *_, alias in items]
+    return pd.DataFrame(
+        [[value(row, *item[:4]) for item in items] for row in rows],
+        columns=columns,
+    )
+
+
+def _property_values(db, match, params):
+    prop = params["property"]
+    rows = [
+        (node_id, properties.get(prop))
+        for node_id, (_, properties) in enumerate(db.nodes)
+        if node_id > params["after"]
+    ]
+    return pd.DataFrame(rows, columns=["nodeId", "value"])
+
+
+def _show_job_transactions(db, match, params):
+    # Every job runs in its own transaction, identified here by the job id
+    with _jobs_lock:
+        running = [job_id for job_id in params["job_ids"] if job_id in _jobs]
+    return pd.DataFrame({"transactionId": running}, dtype=object)
+
+
+def _terminate_transactions(db, match, params):
+    with _jobs_lock:
+        for job_id in params["transaction_ids"]:
+            if job_id in _jobs:
+                _jobs[job_id]["terminated"] = True
+    return pd.DataFrame(
+        {
+            "transactionId": params["transaction_ids"],
+            "message": "Transaction terminated.",
+        }
+    )
+
+
+_QUERIES = [
+    (re.compile(r"YIELD name, lastCommittedTxn"), _last_committed_transaction),
+    (
+        re.compile(r"SHOW TRANSACTIONS YIELD transactionId, parameters"),
+        _show_job_transactions,
+    ),
+    (re.compile(r"TERMINATE TRANSACTIONS \$transaction_ids"), _terminate_transactions),
+    (re.compile(r"db\.propertyKeys\(\)"), _fingerprint),
+    (re.compile(r"AS nodeCountsByLabel"), _label_and_type_counts),
+    (re.compile(r"db\.schema\.nodeTypeProperties\(\)"), _schema),
+    (re.compile(r"RETURN DISTINCT keys\(properties\(n\)\)"), _node_property_keys),
+    (
+        re.compile(r"RETURN DISTINCT keys\(properties\(r\)\)"),
+        _relationship_property_keys,
+    ),
+    (
+        re.compile(r"UNWIND \$ids AS id\s+MATCH \(n\)\s+WHERE id\(n\) = id"),
+        _identifiers_by_id,
+    ),
+    (
+        re.compile(r"RETURN id\(n\) AS nodeId, n\[\$property\] AS value"),
+        _property_values,
+    ),
+    (_NAME_MATCH, _name_lookup),
+]
+
+
+def london_database(path=LONDON_DATASET):
+    """Load the London underground dataset the same way `import_data.py` does."""
+    with open(path) as f:
+        data = json.load(f)
+
+    db = InMemoryDatabase()
+    ids = {}
+    for station in data["stations"]:
+        zone = station["zone"]
+        # Properties are inserted in the order Neo4j reports their keys in
+        ids[station["id"]] = db.add_node(
+            ["UndergroundStation"],
+            {
+                "zone": float(zone) if "." in zone else int(zone),
+                "rail": int(station["rail"]),
+                "latitude": float(station["latitude"]),
+                "name": station["name"],
+                "total_lines": int(station["total_lines"]),
+                "id": station["id"],
+                "display_name": station["name"]
+                if station["display_name"] == "NULL"
+                else station["display_name"],
+                "longitude": float(station["longitude"]),
+            },
+        )
+
+    seen = set()
+    for connection in data["connections"]:
+        properties = {
+            "distance": int(connection["time"]),
+            "line": connection["line"],
+            "time": int(connection["time"]),
+        }
+        key = (
+            connection["station1"],
+            connection["station2"],
+            connection["line"],
+            connection["time"],
+        )
+        # import_data.py MERGEs relationships, so identical connections collapse
+        if key in seen:
+            continue
+        seen.add(key)
+        db.add_relationship(
+            ids[connection["station1"]], ids[connection["station2"]], "LINK", properties
+        )
+    return db
+
+
+def synthetic_database(nodes=1000, degree=3, seed=42):
+    """
+    Generate a scale-free graph by preferential attachment (Barabási–Albert).
+
+    Every node gets a `name`, an integer `community_hint`, a float `score`,
+    `latitude` and `longitude` and a float list `embedding`; every relationship a
+    float `weight` and an integer `distance`.
+    """
+    rng = np.random.default_rng(seed)
+    db = InMemoryDatabase()
+    for node_id in range(nodes):
+        db.add_node(
+            ["Node"],
+            {
+                "name": f"node_{node_id}",
+                "community_hint": int(node_id % 16),
+                "score": float(rng.random()),
+                "latitude": float(rng.uniform(-90, 90)),
+                "longitude": float(rng.uniform(-180, 180)),
+                "embedding": [float(x) for x in rng.random(4)],
+            },
+        )
+    # Every endpoint of an existing relationship is repeated once per relationship,
+    # so sampling from it picks nodes proportionally to their degree.
+    endpoints = list(range(min(degree, nodes)))
+    for node_id in range(len(endpoints), nodes):
+        targets = set()
+        while len(targets) < min(degree, node_id):
+            targets.add(endpoints[rng.integers(len(endpoints))])
+        for target in sorted(targets):
+            db.add_relationship(
+                node_id,
+                int(target),
+                "LINK",
+                {
+                    "weight": float(rng.random()),
+                    "distance": int(rng.integers(1, 10)),
+                },
+            )
+            endpoints.extend([node_id, int(target)])
+    return db
+
+
+def create_in_memory_gds(url, database="neo4j"):
+    """Create an `InMemoryGraphDataScience` for a `memory://` URL."""
+    parsed = urlparse(url)
+    if parsed.scheme != "memory":
+        raise ValueError(f"Not an in-memory URL: {url}")
+    options = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    if parsed.netloc == "synthetic":
+        contents = synthetic_database(
+            nodes=int(options.get("nodes", 1000)),
+            degree=int(options.get("degree", 3)),
+            seed=int(options.get("seed", 42)),
+        )
+    elif parsed.netloc in ("", "london"):
+        contents = london_database(parsed.path or LONDON_DATASET)
+    else:
+        raise ValueError(
+            f"Unknown in-memory dataset '{parsed.netloc}'. Use 'london', 'synthetic' "
+            "or a path to a dataset file."
+        )
+    logger.info(
+        f"Using in-memory backend with {len(contents.nodes)} nodes and "
+        f"{len(contents.relationships)} relationships"
+    )
+    return InMemoryGraphDataScience(contents, database=database or "neo4j")
@@ -16,6 +16,10 @@ NEO4J_HTTP_PORT = 7474
 NEO4J_USER = "neo4j"
 NEO4J_PASSWORD = "testpassword"
 
+# Set GDS_TEST_BACKEND=memory to run the tool tests against the in-process stand-in
+# for GDS instead of a Neo4j container. Tests that talk to Neo4j directly are skipped.
+TEST_BACKEND = os.environ.get("GDS_TEST_BACKEND", "neo4j")
+
 
 # Global cleanup function
 def cleanup_containers():
@@ -54,8 +58,13 @@ def is_neo4j_responsive(url):
 
 
 @pytest.fixture(scope="session")
-def neo4j_container(docker_ip, docker_services):
+def neo4j_container(request):
     """Start a Neo4j container for testing."""
+    if TEST_BACKEND == "memory":
+        pytest.skip("requires a Neo4j database")
+    docker_ip = request.getfixturevalue("docker_ip")
+    docker_services = request.getfixturevalue("docker_services")
+
     # Get the dynamically allocated port for the neo4j service
     port = docker_services.port_for("neo4j", NEO4J_BOLT_PORT)
     url = f"bolt://{docker_ip}:{port}"
@@ -150,17 +159,26 @@ def import_test_data(neo4j_container):
     os.chdir(original_cwd)
 
 
+@pytest.fixture(scope="session")
+def server_db_url(request):
+    """URL of the database the MCP server under test connects to."""
+    if TEST_BACKEND == "memory":
+        return "memory://london"
+    request.getfixturevalue("import_test_data")
+    return os.environ["NEO4J_URI"]
+
+
 @pytest_asyncio.fixture
-async def mcp_server_process(import_test_data):
+async def mcp_server_process(server_db_url):
     """Start the MCP server as a subprocess and communicate via stdio."""
     # Start the server process
     proc = await asyncio.create_subprocess_exec(
         "python",
         "-m",
         "mcp_server_neo4j_gds.server",
-        os.environ["NEO4J_URI"],
-        os.environ["NEO4J_USERNAME"],
-        os.environ["NEO4J_PASSWORD"],
+        server_db_url,
+        NEO4J_USER,
+        NEO4J_PASSWORD,
         stdin=asyncio.subprocess.PIPE,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
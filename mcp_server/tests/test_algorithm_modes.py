@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from mcp_server_neo4j_gds import gds as gds_module
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds.gds import configure_projection_cache, projected_graph
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+
+
+@pytest.fixture
+def london_gds():
+    # Written properties must not be read from stale cached projections
+    configure_projection_cache(max_entries=4, idle_ttl=600)
+    yield create_in_memory_gds("memory://london")
+    configure_projection_cache(max_entries=0, idle_ttl=600)
+
+
+def test_stats_mode_returns_summary_only(london_gds):
+    result = server.execute_tool(
+        london_gds,
+        "pagerank",
+        {"mode": "stats", "sourceNodes": ["Bank"], "nodeIdentifierProperty": "name"},
+    )
+    summary = json.loads(result[0])
+    assert "nodeId" not in summary
+    assert summary["centralityDistribution"]["max"] > 0
+    assert 11 in summary["configuration"]["sourceNodes"]
+
+    summary = json.loads(
+        server.execute_tool(
+            london_gds, "weakly_connected_components", {"mode": "stats"}
+        )[0]
+    )
+    assert summary["componentCount"] >= 1
+
+
+def test_write_mode(london_gds):
+    result = server.execute_tool(
+        london_gds, "degree_centrality", {"mode": "write", "writeProperty": "degree"}
+    )
+    assert json.loads(result[0])["nodePropertiesWritten"] == 302
+    assert (
+        "degree" in server.execute_tool(london_gds, "get_node_properties_keys", {})[0]
+    )
+
+
+@pytest.mark.parametrize("reports_transactions", [True, False])
+def test_write_mode_refreshes_cached_projections(
+    london_gds, monkeypatch, reports_transactions
+):
+    if not reports_transactions:
+        monkeypatch.setattr(gds_module, "last_committed_transaction", lambda gds: None)
+    for damping_factor in [0.85, 0.1]:
+        server.execute_tool(
+            london_gds,
+            "pagerank",
+            {"mode": "write", "writeProperty": "pr", "dampingFactor": damping_factor},
+        )
+        with projected_graph(london_gds) as G:
+            projected = london_gds.graph.nodeProperty.stream(G, "pr")
+        written = [
+            properties["pr"] for _, properties in london_gds.database_contents.nodes
+        ]
+        assert projected["propertyValue"].tolist() == pytest.approx(written)
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        ({"mode": "explain"}, "Unknown mode"),
+        ({"writeProperty": "score"}, "not used in stream mode"),
+        ({"mode": "stats", "topK": 3}, "topK cannot be used in stats mode"),
+        (
+            {"mode": "write", "writeProperty": "score", "bottomK": 3},
+            "bottomK cannot be used in write mode",
+        ),
+        (
+            {"mode": "mutate", "mutateProperty": "score"},
+            "only available in run_pipeline",
+        ),
+    ],
+)
+def test_invalid_modes(london_gds, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        server.execute_tool(london_gds, "pagerank", arguments)
+    # Refused before anything was projected or run
+    assert london_gds.graph.list().empty
+
+
+def test_algorithms_called_from_cypher_refuse_other_modes(london_gds):
+    with pytest.raises(ValueError, match="cannot run in stats mode"):
+        server.execute_tool(
+            london_gds,
+            "all_pairs_shortest_paths",
+            {"mode": "stats", "relationshipWeightProperty": "time"},
+        )
@@ -1,6 +1,11 @@
+import base64
 import pytest
 import json
 
+import pandas as pd
+
+from mcp_server_neo4j_gds.result_pages import ResultPaginator, encode_cursor
+
 
 @pytest.mark.asyncio
 async def test_count_nodes(mcp_client):
@@ -12,6 +17,22 @@ async def test_count_nodes(mcp_client):
     assert node_count == 302
 
 
+@pytest.mark.asyncio
+async def test_count_nodes_per_label_and_type(mcp_client):
+    result = await mcp_client.call_tool(
+        "count_nodes", {"includeLabelAndTypeCounts": True}
+    )
+
+    assert len(result) == 1
+    counts = json.loads(result[0]["text"])
+    assert counts["nodeCount"] == 302
+    assert counts["relationshipCount"] > 0
+    assert sum(counts["nodeCountsByLabel"].values()) >= 302
+    assert (
+        sum(counts["relationshipCountsByType"].values()) == counts["relationshipCount"]
+    )
+
+
 @pytest.mark.asyncio
 async def test_list_tools(mcp_client):
     """Test that all expected tools are listed."""
@@ -24,6 +45,7 @@ async def test_list_tools(mcp_client):
     expected_tools = [
         # Basic tools
         "count_nodes",
+        "get_server_metrics",
         "get_node_properties_keys",
         "get_relationship_properties_keys",
         # Centrality algorithms
@@ -73,6 +95,8 @@ async def test_list_tools(mcp_client):
         # similarity
         "node_similarity",
         "k_nearest_neighbors",
+        # Pipelines
+        "run_pipeline",
     ]
 
     # Check that we have the expected tools
@@ -112,3 +136,73 @@ async def test_get_relationship_properties_keys(mcp_client):
     properties_keys = json.loads(result_text)
 
     assert properties_keys == ["distance", "line", "time"]
+
+
+@pytest.mark.asyncio
+async def test_paginated_results(mcp_client):
+    result = await mcp_client.call_tool(
+        "pagerank",
+        {"nodeIdentifierProperty": "name", "orderBy": "score", "limit": 10},
+    )
+
+    assert len(result) == 2
+    first_page_lines = result[0]["text"].strip().split("\n")
+    assert len(first_page_lines[1:]) == 10
+    metadata = json.loads(result[1]["text"])
+    assert metadata["totalRows"] == 302
+    assert metadata["offset"] == 0
+    assert metadata["returnedRows"] == 10
+    assert metadata["nextCursor"] is not None
+
+    next_result = await mcp_client.call_tool(
+        "pagerank", {"cursor": metadata["nextCursor"]}
+    )
+
+    assert len(next_result) == 2
+    next_metadata = json.loads(next_result[1]["text"])
+    assert next_metadata["totalRows"] == 302
+    assert next_metadata["offset"] == 10
+    assert next_result[0]["text"] != result[0]["text"]
+
+    last_result = await mcp_client.call_tool(
+        "pagerank", {"cursor": metadata["nextCursor"], "offset": 300}
+    )
+    last_metadata = json.loads(last_result[1]["text"])
+    assert last_metadata["returnedRows"] == 2
+    assert last_metadata["nextCursor"] is None
+
+
+def test_pagination_rejects_empty_pages():
+    paginator = ResultPaginator()
+    result = pd.DataFrame({"score": range(5)})
+
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        paginator.first_page("pagerank", result, {"limit": 0})
+
+    _, metadata = paginator.first_page("pagerank", result, {"limit": 2})
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        paginator.next_page("pagerank", {"cursor": metadata["nextCursor"], "limit": -1})
+
+    result_id = next(iter(paginator._results))
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        paginator.next_page("pagerank", {"cursor": encode_cursor(result_id, 2, 0)})
+
+
+@pytest.mark.asyncio
+async def test_arrow_result_resource(mcp_client):
+    result = await mcp_client.call_tool(
+        "pagerank", {"nodeIdentifierProperty": "name", "resultFormat": "arrow"}
+    )
+
+    assert len(result) == 2
+    description = json.loads(result[0]["text"])
+    assert description["rowCount"] == 302
+    assert result[1]["type"] == "resource_link"
+    assert result[1]["uri"] == description["uri"]
+
+    response = await mcp_client.send_request(
+        "resources/read", {"uri": description["uri"]}
+    )
+    contents = response["result"]["contents"]
+    assert contents[0]["mimeType"] == "application/vnd.apache.arrow.file"
+    assert len(base64.b64decode(contents[0]["blob"])) == description["sizeBytes"]
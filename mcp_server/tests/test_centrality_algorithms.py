@@ -311,6 +311,38 @@ async def test_pagerank(mcp_client):
     )
 
 
+@pytest.mark.asyncio
+async def test_pagerank_top_k(mcp_client):
+    result = await mcp_client.call_tool(
+        "pagerank", {"nodeIdentifierProperty": "name", "topK": 5}
+    )
+
+    assert len(result) == 1
+    lines = result[0]["text"].strip().split("\n")
+    data_lines = [line for line in lines[1:] if line.strip()]
+    assert len(data_lines) == 5
+    scores = [float(line.split()[2]) for line in data_lines]
+    assert scores == sorted(scores, reverse=True)
+
+    # The top 5 are the highest scores of the full result
+    full_result = await mcp_client.call_tool("pagerank", {})
+    full_lines = full_result[0]["text"].strip().split("\n")[1:]
+    full_scores = sorted((float(line.split()[2]) for line in full_lines), reverse=True)
+    assert scores == pytest.approx(full_scores[:5])
+
+    bottom_result = await mcp_client.call_tool(
+        "degree_centrality",
+        {
+            "nodes": ["Bank", "Covent Garden", "Southwark"],
+            "nodeIdentifierProperty": "name",
+            "bottomK": 2,
+        },
+    )
+    bottom_lines = bottom_result[0]["text"].strip().split("\n")[1:]
+    assert len(bottom_lines) == 2
+    assert "Bank" not in " ".join(bottom_lines)
+
+
 @pytest.mark.asyncio
 async def test_harmonic_centrality(mcp_client):
     result_filtered = await mcp_client.call_tool(
@@ -1,4 +1,12 @@
 import pytest
+import json
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds_testing.in_memory_gds import (
+    InMemoryGraphDataScience,
+    create_in_memory_gds,
+    synthetic_database,
+)
 
 
 @pytest.mark.asyncio
@@ -60,6 +68,30 @@ async def test_k_means_clustering(mcp_client):
     pass
 
 
+def test_k_means_clustering_summary_is_valid_json():
+    gds = InMemoryGraphDataScience(synthetic_database(nodes=200))
+    arguments = {
+        "nodeProperty": "embedding",
+        "k": 3,
+        "randomSeed": 1,
+        "outputFormat": "summary",
+    }
+
+    def reject_constant(constant):
+        raise ValueError(f"{constant} is not valid JSON")
+
+    result = server.execute_tool(gds, "k_means_clustering", arguments)
+    summary = json.loads(result[0], parse_constant=reject_constant)
+    assert summary["communityCount"] == 3
+    assert "averageSilhouette" not in summary
+
+    result = server.execute_tool(
+        gds, "k_means_clustering", {**arguments, "computeSilhouette": True}
+    )
+    summary = json.loads(result[0], parse_constant=reject_constant)
+    assert -1 <= summary["averageSilhouette"] <= 1
+
+
 @pytest.mark.asyncio
 async def test_label_propagation(mcp_client):
     result_with_names = await mcp_client.call_tool(
@@ -124,6 +156,43 @@ async def test_louvain(mcp_client):
     assert len(data_lines) > 0
 
 
+@pytest.mark.asyncio
+async def test_louvain_summary(mcp_client):
+    result = await mcp_client.call_tool(
+        "louvain",
+        {
+            "nodeIdentifierProperty": "name",
+            "outputFormat": "summary",
+            "summaryTopN": 3,
+            "summarySampleSize": 2,
+        },
+    )
+
+    assert len(result) == 1
+    summary = json.loads(result[0]["text"])
+    assert summary["nodeCount"] == 302
+    assert summary["communityCount"] > 1
+    assert sum(summary["sizeHistogram"].values()) == summary["communityCount"]
+    assert 0 < summary["modularity"] <= 1
+
+    largest = summary["largestCommunities"]
+    assert len(largest) == 3
+    assert largest[0]["size"] == summary["communitySizes"]["max"]
+    assert [c["size"] for c in largest] == sorted(
+        (c["size"] for c in largest), reverse=True
+    )
+    for community in largest:
+        assert len(community["sampleNodeIds"]) == 2
+        assert len(community["sampleNodeNames"]) == 2
+
+    components = await mcp_client.call_tool(
+        "weakly_connected_components", {"outputFormat": "summary"}
+    )
+    summary = json.loads(components[0]["text"])
+    assert summary["nodeCount"] == 302
+    assert "sampleNodeNames" not in summary["largestCommunities"][0]
+
+
 @pytest.mark.asyncio
 async def test_modularity_metric(mcp_client):
     result = await mcp_client.call_tool(
@@ -250,3 +319,91 @@ async def test_speaker_listener_label_propagation(mcp_client):
     lines = result_with_names_text.strip().split("\n")
     data_lines = [line for line in lines[1:] if line.strip()]
     assert len(data_lines) > 0
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline(mcp_client):
+    result = await mcp_client.call_tool(
+        "run_pipeline",
+        {
+            "steps": [
+                {
+                    "algorithm": "weakly_connected_components",
+                    "mutateProperty": "component",
+                },
+                {
+                    "algorithm": "louvain",
+                    "parameters": {"maxLevels": 10},
+                    "mutateProperty": "community",
+                    "stream": True,
+                    "name": "louvain",
+                },
+                {
+                    "algorithm": "conductance",
+                    "parameters": {"communityProperty": "community"},
+                    "name": "conductance",
+                },
+            ],
+            "nodeIdentifierProperty": "name",
+        },
+    )
+
+    assert len(result) == 1
+    results = json.loads(result[0]["text"])
+    assert list(results) == ["louvain", "conductance"]
+    assert len(results["louvain"]) == 302
+    assert {"nodeId", "propertyValue", "nodeName"} <= set(results["louvain"][0])
+    communities = {row["propertyValue"] for row in results["louvain"]}
+    assert {row["community"] for row in results["conductance"]} <= communities
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_refuses_mixed_orientations(mcp_client):
+    result = await mcp_client.call_tool(
+        "run_pipeline",
+        {
+            "steps": [
+                {"algorithm": "leiden", "mutateProperty": "community"},
+                {"algorithm": "pagerank"},
+            ],
+        },
+    )
+
+    assert len(result) == 1
+    assert result[0]["text"].startswith("Error:")
+    assert "cannot share a projection" in result[0]["text"]
+
+
+def test_run_pipeline_takes_step_parameters_as_the_tools_do():
+    gds = create_in_memory_gds("memory://london")
+    arguments = {"sourceNodes": ["Bank"], "dampingFactor": 0.8}
+    pipeline = server.execute_tool(
+        gds,
+        "run_pipeline",
+        {
+            "steps": [{"algorithm": "pagerank", "parameters": arguments}],
+            "nodeIdentifierProperty": "name",
+        },
+    )
+    tool = server.execute_tool(
+        gds, "pagerank", {**arguments, "nodeIdentifierProperty": "name"}
+    )
+    assert pipeline[0].split() == tool[0].split()
+
+
+@pytest.mark.parametrize(
+    "parameters, message",
+    [
+        ({"topK": 5}, r"\['topK'\] select what the 'pagerank' tool returns"),
+        ({"dampingFactor": 0.8, "damping": 0.8}, r"has no parameters \['damping'\]"),
+    ],
+)
+def test_run_pipeline_checks_step_parameters_up_front(parameters, message):
+    gds = create_in_memory_gds("memory://london")
+    steps = [
+        {"algorithm": "louvain", "mutateProperty": "community"},
+        {"algorithm": "pagerank", "parameters": parameters},
+    ]
+    with pytest.raises(ValueError, match=message):
+        server.execute_tool(gds, "run_pipeline", {"steps": steps})
+    assert gds.graph.list().empty
@@ -0,0 +1,142 @@
+import pytest
+
+from mcp_server_neo4j_gds.gds import (
+    ProjectionFilter,
+    configure_projection_cache,
+    configure_projection_mode,
+    count_nodes,
+    discover_projectable_properties,
+    projected_graph,
+    projection_filter_from_arguments,
+)
+from mcp_server_neo4j_gds_testing.in_memory_gds import (
+    InMemoryDatabase,
+    InMemoryGraphDataScience,
+    create_in_memory_gds,
+    synthetic_database,
+)
+
+
+@pytest.fixture
+def london_gds():
+    return create_in_memory_gds("memory://london")
+
+
+def test_in_memory_london_dataset(london_gds):
+    assert count_nodes(london_gds) == 302
+    properties = discover_projectable_properties(london_gds)
+    assert properties["relationship"] == {"distance": "INTEGER", "time": "INTEGER"}
+    assert properties["node"]["zone"] == "FLOAT"
+    assert properties["requires_conversion"] is True
+
+
+def test_in_memory_projection_and_stream(london_gds):
+    with projected_graph(london_gds) as G:
+        assert G.node_count() == 302
+        assert G.relationship_count() == 406
+        pagerank = london_gds.pageRank.stream(G, maxIterations=20)
+        path = london_gds.shortestPath.dijkstra.stream(
+            G, sourceNode=0, targetNode=168, relationshipWeightProperty="time"
+        )
+
+    assert not G.exists()
+    assert list(pagerank.columns) == ["nodeId", "score"]
+    assert len(pagerank) == 302
+    assert path["nodeIds"].iloc[0][0] == 0
+    assert path["nodeIds"].iloc[0][-1] == 168
+
+
+def test_in_memory_name_lookup(london_gds):
+    df = london_gds.run_cypher(
+        """
+        MATCH (source)
+        WHERE toLower(source.name) CONTAINS toLower($source_name)
+        RETURN id(source) as source_id, source.name as source_name
+        """,
+        params={"source_name": "bayswater"},
+    )
+    assert df["source_name"].tolist() == ["Bayswater"]
+    assert "Bayswater" in str(london_gds.util.asNode(int(df["source_id"].iloc[0])))
+
+
+def test_synthetic_database_is_deterministic():
+    first = synthetic_database(nodes=500, degree=3, seed=7)
+    second = synthetic_database(nodes=500, degree=3, seed=7)
+    assert len(first.nodes) == 500
+    assert first.relationships == second.relationships
+
+    gds = InMemoryGraphDataScience(first)
+    with projected_graph(gds, undirected=True) as G:
+        components = gds.wcc.stream(G)
+    assert components["componentId"].nunique() == 1
+
+
+@pytest.mark.parametrize("mode", ["auto", "cypher"])
+def test_filtered_projection(mode):
+    database = InMemoryDatabase()
+    a = database.add_node(["Person"], {"age": 30, "score": 1.5})
+    b = database.add_node(["Person"], {"age": 40, "score": 2.5})
+    c = database.add_node(["Company"], {"revenue": 10})
+    database.add_relationship(a, b, "KNOWS", {"weight": 1, "since": 2020})
+    database.add_relationship(a, c, "WORKS_AT", {"weight": 2})
+    gds = InMemoryGraphDataScience(database)
+
+    configure_projection_mode(mode)
+    try:
+        projection_filter = ProjectionFilter(
+            node_labels=("Person",),
+            relationship_types=("KNOWS",),
+            node_properties=("age",),
+            relationship_properties=("weight",),
+        )
+        with projected_graph(gds, projection_filter=projection_filter) as G:
+            assert G.node_count() == 2
+            assert G.relationship_count() == 1
+            assert list(G.node_properties) == ["age"]
+            assert list(G.relationship_properties) == ["weight"]
+
+        with pytest.raises(ValueError, match=r"Available node labels: \['Company'"):
+            with projected_graph(
+                gds, projection_filter=ProjectionFilter(node_labels=("Robot",))
+            ):
+                pass
+    finally:
+        configure_projection_mode("auto")
+
+
+def test_cached_projection_follows_property_writes():
+    database = InMemoryDatabase()
+    a = database.add_node(["Person"], {"age": 30})
+    b = database.add_node(["Person"], {"age": 40})
+    database.add_relationship(a, b, "KNOWS", {})
+    gds = InMemoryGraphDataScience(database)
+
+    configure_projection_cache(max_entries=2, idle_ttl=600)
+    try:
+        with projected_graph(gds) as G:
+            first_name = G.name()
+        with projected_graph(gds) as G:
+            assert G.name() == first_name
+
+        # Same labels, keys and counts, only the last committed transaction moves on
+        database.set_node_property(a, "age", 31)
+        with projected_graph(gds) as G:
+            assert G.name() != first_name
+            ages = gds.graph.nodeProperty.stream(G, "age")
+        assert ages["propertyValue"].tolist() == [31, 40]
+    finally:
+        configure_projection_cache(max_entries=0, idle_ttl=0)
+
+
+def test_projection_filter_from_arguments():
+    assert projection_filter_from_arguments({"maxIterations": 20}) is None
+    projection_filter = projection_filter_from_arguments(
+        {
+            "nodeLabels": ["Station"],
+            "relationshipProperties": [],
+            "relationshipWeightProperty": "time",
+        }
+    )
+    assert projection_filter == ProjectionFilter(
+        node_labels=("Station",), relationship_properties=("time",)
+    )
@@ -0,0 +1,81 @@
+import json
+import threading
+
+import pytest
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds.gds import clear_projection_cache
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.memory_estimation import (
+    MemoryBudgetExceeded,
+    MemoryGuard,
+    configure_memory_guard,
+)
+
+
+@pytest.fixture
+def london_gds():
+    clear_projection_cache()
+    yield create_in_memory_gds("memory://london")
+    configure_memory_guard()
+    clear_projection_cache()
+
+
+def test_estimates_are_reported(london_gds):
+    configure_memory_guard(budget_bytes=1024 * 1024)
+    result = server.execute_tool(london_gds, "pagerank", {})
+
+    assert len(result) == 2
+    projection, estimate = json.loads(result[1])["memoryEstimates"]
+    # The London graph needs a Cypher projection, estimated from the database counts
+    assert projection["procedure"] == "gds.graph.cypher.project"
+    assert projection["nodeCount"] == 302
+    assert 0 < projection["bytesMax"] <= 1024 * 1024
+    assert estimate["procedure"] == "gds.pageRank.stream"
+    assert 0 < estimate["bytesMin"] <= estimate["bytesMax"] <= 1024 * 1024
+    assert estimate["nodeCount"] == 302
+
+
+def test_cypher_projection_is_admitted(london_gds):
+    configure_memory_guard(budget_bytes=1024, action="refuse")
+    with pytest.raises(
+        MemoryBudgetExceeded, match="gds.graph.cypher.project is estimated"
+    ):
+        server.execute_tool(london_gds, "pagerank", {})
+    assert london_gds.graph.list().empty
+
+
+def test_refuse_and_downgrade(london_gds):
+    # The budget leaves room for the projection, but not for topK 40
+    configure_memory_guard(budget_bytes=60000, action="refuse")
+    with pytest.raises(
+        MemoryBudgetExceeded, match="gds.nodeSimilarity.filtered.stream"
+    ):
+        server.execute_tool(london_gds, "node_similarity", {"topK": 40})
+
+    configure_memory_guard(budget_bytes=60000, action="downgrade")
+    result = server.execute_tool(london_gds, "node_similarity", {"topK": 40})
+    _, estimate = json.loads(result[-1])["memoryEstimates"]
+    assert estimate["downgradedParameters"] == {"topK": 10}
+    assert estimate["bytesMax"] <= 60000
+
+
+def test_queue_waits_for_reserved_budget():
+    guard = MemoryGuard(budget_bytes=100, action="queue", queue_timeout=5)
+    admitted = threading.Event()
+
+    def run():
+        with guard.reserve(60):
+            admitted.set()
+
+    with guard.reserve(60):
+        thread = threading.Thread(target=run)
+        thread.start()
+        assert not admitted.wait(0.1)
+    thread.join()
+    assert admitted.is_set()
+
+    with guard.reserve(60), pytest.raises(MemoryBudgetExceeded, match="Timed out"):
+        guard.queue_timeout = 0.01
+        with guard.reserve(60):
+            pass
@@ -0,0 +1,77 @@
+import json
+import time
+
+import pytest
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    configure_timings,
+    span,
+)
+
+
+@pytest.fixture
+def london_gds():
+    yield create_in_memory_gds("memory://london")
+    configure_timings(include_in_response=False)
+
+
+def test_spans_exclude_nested_spans():
+    registry = MetricsRegistry()
+    with registry.tool_call("tool") as timings:
+        with span("handler"):
+            time.sleep(0.01)
+            with span("algorithm"):
+                time.sleep(0.02)
+    # Outside of a tool call spans do nothing
+    with span("algorithm"):
+        pass
+
+    assert 0.02 <= timings.seconds["algorithm"] < 0.03
+    assert 0.01 <= timings.seconds["handler"] < 0.02
+    assert sum(timings.seconds.values()) <= timings.elapsed()
+    assert registry.snapshot()["tools"]["tool"]["calls"] == 1
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["meanMs"] == pytest.approx(50.5)
+    assert summary["maxMs"] == 100.0
+    # Percentiles are within one bucket (19%) of the exact value
+    assert 50 <= summary["p50Ms"] <= 50 * 1.19
+    assert 95 <= summary["p95Ms"] <= 100
+    assert 99 <= summary["p99Ms"] <= 100
+
+
+def test_timings_in_response_and_server_metrics(london_gds):
+    configure_timings(include_in_response=True)
+    result = server.execute_tool(
+        london_gds, "pagerank", {"nodeIdentifierProperty": "name"}
+    )
+    timings = json.loads(result[-1])["timings"]
+    assert {"schema_discovery", "projection", "algorithm", "id_translation"} <= set(
+        timings["phasesMs"]
+    )
+    assert sum(timings["phasesMs"].values()) <= timings["totalMs"]
+
+    configure_timings(include_in_response=False)
+    metrics = json.loads(server.execute_tool(london_gds, "get_server_metrics", {})[0])
+    pagerank = metrics["tools"]["pagerank"]
+    assert pagerank["calls"] >= 1
+    for phase in ["projection", "algorithm", "total"]:
+        assert set(pagerank["phases"][phase]) == {
+            "count",
+            "meanMs",
+            "p50Ms",
+            "p95Ms",
+            "p99Ms",
+            "maxMs",
+        }
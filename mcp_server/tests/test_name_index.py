@@ -0,0 +1,143 @@
+import pytest
+
+from mcp_server_neo4j_gds import gds as gds_module
+from mcp_server_neo4j_gds import node_translator
+from mcp_server_neo4j_gds.gds import get_graph_fingerprint
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.name_index import NameIndex, NameIndexRegistry
+
+
+@pytest.fixture
+def london_gds():
+    return create_in_memory_gds("memory://london")
+
+
+def test_name_index_lookup():
+    index = NameIndex("name")
+    index.add(3, "Bank")
+    index.add(1, "Bankside")
+    index.add(2, "Canary Wharf")
+    index.add(4, 42)
+
+    assert len(index) == 3
+    assert index.lookup("bank") == [3, 1]
+    assert index.lookup("BANKSIDE") == [1]
+    assert index.lookup("an") == [1, 2, 3]
+    assert index.lookup("wharf") == [2]
+    assert index.lookup("nowhere") == []
+
+    index.add(2, "Bankstown")
+    assert index.lookup("bank") == [3, 1, 2]
+    index.remove(3)
+    assert index.lookup("bank") == [1, 2]
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_lookup_node_ids_with_and_without_index(london_gds, enabled):
+    node_translator.configure_name_index(enabled=enabled)
+    try:
+        matches = node_translator.lookup_node_ids(
+            london_gds, "name", ["Baker Street", "bank", "Nowhere"]
+        )
+        assert len(matches["Baker Street"]) == 1
+        assert len(matches["bank"]) == 2
+        assert matches["Nowhere"] == []
+
+        # Nodes added after the index was built are found
+        labels, _ = london_gds.database_contents.nodes[0]
+        node_id = london_gds.database_contents.add_node(labels, {"name": "Nowhere"})
+        assert node_translator.find_node_id(london_gds, "name", "nowhere") == node_id
+    finally:
+        node_translator.configure_name_index()
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_resolve_node_names_prefers_exact_matches(london_gds, enabled):
+    node_translator.configure_name_index(enabled=enabled)
+    try:
+        node_ids = node_translator.resolve_node_names(
+            london_gds, "name", ["Victoria", "Royal Vic", "Nowhere"]
+        )
+    finally:
+        node_translator.configure_name_index()
+
+    victoria = london_gds.util.asNode(node_ids["Victoria"])
+    royal_victoria = london_gds.util.asNode(node_ids["Royal Vic"])
+    assert victoria["name"] == "Victoria"
+    assert royal_victoria["name"] == "Royal Victoria"
+    assert node_ids["Nowhere"] is None
+
+
+def test_name_index_follows_reused_node_ids(london_gds):
+    node_translator.configure_name_index()
+    baker_street = node_translator.find_node_id(london_gds, "name", "Baker Street")
+
+    # The node count and hence the fingerprint stay the same
+    labels, _ = london_gds.database_contents.nodes[baker_street]
+    london_gds.database_contents.recreate_node(
+        baker_street, labels, {"name": "Nowhere"}
+    )
+    assert node_translator.lookup_node_ids(london_gds, "name", ["Baker Street"]) == {
+        "Baker Street": []
+    }
+    assert node_translator.find_node_id(london_gds, "name", "nowhere") == baker_street
+
+
+def test_name_index_rebuilds_after_deletions(london_gds):
+    index_reads = []
+
+    def read_values(gds, property_name, after):
+        index_reads.append(after)
+        return node_translator._read_identifier_values(gds, property_name, after)
+
+    registry = NameIndexRegistry()
+    fingerprint = get_graph_fingerprint(london_gds)
+    registry.get(london_gds, "name", fingerprint, read_values)
+
+    # One node more than before, but two nodes above the indexed ones
+    labels, _ = london_gds.database_contents.nodes[0]
+    london_gds.database_contents.add_node(labels, {"name": "Nowhere"})
+    london_gds.database_contents.add_node(labels, {"name": "Elsewhere"})
+    grown = fingerprint._replace(node_count=fingerprint.node_count + 1)
+    index = registry.get(london_gds, "name", grown, read_values)
+    assert index_reads == [-1, 301, -1]
+    assert index.lookup("elsewhere") == [303]
+
+
+def test_name_index_follows_changed_values(london_gds):
+    node_translator.configure_name_index()
+    baker_street = node_translator.find_node_id(london_gds, "name", "Baker Street")
+
+    # SET n.name leaves the counts unchanged, only the last committed transaction moves on
+    london_gds.database_contents.set_node_property(baker_street, "name", "Nowhere")
+    assert node_translator.find_node_id(london_gds, "name", "nowhere") == baker_street
+    assert node_translator.lookup_node_ids(london_gds, "name", ["Baker Street"]) == {
+        "Baker Street": []
+    }
+
+
+def test_names_missing_from_the_index_are_looked_up(london_gds, monkeypatch):
+    # Without the last committed transaction a changed value leaves the fingerprint as is
+    monkeypatch.setattr(gds_module, "last_committed_transaction", lambda gds: None)
+    node_translator.configure_name_index()
+    node_translator.find_node_id(london_gds, "name", "Baker Street")
+
+    london_gds.database_contents.set_node_property(0, "name", "Nowhere")
+    assert node_translator.find_node_id(london_gds, "name", "nowhere") == 0
+
+
+def test_name_index_updates_do_not_change_returned_indexes(london_gds):
+    registry = NameIndexRegistry()
+    read_values = node_translator._read_identifier_values
+    index = registry.get(
+        london_gds, "name", get_graph_fingerprint(london_gds), read_values
+    )
+
+    labels, _ = london_gds.database_contents.nodes[0]
+    node_id = london_gds.database_contents.add_node(labels, {"name": "Nowhere"})
+    updated = registry.get(
+        london_gds, "name", get_graph_fingerprint(london_gds), read_values
+    )
+    assert updated is not index
+    assert updated.lookup("nowhere") == [node_id]
+    assert index.lookup("nowhere") == []
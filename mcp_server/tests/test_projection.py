@@ -93,3 +93,79 @@ def test_node_projection_properties(neo4j_container):
     assert projection_properties["propListDoubleListInt"] == "FLOAT_LIST"
     assert existing_count1 == 2
     assert existing_count2 == 0
+
+
+def test_projection_cache_reuses_graph(import_test_data, neo4j_container):
+    from mcp_server.src.mcp_server_neo4j_gds.gds import (
+        clear_projection_cache,
+        configure_projection_cache,
+        projected_graph,
+    )
+
+    gds = GraphDataScience(neo4j_container, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    configure_projection_cache(max_entries=2, idle_ttl=600)
+    try:
+        with projected_graph(gds) as G1:
+            first_name = G1.name()
+        with projected_graph(gds) as G2:
+            second_name = G2.name()
+        with projected_graph(gds, undirected=True) as G3:
+            undirected_name = G3.name()
+
+        assert first_name == second_name
+        assert undirected_name != first_name
+        assert gds.graph.exists(first_name)["exists"]
+
+        clear_projection_cache()
+        assert not gds.graph.exists(first_name)["exists"]
+        assert not gds.graph.exists(undirected_name)["exists"]
+    finally:
+        configure_projection_cache(max_entries=0, idle_ttl=0)
+        gds.close()
+
+
+def test_discover_projectable_properties(import_test_data, neo4j_container):
+    from mcp_server.src.mcp_server_neo4j_gds.gds import (
+        discover_projectable_properties,
+    )
+
+    gds = GraphDataScience(neo4j_container, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    try:
+        projectable_properties = discover_projectable_properties(gds)
+    finally:
+        gds.close()
+
+    assert projectable_properties["relationship"] == {
+        "distance": "INTEGER",
+        "time": "INTEGER",
+    }
+    assert projectable_properties["node"]["latitude"] == "FLOAT"
+    assert projectable_properties["node"]["zone"] == "FLOAT"
+    assert projectable_properties["node"]["total_lines"] == "INTEGER"
+    assert "name" not in projectable_properties["node"]
+    assert "display_name" not in projectable_properties["node"]
+
+
+def test_native_and_cypher_projections_match(import_test_data, neo4j_container):
+    from mcp_server.src.mcp_server_neo4j_gds.gds import (
+        configure_projection_mode,
+        projected_graph,
+    )
+
+    gds = GraphDataScience(neo4j_container, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    try:
+        configure_projection_mode("cypher")
+        with projected_graph(gds) as G:
+            cypher_counts = (G.node_count(), G.relationship_count())
+            cypher_properties = sorted(G.node_properties().explode().dropna())
+
+        configure_projection_mode("auto")
+        with projected_graph(gds) as G:
+            auto_counts = (G.node_count(), G.relationship_count())
+            auto_properties = sorted(G.node_properties().explode().dropna())
+    finally:
+        configure_projection_mode("auto")
+        gds.close()
+
+    assert auto_counts == cypher_counts
+    assert auto_properties == cypher_properties
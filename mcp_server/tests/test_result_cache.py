@@ -0,0 +1,100 @@
+import pytest
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds_testing.in_memory_algorithms import ALGORITHMS
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.result_cache import configure_result_cache, get_result_cache
+
+
+@pytest.fixture
+def london_gds():
+    yield create_in_memory_gds("memory://london")
+    configure_result_cache(max_bytes=0)
+
+
+@pytest.fixture
+def pagerank_runs(monkeypatch):
+    runs = []
+    pagerank = ALGORITHMS["pageRank"]
+
+    def counted_pagerank(G, **config):
+        runs.append(config)
+        return pagerank(G, **config)
+
+    monkeypatch.setitem(ALGORITHMS, "pageRank", counted_pagerank)
+    return runs
+
+
+def test_repeated_calls_are_served_from_cache(london_gds, pagerank_runs):
+    configure_result_cache(max_bytes=64 * 1024 * 1024)
+    arguments = {"nodeIdentifierProperty": "name", "dampingFactor": 0.8}
+
+    first = server.execute_tool(london_gds, "pagerank", arguments)
+    second = server.execute_tool(
+        london_gds, "pagerank", dict(reversed(arguments.items()))
+    )
+    assert first == second
+    assert len(pagerank_runs) == 1
+    assert get_result_cache().stats()["hits"] == 1
+
+    server.execute_tool(london_gds, "pagerank", {"dampingFactor": 0.9})
+    assert len(pagerank_runs) == 2
+
+    # Writing to the database invalidates the cached results
+    server.execute_tool(
+        london_gds, "degree_centrality", {"mode": "write", "writeProperty": "degree"}
+    )
+    assert get_result_cache().stats()["entries"] == 0
+    server.execute_tool(london_gds, "pagerank", arguments)
+    assert len(pagerank_runs) == 3
+
+
+def test_disk_tier_survives_restart(london_gds, pagerank_runs, tmp_path):
+    # Every result is larger than the memory tier and goes to disk
+    configure_result_cache(max_bytes=1, directory=tmp_path)
+    first = server.execute_tool(london_gds, "pagerank", {})
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+
+    configure_result_cache(max_bytes=1, directory=tmp_path)
+    assert server.execute_tool(london_gds, "pagerank", {}) == first
+    assert len(pagerank_runs) == 1
+
+    configure_result_cache(max_bytes=1, directory=tmp_path, max_disk_bytes=1)
+    server.execute_tool(london_gds, "pagerank", {"dampingFactor": 0.5})
+    assert list(tmp_path.glob("*.arrow")) == []
+
+
+def test_disk_tier_stores_matrices_and_json(london_gds, tmp_path):
+    configure_result_cache(max_bytes=1, directory=tmp_path)
+    calls = [
+        (
+            "all_pairs_shortest_paths",
+            {"relationshipWeightProperty": "time", "outputFormat": "dense"},
+        ),
+        ("louvain", {"outputFormat": "summary"}),
+    ]
+    first = [server.execute_tool(london_gds, name, dict(args)) for name, args in calls]
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    configure_result_cache(max_bytes=1, directory=tmp_path)
+    second = [server.execute_tool(london_gds, name, dict(args)) for name, args in calls]
+    assert second == first
+    assert get_result_cache().stats()["hits"] == 2
+
+
+def test_randomized_algorithms_are_cached_only_with_a_seed(london_gds):
+    configure_result_cache(max_bytes=64 * 1024 * 1024)
+    arguments = {"walkLength": 3, "walksPerNode": 1}
+    server.execute_tool(london_gds, "random_walk", arguments)
+    server.execute_tool(london_gds, "random_walk", arguments)
+    assert get_result_cache().stats() == {
+        "entries": 0,
+        "sizeBytes": 0,
+        "hits": 0,
+        "misses": 0,
+    }
+
+    server.execute_tool(london_gds, "random_walk", {**arguments, "randomSeed": 42})
+    server.execute_tool(london_gds, "random_walk", {**arguments, "randomSeed": 42})
+    assert get_result_cache().stats()["hits"] == 1
@@ -0,0 +1,80 @@
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.result_pages import ResultPaginator
+from mcp_server_neo4j_gds.result_spool import (
+    clear_result_spool,
+    configure_result_spool,
+    get_result_spool,
+)
+
+
+@pytest.fixture
+def london_gds(tmp_path):
+    configure_result_spool(directory=tmp_path)
+    yield create_in_memory_gds("memory://london")
+    clear_result_spool()
+
+
+def test_arrow_and_parquet_results(london_gds):
+    result = server.execute_tool(
+        london_gds,
+        "pagerank",
+        {"nodeIdentifierProperty": "name", "resultFormat": "arrow"},
+        ResultPaginator(max_rows=100),
+    )
+    description = json.loads(result[0])
+    assert description["rowCount"] == 302
+    assert [field["name"] for field in description["schema"]] == [
+        "nodeId",
+        "score",
+        "nodeName",
+    ]
+    assert len(description["preview"]) == 10
+    assert str(result[1].uri) == description["uri"]
+
+    with pa.memory_map(description["path"]) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.num_rows == 302
+    assert table.column("nodeName")[0].as_py() == description["preview"][0]["nodeName"]
+
+    content, mime_type = get_result_spool().read(description["uri"])
+    assert mime_type == "application/vnd.apache.arrow.file"
+    assert len(content) == description["sizeBytes"]
+
+    description = json.loads(
+        server.execute_tool(
+            london_gds, "degree_centrality", {"resultFormat": "parquet"}
+        )[0]
+    )
+    assert pq.read_table(description["path"]).num_rows == 302
+
+
+def test_spool_deletes_oldest_files(london_gds, tmp_path):
+    configure_result_spool(directory=tmp_path, max_bytes=1)
+    first = json.loads(
+        server.execute_tool(london_gds, "pagerank", {"resultFormat": "arrow"})[0]
+    )
+    second = json.loads(
+        server.execute_tool(london_gds, "pagerank", {"resultFormat": "arrow"})[0]
+    )
+    assert [uri for uri, *_ in get_result_spool().resources()] == [second["uri"]]
+    with pytest.raises(ValueError, match="Unknown or expired"):
+        get_result_spool().read(first["uri"])
+
+
+def test_invalid_result_formats(london_gds):
+    with pytest.raises(ValueError, match="Unknown resultFormat"):
+        server.execute_tool(london_gds, "pagerank", {"resultFormat": "csv"})
+    with pytest.raises(ValueError, match="Pagination cannot be combined"):
+        server.execute_tool(
+            london_gds,
+            "pagerank",
+            {"resultFormat": "arrow", "limit": 10},
+            ResultPaginator(),
+        )
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from mcp_server_neo4j_gds import server
+from mcp_server_neo4j_gds.gds import configure_projection_cache
+from mcp_server_neo4j_gds_testing.in_memory_algorithms import ALGORITHMS
+from mcp_server_neo4j_gds_testing.in_memory_gds import create_in_memory_gds
+from mcp_server_neo4j_gds.tool_progress import ToolCall, ToolCancelled, report_progress
+
+
+@pytest.fixture
+def london_gds():
+    return create_in_memory_gds("memory://london")
+
+
+def test_cancel_terminates_job_and_drops_projection(london_gds, monkeypatch):
+    tool_call = ToolCall("pagerank")
+    pagerank = ALGORITHMS["pageRank"]
+
+    def cancelled_pagerank(G, **config):
+        tool_call.cancel(london_gds)
+        return pagerank(G, **config)
+
+    monkeypatch.setitem(ALGORITHMS, "pageRank", cancelled_pagerank)
+    with pytest.raises(ToolCancelled):
+        server.execute_tool(london_gds, "pagerank", {}, tool_call=tool_call)
+    assert london_gds.graph.list().empty
+
+    with pytest.raises(ToolCancelled):
+        server.execute_tool(london_gds, "degree_centrality", {}, tool_call=tool_call)
+
+
+def test_cancel_terminates_top_k_job_and_evicts_projection(london_gds, monkeypatch):
+    configure_projection_cache(max_entries=4, idle_ttl=600)
+    tool_call = ToolCall("pagerank")
+    pagerank = ALGORITHMS["pageRank"]
+    jobs = []
+
+    def cancelled_pagerank(G, **config):
+        jobs.extend(london_gds.listProgress()["jobId"])
+        tool_call.cancel(london_gds)
+        return pagerank(G, **config)
+
+    monkeypatch.setitem(ALGORITHMS, "pageRank", cancelled_pagerank)
+    try:
+        with pytest.raises(ToolCancelled):
+            server.execute_tool(
+                london_gds, "pagerank", {"topK": 3}, tool_call=tool_call
+            )
+        # The job of the Cypher call was terminated, and its projection not cached
+        assert len(jobs) == 1
+        assert london_gds.graph.list().empty
+    finally:
+        configure_projection_cache(max_entries=0, idle_ttl=600)
+
+
+def test_progress_of_running_job(london_gds, monkeypatch):
+    tool_call = ToolCall("pagerank")
+    pagerank = ALGORITHMS["pageRank"]
+    seen = []
+
+    def observed_pagerank(G, **config):
+        seen.append(tool_call.progress(london_gds))
+        return pagerank(G, **config)
+
+    monkeypatch.setitem(ALGORITHMS, "pageRank", observed_pagerank)
+    result = server.execute_tool(
+        london_gds, "pagerank", {"mode": "stats"}, tool_call=tool_call
+    )
+    assert "centralityDistribution" in json.loads(result[0])
+    assert seen == [(None, "gds.pageRank.stats: pageRank n/a")]
+    assert tool_call.progress(london_gds) == (None, "running gds.pageRank.stats")
+
+
+@pytest.mark.asyncio
+async def test_report_progress():
+    tool_call = ToolCall("pagerank")
+    tool_call.phase = "projecting graph"
+    future = asyncio.get_running_loop().create_future()
+    notifications = []
+
+    async def notify(progress, message):
+        notifications.append((progress, message))
+        if len(notifications) == 2:
+            future.set_result(["done"])
+
+    result = await report_progress(future, tool_call, None, notify, interval=0.01)
+    assert result == ["done"]
+    assert notifications == [(0.0, "projecting graph")] * 2